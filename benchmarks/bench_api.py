@@ -0,0 +1,173 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_suite import generate_tasks, prepare_storage
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Connection:
+
+    """Cliente HTTP/1.1 mínimo com keep-alive, para não medir o cliente."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, host, port):
+
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, method, path, payload=None):
+
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode('latin-1')
+            + body
+        )
+        status = int((await self.reader.readline()).split(b" ", 2)[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-length":
+                length = int(value)
+        return status, await self.reader.readexactly(length)
+
+    def close(self):
+
+        self.writer.close()
+
+
+def pick_request(rng, max_id):
+
+    roll = rng.random()
+    if roll < 0.5:
+        return "GET", f"/tasks?filter=pending&offset={rng.randrange(0, max_id // 2 or 1)}&limit=20", None
+    if roll < 0.7:
+        return "GET", f"/tasks/{rng.randint(1, max_id)}", None
+    if roll < 0.8:
+        return "GET", "/stats", None
+    if roll < 0.95:
+        return "POST", f"/tasks/{rng.randint(1, max_id)}/toggle", None
+    return "POST", "/tasks", {'title': f"carga {rng.random():.6f}"}
+
+
+async def client(host, port, deadline, max_id, seed, latencies, errors, read_only):
+
+    rng = random.Random(seed)
+    connection = await Connection.open(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            method, path, payload = pick_request(rng, max_id)
+            if read_only and method != "GET":
+                continue
+            start = time.perf_counter()
+            status, _ = await connection.request(method, path, payload)
+            latencies.append(time.perf_counter() - start)
+            if status >= 500:
+                errors.append(status)
+    finally:
+        connection.close()
+
+
+async def run_load(host, port, connections, duration, max_id, read_only):
+
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, deadline, max_id, seed, latencies, errors, read_only)
+        for seed in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    def percentile(fraction):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000
+
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': elapsed,
+        'rps': len(latencies) / elapsed,
+        'mean_ms': statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        'p50_ms': percentile(0.5) if latencies else 0.0,
+        'p99_ms': percentile(0.99) if latencies else 0.0
+    }
+
+
+def start_server(mode, path):
+
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "taskflow.py"), "--file", path, "--storage", mode,
+         "serve", "--port", "0"],
+        stdout=subprocess.PIPE,
+        text=True
+    )
+    line = process.stdout.readline()
+    if not line.startswith("API em "):
+        process.kill()
+        raise RuntimeError("o servidor não iniciou")
+    address = line.split("http://", 1)[1].split("/", 1)[0]
+    host, port = address.rsplit(":", 1)
+    return process, host, int(port)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Teste de carga da API local do TaskFlow")
+    parser.add_argument("--url", help="servidor já em execução (ex.: http://127.0.0.1:8765)")
+    parser.add_argument("--storage", default="json", help="modo do servidor iniciado pelo teste")
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--read-only", action="store_true", help="só requisições GET")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        process = None
+        if args.url:
+            address = args.url.split("://", 1)[-1].rstrip("/")
+            host, port = address.rsplit(":", 1)
+            port = int(port)
+        else:
+            path = prepare_storage(args.storage, directory, generate_tasks(args.size))
+            process, host, port = start_server(args.storage, path)
+
+        try:
+            result = asyncio.run(run_load(
+                host, port, args.connections, args.duration, args.size, args.read_only
+            ))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    print(
+        f"{result['requests']} requisições em {result['seconds']:.1f}s com "
+        f"{args.connections} conexões: {result['rps']:.0f} req/s | "
+        f"média {result['mean_ms']:.2f} ms | p50 {result['p50_ms']:.2f} ms | "
+        f"p99 {result['p99_ms']:.2f} ms | erros {result['errors']}"
+    )
+    return 1 if result['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
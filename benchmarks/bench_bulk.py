@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taskflow_core import create_storage
+
+
+def make_tasks(count):
+
+    now = datetime.now().isoformat()
+    return [
+        {
+            'id': i,
+            'title': f"Tarefa {i}",
+            'description': "",
+            'completed': False,
+            'created_at': now,
+            'completed_at': None
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def open_storage(mode, directory, total):
+
+    storage = create_storage(mode, os.path.join(directory, f"{mode}.json"))
+    store = storage.open_store()
+    tasks = make_tasks(total)
+    store.load(tasks)
+    storage.commit(store, upserts=tasks)
+    return storage, store
+
+
+def per_item(storage, store, task_ids):
+
+    for task_id in task_ids:
+        task = store.set_completed(task_id, True)
+        storage.commit(store, upserts=[task])
+
+
+def batched(storage, store, task_ids):
+
+    tasks = [store.set_completed(task_id, True) for task_id in task_ids]
+    storage.commit(store, upserts=tasks)
+
+
+def run(mode, total, batch_size):
+
+    results = {}
+    for name, apply in (('per_item', per_item), ('batched', batched)):
+        with tempfile.TemporaryDirectory() as directory:
+            storage, store = open_storage(mode, directory, total)
+            start = time.perf_counter()
+            apply(storage, store, range(1, batch_size + 1))
+            results[name] = time.perf_counter() - start
+            storage.close()
+    return results
+
+
+def main():
+
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print(f"{'modo':<8} {'lote':>6} {'por item (s)':>14} {'em lote (s)':>12}")
+    for mode in ('journal', 'sqlite'):
+        for batch_size in (10, 100, 1000):
+            results = run(mode, total, batch_size)
+            print(f"{mode:<8} {batch_size:>6} {results['per_item']:>14.4f} {results['batched']:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
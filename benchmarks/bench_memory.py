@@ -0,0 +1,42 @@
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_suite import generate_tasks
+from taskflow_core import Task, TaskStore
+
+
+def measure_allocation(build):
+
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, value
+
+
+def main():
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    encoded = json.dumps(generate_tasks(count), ensure_ascii=False)
+
+    dict_bytes, tasks = measure_allocation(lambda: json.loads(encoded))
+    task_bytes, _ = measure_allocation(lambda: [Task.from_dict(task) for task in json.loads(encoded)])
+    store_bytes, _ = measure_allocation(lambda: TaskStore(json.loads(encoded)))
+
+    print(f"{count} tarefas")
+    print(f"  dicts (modelo antigo):   {dict_bytes / count:8.1f} bytes/tarefa")
+    print(f"  Task com __slots__:      {task_bytes / count:8.1f} bytes/tarefa")
+    print(f"  TaskStore com índices:   {store_bytes / count:8.1f} bytes/tarefa")
+    print(f"  redução dos registros:   {1 - task_bytes / dict_bytes:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
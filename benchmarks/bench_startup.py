@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_suite import generate_tasks, prepare_storage, start_virtual_display
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MARKS = ('imports', 'window', 'painted', 'toolbars', 'tasks')
+
+
+def launch(command, path, mode, report_path, timeout):
+
+    env = dict(
+        os.environ,
+        TASKFLOW_FILE=path,
+        TASKFLOW_STORAGE=mode,
+        TASKFLOW_STARTUP_REPORT=report_path,
+        TASKFLOW_EXIT_AFTER_STARTUP="1",
+        TASKFLOW_LAUNCH_TIME=repr(time.time())
+    )
+    subprocess.run(command, env=env, cwd=os.path.dirname(path), timeout=timeout, check=True)
+    with open(report_path, encoding='utf-8') as f:
+        return json.loads(f.readlines()[-1])
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Tempo de partida da interface do TaskFlow")
+    parser.add_argument("--exe", help="executável gerado pelo PyInstaller (padrão: python taskflow_gui.py)")
+    parser.add_argument("--storage", default="json")
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--record", help="acrescenta o resumo (JSON Lines) para acompanhar a evolução")
+    args = parser.parse_args()
+
+    command = [os.path.abspath(args.exe)] if args.exe else [
+        sys.executable, os.path.join(ROOT, "taskflow_gui.py")
+    ]
+    display = start_virtual_display()
+    if not os.environ.get("DISPLAY") and sys.platform not in ("win32", "darwin"):
+        print("Sem DISPLAY nem Xvfb: não há como abrir a janela", file=sys.stderr)
+        return 1
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = prepare_storage(args.storage, directory, generate_tasks(args.size))
+            report_path = os.path.join(directory, "startup.jsonl")
+            # A primeira execução aquece o cache de disco e não entra na conta
+            launch(command, path, args.storage, report_path, args.timeout)
+            runs = [
+                launch(command, path, args.storage, report_path, args.timeout)
+                for _ in range(args.runs)
+            ]
+    finally:
+        if display is not None:
+            display.terminate()
+
+    summary = {
+        'timestamp': datetime.now().isoformat(),
+        'command': " ".join(command),
+        'storage': args.storage,
+        'size': args.size,
+        'runs': args.runs,
+        'origin': runs[0]['origin'],
+        'median_ms': {},
+        'min_ms': {}
+    }
+    print(f"{args.runs} partida(s), {args.size} tarefas ({args.storage}), medido desde o lançamento")
+    for mark in MARKS:
+        values = [run['marks_ms'][mark] for run in runs if mark in run['marks_ms']]
+        if not values:
+            continue
+        summary['median_ms'][mark] = round(statistics.median(values), 1)
+        summary['min_ms'][mark] = round(min(values), 1)
+        print(f"  {mark:<10} mediana {statistics.median(values):8.1f} ms   mínimo {min(values):8.1f} ms")
+
+    if args.record:
+        with open(args.record, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taskflow_core import create_storage, write_binary_tasks, write_json_atomic
+
+WORDS = [
+    "reunião", "relatório", "café", "código", "revisão", "orçamento",
+    "ação", "projeto", "cliente", "lançamento", "suporte", "contrato"
+]
+
+
+def generate_tasks(count, seed=42):
+
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    tasks = []
+    for task_id in range(1, count + 1):
+        created_at = start + timedelta(minutes=task_id)
+        completed = rng.random() < 0.6
+        tasks.append({
+            'id': task_id,
+            'title': " ".join(rng.sample(WORDS, 3)) + f" {task_id}",
+            'description': rng.choice(WORDS) if rng.random() < 0.5 else "",
+            'completed': completed,
+            'created_at': created_at.isoformat(),
+            'completed_at': (created_at + timedelta(days=1)).isoformat() if completed else None
+        })
+    return tasks
+
+
+def prepare_storage(mode, directory, tasks):
+
+    path = os.path.join(directory, f"tasks_{mode}.json")
+    if mode == "sqlite":
+        storage = create_storage(mode, path)
+        store = storage.open_store()
+        store.load(tasks)
+        storage.commit(store)
+        storage.close()
+    elif mode == "binary":
+        write_binary_tasks(os.path.splitext(path)[0] + ".tfb", tasks)
+    else:
+        write_json_atomic(path, tasks)
+    return path
+
+
+def measure(function, repeat):
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'max': max(samples),
+        'repeat': repeat
+    }
+
+
+def bench_storage(mode, size, path, repeat, rng):
+
+    results = {}
+
+    def load():
+        storage = create_storage(mode, path)
+        storage.open_store()
+        storage.close()
+
+    results['load'] = measure(load, repeat)
+
+    storage = create_storage(mode, path)
+    store = storage.open_store()
+    sample_ids = rng.sample(range(1, size + 1), min(100, size))
+
+    def save():
+        storage.commit(store, upserts=[store.get(sample_ids[0])])
+        storage.flush()
+
+    def filter_pending():
+        tasks = store.filtered("pending")
+        len(tasks)
+        list(tasks[i] for i in range(min(50, len(tasks))))
+
+    def toggle():
+        for task_id in sample_ids:
+            task = store.get(task_id)
+            storage.commit(store, upserts=[store.set_completed(task_id, not task['completed'])])
+        storage.flush()
+
+    def stats():
+        store.counts()
+
+    def recount():
+        store.recount()
+
+    def search():
+        store.search("reuniao rel", "all")
+
+    def sorted_page():
+        store.page("pending", size // 4, 50, "title")
+
+    results['save'] = measure(save, repeat)
+    results['filter'] = measure(filter_pending, repeat)
+    results['toggle_100'] = measure(toggle, repeat)
+    results['stats'] = measure(stats, repeat)
+    results['recount'] = measure(recount, repeat)
+    results['search'] = measure(search, repeat)
+    results['sorted_page'] = measure(sorted_page, repeat)
+
+    delete_ids = iter(rng.sample(range(1, size + 1), min(size, 100 * repeat)))
+
+    def delete():
+        deleted = [next(delete_ids) for _ in range(min(100, size // repeat or 1))]
+        for task_id in deleted:
+            store.remove(task_id)
+        storage.commit(store, deletes=deleted)
+        storage.flush()
+
+    results['delete_100'] = measure(delete, repeat)
+    storage.close()
+    return results
+
+
+def start_virtual_display():
+
+    if os.environ.get("DISPLAY"):
+        return None
+    if not shutil.which("Xvfb"):
+        return None
+
+    display = ":99"
+    process = subprocess.Popen(
+        ["Xvfb", display, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    time.sleep(0.5)
+    os.environ["DISPLAY"] = display
+    return process
+
+
+def bench_render(mode, path, repeat):
+
+    from taskflow_gui import TaskFlowGUI
+
+    results = {}
+    start = time.perf_counter()
+    app = TaskFlowGUI(data_file=path, storage_mode=mode)
+    app.root.update()
+    results['first_paint'] = {'min': time.perf_counter() - start, 'median': None, 'repeat': 1}
+
+    while app.loading:
+        app.root.update()
+    results['load_complete'] = {'min': time.perf_counter() - start, 'median': None, 'repeat': 1}
+
+    def refresh():
+        app.refresh_task_list()
+        app.root.update_idletasks()
+
+    def switch_filter():
+        app.set_filter("pending")
+        app.set_filter("all")
+        app.root.update_idletasks()
+
+    def scroll():
+        for fraction in (0.25, 0.5, 0.75, 0.0):
+            app.task_canvas.yview_moveto(fraction)
+            app.root.update_idletasks()
+
+    def toggle():
+        task = app.task_view.items[0]
+        app.toggle_task_completion(task['id'], not task['completed'])
+        app.root.update_idletasks()
+
+    results['refresh'] = measure(refresh, repeat)
+    results['set_filter'] = measure(switch_filter, repeat)
+    results['scroll'] = measure(scroll, repeat)
+    results['toggle'] = measure(toggle, repeat)
+
+    if app.save_job is not None:
+        app.root.after_cancel(app.save_job)
+    app.storage.close()
+    app.root.destroy()
+    return results
+
+
+def compare(current, baseline_path, threshold):
+
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    previous = {
+        (entry['group'], entry['storage'], entry['size'], entry['name']): entry['seconds']['min']
+        for entry in baseline['results']
+    }
+    regressions = []
+    for entry in current['results']:
+        key = (entry['group'], entry['storage'], entry['size'], entry['name'])
+        if key not in previous or not previous[key]:
+            continue
+        ratio = entry['seconds']['min'] / previous[key]
+        marker = "  <-- regressão" if ratio > threshold else ""
+        print(f"{'/'.join(map(str, key)):<40} {ratio:>6.2f}x{marker}")
+        if ratio > threshold:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Benchmarks do TaskFlow")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="tamanhos separados por vírgula (ex.: 1000,1000000)")
+    parser.add_argument("--storage", default="json,journal,sqlite,binary")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--render", action="store_true",
+                        help="mede a renderização Tk (usa Xvfb se não houver DISPLAY)")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="arquivo de resultados anterior para comparação")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    modes = args.storage.split(",")
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': sizes,
+            'storage': modes,
+            'repeat': args.repeat
+        },
+        'results': []
+    }
+
+    display = start_virtual_display() if args.render else None
+    try:
+        for size in sizes:
+            tasks = generate_tasks(size)
+            for mode in modes:
+                with tempfile.TemporaryDirectory() as directory:
+                    path = prepare_storage(mode, directory, [dict(task) for task in tasks])
+                    groups = [('store', bench_storage(mode, size, path, args.repeat, random.Random(size)))]
+                    if args.render:
+                        if os.environ.get("DISPLAY"):
+                            groups.append(('render', bench_render(mode, path, args.repeat)))
+                        else:
+                            print("Sem DISPLAY nem Xvfb: renderização ignorada", file=sys.stderr)
+
+                for group, results in groups:
+                    for name, seconds in results.items():
+                        report['results'].append({
+                            'group': group,
+                            'storage': mode,
+                            'size': size,
+                            'name': name,
+                            'seconds': seconds
+                        })
+                        print(f"{group:<7} {mode:<8} {size:>8} {name:<14} {seconds['min']:.6f}s")
+    finally:
+        if display is not None:
+            display.terminate()
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    if args.compare:
+        if compare(report, args.compare, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
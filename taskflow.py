@@ -0,0 +1,303 @@
+import argparse
+import os
+import sys
+from datetime import datetime
+from itertools import islice
+
+from taskflow_core import (
+    DAY_MICROS,
+    EXPORT_FIELDS,
+    EXPORT_FORMATS,
+    FILTER_TYPES,
+    RECURRENCES,
+    SORT_KEYS,
+    complete_task,
+    convert_tasks_file,
+    create_storage,
+    export_tasks,
+    iter_filtered_tasks,
+    make_task,
+    micros_to_date,
+    progress_percent,
+    write_export
+)
+
+
+def parse_due(value):
+
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"prazo inválido: {value!r}")
+
+
+def command_add(args, storage):
+
+    store = storage.open_store()
+    task_id = storage.reserve_ids(store)[0]
+    task = make_task(task_id, args.title, args.description)
+    if args.due:
+        task['due_at'] = args.due
+        task['recurrence'] = args.repeat
+    task = store.add(task)
+    storage.commit(store, upserts=[task])
+    print(f"Tarefa {task['id']} adicionada: {task['title']}")
+    return 0
+
+
+def command_list(args, storage):
+
+    offset = (args.page - 1) * args.limit if args.page else args.offset
+    page = None
+    if not args.search and args.sort == "manual" and not args.reverse:
+        # O formato binário filtra por status sem decodificar as demais tarefas
+        page = storage.read_page(args.filter, offset, args.limit)
+    if page is not None:
+        tasks, total = page
+    elif args.search:
+        found = storage.open_store().search(args.search, args.filter, args.sort, args.reverse)
+        total = len(found)
+        tasks = found[offset:offset + args.limit]
+    else:
+        store = storage.open_store()
+        total = store.count(args.filter)
+        tasks = store.page(args.filter, offset, args.limit, args.sort, args.reverse)
+
+    day = False
+    for task in tasks:
+        if args.group:
+            key = {'completed': 'completed_at', 'due': 'due_at'}.get(args.sort, 'created_at')
+            task_day = task[key][:10] if task[key] else None
+            if task_day != day:
+                day = task_day
+                print(f"\n{day or 'sem data'}")
+        mark = "x" if task['completed'] else " "
+        due = f"  (prazo {task['due_at'][:16].replace('T', ' ')})" if task.get('due_at') else ""
+        print(f"[{mark}] {task['id']:>6}  {task['title']}{due}")
+    
+    pages = max(1, -(-total // args.limit)) if args.limit > 0 else 1
+    print(f"-- página {offset // args.limit + 1 if args.limit > 0 else 1} de {pages} ({total} tarefa(s))")
+    return 0
+
+
+def command_done(args, storage):
+
+    store = storage.open_store()
+    changed = []
+    found = 0
+    for task_id in args.ids:
+        if task_id not in store:
+            print(f"Tarefa {task_id} não encontrada", file=sys.stderr)
+            continue
+        task, follow_up = complete_task(storage, store, task_id, not args.undo)
+        changed.append(task)
+        found += 1
+        if follow_up is not None:
+            changed.append(follow_up)
+            print(f"Próxima ocorrência: tarefa {follow_up['id']} para {follow_up['due_at'][:16]}")
+
+    if changed:
+        storage.commit(store, upserts=changed)
+    return 0 if found == len(args.ids) else 1
+
+
+def command_stats(args, storage):
+
+    if not args.days:
+        counts = storage.read_counts() or storage.open_store().counts()
+    else:
+        store = storage.open_store()
+        counts = store.counts()
+    print(
+        f"Total: {counts['total']} | Pendentes: {counts['pending']} | "
+        f"Concluídas: {counts['completed']} | Progresso: {progress_percent(counts):.0f}%"
+    )
+    if not args.days:
+        return 0
+    
+    period = 7 if args.weekly else 1
+    rows = store.daily_rollups().recent(-(-args.days // period), period)
+    print(f"\n{'início':<10} {'criadas':>8} {'concluídas':>10} {'dias p/ concluir':>16} {'em aberto':>9}")
+    for row in rows:
+        lead = f"{row['lead_days']:.1f}" if row['lead_days'] is not None else "-"
+        print(
+            f"{micros_to_date(row['day'] * DAY_MICROS).isoformat():<10} {row['created']:>8} "
+            f"{row['completed']:>10} {lead:>16} {row['open']:>9}"
+        )
+    return 0
+
+
+def command_archive(args, storage):
+
+    archive = storage.open_archive()
+    if args.search is not None:
+        for month, task in islice(archive.search(args.search), args.limit):
+            print(f"{month}  {task['id']:>6}  {task['title']}")
+        return 0
+    
+    if args.restore:
+        store = storage.open_store()
+        wanted = set(args.restore)
+        found = [(month, task) for month, task in archive.search() if task['id'] in wanted]
+        restored = []
+        for month, task in found:
+            # Cópia: archive.remove(found) procura pelo ID original
+            task = dict(task)
+            if task['id'] in store:
+                task['id'] = storage.reserve_ids(store)[0]
+            restored.append(store.add(task, archived=True))
+        storage.commit(store, upserts=restored)
+        storage.flush()
+        archive.remove(found)
+        for task in restored:
+            print(f"Tarefa {task['id']} restaurada: {task['title']}")
+        return 0 if len(found) == len(wanted) else 1
+    
+    store = storage.open_store()
+    count = storage.archive_completed(store, args.days)
+    print(f"{count} tarefa(s) arquivada(s) em {archive.path}")
+    return 0
+
+
+def command_serve(args, storage):
+
+    from taskflow_api import run_server
+
+    def announce(server):
+        print(f"API em http://{server.host}:{server.port}/ (Ctrl+C para sair)", flush=True)
+
+    run_server(storage, args.host, args.port, on_ready=announce)
+    return 0
+
+
+def command_export(args, storage):
+
+    store = storage.open_store()
+    tasks = iter_filtered_tasks(store, args.filter, args.search, args.sort, args.reverse)
+    fields = args.fields.split(",") if args.fields else EXPORT_FIELDS
+    unknown = [field for field in fields if field not in EXPORT_FIELDS]
+    if unknown:
+        print(f"Campo(s) desconhecido(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    
+    if args.output == "-":
+        try:
+            for _ in write_export(tasks, sys.stdout, args.format or "csv", fields):
+                pass
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # Leitor fechou a saída (ex.: | head); evita outro erro ao sair
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    
+    exported = 0
+    for exported in export_tasks(tasks, args.output, args.format, fields):
+        pass
+    print(f"{exported} tarefa(s) exportada(s) para {args.output}", file=sys.stderr)
+    return 0
+
+
+def command_convert(args, storage):
+
+    count = convert_tasks_file(args.source, args.target)
+    print(f"{count} tarefa(s) convertida(s) para {args.target}")
+    return 0
+
+
+def build_parser():
+
+    parser = argparse.ArgumentParser(prog="taskflow", description="TaskFlow em linha de comando")
+    parser.add_argument("--file", default="tasks_gui.json", help="arquivo de tarefas")
+    parser.add_argument(
+        "--storage",
+        default=os.environ.get("TASKFLOW_STORAGE", "json"),
+        help="modo de armazenamento (json, journal, sqlite, binary)"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add_parser = commands.add_parser("add", help="adiciona uma tarefa")
+    add_parser.add_argument("title")
+    add_parser.add_argument("-d", "--description", default="")
+    add_parser.add_argument("--due", type=parse_due, help="prazo (AAAA-MM-DD[THH:MM])")
+    add_parser.add_argument("--repeat", choices=RECURRENCES[1:], default="",
+                            help="repete a tarefa a partir do prazo")
+    add_parser.set_defaults(handler=command_add)
+
+    list_parser = commands.add_parser("list", help="lista tarefas")
+    list_parser.add_argument("--filter", choices=FILTER_TYPES, default="all")
+    list_parser.add_argument("--search", default="")
+    list_parser.add_argument("--offset", type=int, default=0)
+    list_parser.add_argument("--limit", type=int, default=50)
+    list_parser.add_argument("--page", type=int, help="página (de --limit tarefas), a partir de 1")
+    list_parser.add_argument("--sort", choices=SORT_KEYS, default="manual")
+    list_parser.add_argument("--reverse", action="store_true", help="ordem decrescente")
+    list_parser.add_argument("--group", action="store_true", help="agrupa por dia")
+    list_parser.set_defaults(handler=command_list)
+
+    done_parser = commands.add_parser("done", help="marca tarefas como concluídas")
+    done_parser.add_argument("ids", type=int, nargs="+")
+    done_parser.add_argument("--undo", action="store_true", help="marca como pendentes")
+    done_parser.set_defaults(handler=command_done)
+
+    stats_parser = commands.add_parser("stats", help="mostra estatísticas")
+    stats_parser.add_argument("--days", type=int, default=0,
+                              help="mostra criadas, concluídas e em aberto nos últimos N dias")
+    stats_parser.add_argument("--weekly", action="store_true", help="agrupa por semana")
+    stats_parser.set_defaults(handler=command_stats)
+
+    archive_parser = commands.add_parser(
+        "archive",
+        help="arquiva tarefas concluídas há mais de --days dias"
+    )
+    archive_parser.add_argument("--days", type=int, default=90)
+    archive_parser.add_argument("--search", help="busca no arquivo em vez de arquivar")
+    archive_parser.add_argument("--limit", type=int, default=50)
+    archive_parser.add_argument("--restore", type=int, nargs="+", metavar="ID",
+                                help="devolve as tarefas arquivadas à lista")
+    archive_parser.set_defaults(handler=command_archive)
+
+    serve_parser = commands.add_parser("serve", help="serve a API HTTP/JSON local, sem interface")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765, help="0 escolhe uma porta livre")
+    serve_parser.set_defaults(handler=command_serve)
+
+    export_parser = commands.add_parser(
+        "export",
+        help="exporta tarefas para CSV, JSON Lines ou iCalendar"
+    )
+    export_parser.add_argument("output", help="arquivo de saída (- para a saída padrão)")
+    export_parser.add_argument("--format", choices=tuple(EXPORT_FORMATS),
+                               help="formato (padrão: pela extensão do arquivo)")
+    export_parser.add_argument("--filter", choices=FILTER_TYPES, default="all")
+    export_parser.add_argument("--search", default="")
+    export_parser.add_argument("--sort", choices=SORT_KEYS, default="manual")
+    export_parser.add_argument("--reverse", action="store_true")
+    export_parser.add_argument("--fields", help="campos separados por vírgula (CSV e JSON Lines)")
+    export_parser.set_defaults(handler=command_export)
+
+    convert_parser = commands.add_parser(
+        "convert",
+        help="converte entre JSON e o formato binário (.tfb)"
+    )
+    convert_parser.add_argument("source")
+    convert_parser.add_argument("target")
+    convert_parser.set_defaults(handler=command_convert)
+
+    return parser
+
+
+def main(argv=None):
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "add" and args.repeat and not args.due:
+        parser.error("--repeat exige --due (a repetição parte do prazo)")
+    storage = create_storage(args.storage, args.file)
+    try:
+        return args.handler(args, storage)
+    finally:
+        storage.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,771 @@
+import asyncio
+import json
+import queue
+import re
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from itertools import islice
+from urllib.parse import parse_qsl, urlsplit
+
+from taskflow_core import (
+    FILTER_TYPES,
+    RECURRENCES,
+    SORT_KEYS,
+    Task,
+    change_task_id,
+    complete_task,
+    iso_to_micros,
+    make_task,
+    micros_to_iso,
+    task_snapshot
+)
+
+DEFAULT_PORT = 8765
+MAX_PAGE_SIZE = 1000
+MAX_BODY_SIZE = 8 << 20
+MAX_HEADERS = 100
+TRUE_VALUES = {"1", "true", "yes", "sim", "on"}
+REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable"
+}
+
+
+class ApiError(Exception):
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def encode_json(data):
+
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def change_records(upserts=(), deletes=()):
+
+    deletes = set(deletes)
+    latest = {task['id']: task for task in upserts if task['id'] not in deletes}
+    records = [{'op': 'put', 'task': task_snapshot(task)} for task in latest.values()]
+    records.extend({'op': 'delete', 'id': task_id} for task_id in deletes)
+    return records
+
+
+class ChangeFeed:
+
+    """Últimas mudanças numeradas, servidas pelo ``/changes``.
+
+    ``publish`` pode ser chamado de qualquer thread; quem espera no laço
+    asyncio é acordado com ``call_soon_threadsafe``.
+    """
+
+    def __init__(self, max_records=10000):
+        self.records = deque(maxlen=max_records)
+        self.sequence = 0
+        self.lock = threading.Lock()
+        self.loop = None
+        self.waiters = set()
+
+    def publish(self, records):
+
+        if not records:
+            return
+        with self.lock:
+            for record in records:
+                self.sequence += 1
+                self.records.append(dict(record, seq=self.sequence))
+        loop = self.loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self.wake)
+            except RuntimeError:
+                pass
+
+    def wake(self):
+
+        for waiter in self.waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self.waiters.clear()
+
+    def since(self, sequence):
+
+        """Registros depois de ``sequence``, ou None se já saíram do buffer."""
+        with self.lock:
+            if sequence > self.sequence:
+                return None
+            first = self.records[0]['seq'] if self.records else self.sequence + 1
+            if sequence < first - 1:
+                return None
+            return list(islice(self.records, sequence - first + 1, None))
+
+    async def wait(self, timeout):
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.waiters.discard(waiter)
+
+
+def int_param(params, name, default, minimum=0):
+
+    try:
+        value = int(params.get(name, default))
+    except (TypeError, ValueError):
+        raise ApiError(400, f"Parâmetro '{name}' deve ser inteiro")
+    if value < minimum:
+        raise ApiError(400, f"Parâmetro '{name}' deve ser no mínimo {minimum}")
+    return value
+
+
+def choice_param(params, name, choices, default):
+
+    value = params.get(name, default)
+    if value not in choices:
+        raise ApiError(400, f"Parâmetro '{name}' deve ser um de: {', '.join(choices)}")
+    return value
+
+
+def task_fields(data):
+
+    """Valida o corpo de uma tarefa nova vindo da API."""
+    if not isinstance(data, dict):
+        raise ApiError(400, "Esperado um objeto JSON")
+    title = data.get('title')
+    if not isinstance(title, str) or not title.strip():
+        raise ApiError(400, "Campo 'title' é obrigatório")
+    description = data.get('description') or ""
+    if not isinstance(description, str):
+        raise ApiError(400, "Campo 'description' deve ser texto")
+    recurrence = data.get('recurrence') or ""
+    if recurrence not in RECURRENCES:
+        raise ApiError(400, f"Campo 'recurrence' deve ser um de: {', '.join(RECURRENCES[1:])}")
+
+    fields = {'title': title.strip(), 'description': description.strip()}
+    try:
+        due = iso_to_micros(data.get('due_at'))
+    except (TypeError, ValueError, AttributeError):
+        raise ApiError(400, "Campo 'due_at' deve ser uma data ISO")
+    fields['due_at'] = micros_to_iso(due)
+    fields['recurrence'] = recurrence if due is not None else ""
+    fields['completed'] = bool(data.get('completed', False))
+    return fields
+
+
+class TaskService:
+
+    """Operações da API sobre a store de quem hospeda o servidor.
+
+    Sempre roda na thread dona da store (a do Tk, na interface). As
+    mudanças se acumulam como ``(antes, depois, visível antes)``, no formato
+    do ``OperationLog``, e são entregues ao host de uma vez, em ``flush``,
+    ao fim de cada lote.
+    """
+
+    def __init__(self, host):
+        self.host = host
+        self.changes = []
+
+    @property
+    def store(self):
+
+        return self.host.store
+
+    def require_loaded(self):
+
+        if self.host.loading:
+            raise ApiError(503, "Tarefas ainda carregando")
+
+    def require_task(self, task_id):
+
+        task = self.store.get(task_id)
+        if task is None:
+            raise ApiError(404, f"Tarefa {task_id} não encontrada")
+        return task
+
+    def list_tasks(self, params):
+
+        filter_type = choice_param(params, 'filter', FILTER_TYPES, "all")
+        sort_key = choice_param(params, 'sort', SORT_KEYS, "manual")
+        reverse = params.get('reverse', "").casefold() in TRUE_VALUES
+        offset = int_param(params, 'offset', 0)
+        limit = min(int_param(params, 'limit', 50, 1), MAX_PAGE_SIZE)
+
+        query = params.get('q', "").strip()
+        if query:
+            found = self.store.search(query, filter_type, sort_key, reverse)
+            total = len(found)
+            tasks = found[offset:offset + limit]
+        else:
+            total = self.store.count(filter_type)
+            tasks = self.store.page(filter_type, offset, limit, sort_key, reverse)
+        return {
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'tasks': [task_snapshot(task) for task in tasks]
+        }
+
+    def get_task(self, task_id):
+
+        return task_snapshot(self.require_task(task_id))
+
+    def add_tasks(self, records):
+
+        self.require_loaded()
+        fields = [task_fields(record) for record in records]
+        added = []
+        for values, task_id in zip(fields, self.host.storage.reserve_ids(self.store, len(fields))):
+            task = make_task(task_id, values['title'], values['description'])
+            task.update(values)
+            if task['completed']:
+                task['completed_at'] = task['created_at']
+            task = self.store.add(task)
+            self.changes.append((None, task, None))
+            added.append(task_snapshot(task))
+        return added
+
+    def add_task(self, data):
+
+        return 201, self.add_tasks([data])[0]
+
+    def toggle_task(self, task_id, data):
+
+        self.require_loaded()
+        task = self.require_task(task_id)
+        completed = data.get('completed') if isinstance(data, dict) else None
+        completed = not task['completed'] if completed is None else bool(completed)
+        if completed == bool(task['completed']):
+            return {'task': task_snapshot(task), 'next': None}
+
+        before = task_snapshot(task)
+        visible = self.host.task_visible(task)
+        task, follow_up = complete_task(self.host.storage, self.store, task_id, completed)
+        self.changes.append((before, task, visible))
+        if follow_up is not None:
+            self.changes.append((None, follow_up, None))
+        return {'task': task_snapshot(task), 'next': task_snapshot(follow_up)}
+
+    def delete_task(self, task_id):
+
+        self.require_loaded()
+        task = self.require_task(task_id)
+        visible = self.host.task_visible(task)
+        self.store.remove(task_id)
+        self.changes.append((task, None, visible))
+        return {'deleted': task_id}
+
+    def bulk(self, data):
+
+        """Aplica várias operações de uma vez: add, complete, reopen e delete."""
+        self.require_loaded()
+        if not isinstance(data, dict):
+            raise ApiError(400, "Esperado um objeto JSON")
+        for name in ('add', 'complete', 'reopen', 'delete'):
+            if not isinstance(data.get(name, []), list):
+                raise ApiError(400, f"Campo '{name}' deve ser uma lista")
+
+        result = {'added': self.add_tasks(data.get('add', [])), 'changed': 0, 'missing': []}
+        for name, completed in (('complete', True), ('reopen', False)):
+            for task_id in data.get(name, []):
+                if task_id not in self.store:
+                    result['missing'].append(task_id)
+                    continue
+                changed = self.toggle_task(task_id, {'completed': completed})
+                result['changed'] += 1
+                if changed['next'] is not None:
+                    result['added'].append(changed['next'])
+        for task_id in data.get('delete', []):
+            if task_id not in self.store:
+                result['missing'].append(task_id)
+                continue
+            self.delete_task(task_id)
+            result['changed'] += 1
+        return result
+
+    def stats(self):
+
+        counts = dict(self.store.counts())
+        counts['overdue'] = self.store.count("overdue")
+        return counts
+
+    def flush(self):
+
+        changes, self.changes = self.changes, []
+        if changes:
+            self.host.apply_service_changes(changes)
+
+
+class TkDispatcher:
+
+    """Executa as chamadas da API na thread do Tk, em lotes.
+
+    A thread do servidor só enfileira; o Tk esvazia a fila num ``after``,
+    a cada poucos milissegundos enquanto há tráfego e mais devagar quando
+    o servidor está ocioso. Depois de cada lote, ``on_batch`` entrega as
+    mudanças à interface de uma vez.
+    """
+
+    def __init__(self, root, on_batch, active_interval=2, idle_interval=50, idle_after=1.0):
+        self.root = root
+        self.on_batch = on_batch
+        self.active_interval = active_interval
+        self.idle_interval = idle_interval
+        self.idle_after = idle_after
+        self.queue = queue.Queue()
+        self.last_active = 0.0
+        self.job = None
+
+    def submit(self, function):
+
+        future = Future()
+        self.queue.put((function, future))
+        return future
+
+    def start(self):
+
+        self.job = self.root.after(self.idle_interval, self.drain)
+
+    def drain(self, reschedule=True):
+
+        deadline = time.perf_counter() + 0.02
+        count = 0
+        while time.perf_counter() < deadline:
+            try:
+                function, future = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(function())
+            except Exception as e:
+                future.set_exception(e)
+            count += 1
+
+        now = time.perf_counter()
+        if count:
+            self.on_batch()
+            self.last_active = now
+        if reschedule:
+            active = now - self.last_active < self.idle_after
+            self.job = self.root.after(
+                self.active_interval if active else self.idle_interval,
+                self.drain
+            )
+
+    def stop(self):
+
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+        self.drain(reschedule=False)
+
+
+class InlineDispatcher:
+
+    """Executa as chamadas direto no laço asyncio, para o servidor sem interface.
+
+    As mudanças de um surto de requisições são gravadas juntas, alguns
+    milissegundos depois da primeira.
+    """
+
+    def __init__(self, on_batch, delay=0.005):
+        self.on_batch = on_batch
+        self.delay = delay
+        self.scheduled = False
+
+    def submit(self, function):
+
+        future = Future()
+        try:
+            future.set_result(function())
+        except Exception as e:
+            future.set_exception(e)
+        if not self.scheduled:
+            self.scheduled = True
+            asyncio.get_running_loop().call_later(self.delay, self.flush)
+        return future
+
+    def flush(self):
+
+        self.scheduled = False
+        self.on_batch()
+
+    def stop(self):
+
+        self.on_batch()
+
+
+class StorageHost:
+
+    """Host sem interface: a store pertence ao laço do servidor.
+
+    Como na interface, as gravações esperam ``save_delay`` segundos para
+    juntar as mudanças; o feed é avisado na hora.
+    """
+
+    loading = False
+    save_delay = 0.25
+
+    def __init__(self, storage, feed):
+        self.storage = storage
+        self.store = storage.open_store()
+        self.trash = storage.open_trash()
+        self.feed = feed
+        self.pending_upserts = {}
+        self.pending_deletes = set()
+        self.save_handle = None
+
+    def task_visible(self, task):
+
+        return False
+
+    def apply_service_changes(self, changes):
+
+        upserts = [after for _, after, _ in changes if after is not None]
+        removed = [before for before, after, _ in changes if after is None]
+        deletes = [task['id'] for task in removed]
+        for task in upserts:
+            self.pending_upserts[task['id']] = task
+        for task_id in deletes:
+            self.pending_upserts.pop(task_id, None)
+            self.pending_deletes.add(task_id)
+        if removed:
+            self.trash.add(removed)
+        self.feed.publish(change_records(upserts, deletes))
+
+        if self.save_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush_saves()
+                return
+            self.save_handle = loop.call_later(self.save_delay, self.flush_saves)
+
+    def flush_saves(self):
+
+        if self.save_handle is not None:
+            self.save_handle.cancel()
+            self.save_handle = None
+        upserts = list(self.pending_upserts.values())
+        deletes = list(self.pending_deletes)
+        self.pending_upserts.clear()
+        self.pending_deletes.clear()
+        if upserts or deletes:
+            self.storage.commit(self.store, upserts=upserts, deletes=deletes)
+
+    def poll(self):
+
+        """Aplica e publica o que outros processos gravaram."""
+        pending = set(self.pending_upserts) | self.pending_deletes
+        changes = [
+            change for change in self.storage.poll_changes(self.store)
+            if change['op'] == 'reload' or change_task_id(change) not in pending
+        ]
+        for change in changes:
+            if change['op'] == 'delete':
+                self.store.remove(change['id'])
+            elif change['op'] == 'put':
+                task = Task.from_dict(change['task']).to_dict()
+                if task['id'] in self.store:
+                    task_id = task.pop('id')
+                    self.store.update(task_id, **task)
+                else:
+                    self.store.add(task)
+        self.feed.publish(changes)
+
+    def close(self):
+
+        self.flush_saves()
+        self.storage.close()
+        self.trash.close()
+
+
+class ApiServer:
+
+    """Servidor HTTP/JSON mínimo, com keep-alive, sobre ``asyncio``.
+
+    Rotas:
+      GET    /tasks?filter=&sort=&reverse=&offset=&limit=&q=
+      POST   /tasks
+      GET    /tasks/<id>
+      DELETE /tasks/<id>
+      POST   /tasks/<id>/toggle        {"completed": true|false} (opcional)
+      POST   /tasks/bulk               {"add": [...], "complete": [...], "reopen": [...], "delete": [...]}
+      GET    /stats
+      GET    /changes?since=<seq>      feed NDJSON contínuo (chunked)
+    """
+
+    TASK_PATH = re.compile(r"^/tasks/(\d+)(/toggle)?$")
+
+    def __init__(self, service, dispatcher, feed, host="127.0.0.1", port=DEFAULT_PORT,
+                 poll_interval=1.0, heartbeat=15.0):
+        self.service = service
+        self.dispatcher = dispatcher
+        self.feed = feed
+        self.host = host
+        self.port = port
+        self.poll_interval = poll_interval
+        self.heartbeat = heartbeat
+        self.loop = None
+        self.stopping = None
+        self.thread = None
+        self.ready = threading.Event()
+        self.error = None
+        self.connections = {}
+
+    def start(self):
+
+        """Roda o servidor numa thread própria, ao lado do mainloop do Tk."""
+        self.thread = threading.Thread(target=self.run, name="taskflow-api", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+
+    def run(self):
+
+        try:
+            asyncio.run(self.serve())
+        except Exception as e:
+            self.error = e
+            self.ready.set()
+
+    async def serve(self, on_ready=None):
+
+        self.loop = asyncio.get_running_loop()
+        self.feed.loop = self.loop
+        self.stopping = self.loop.create_future()
+        server = await asyncio.start_server(self.handle, self.host, self.port, reuse_address=True)
+        self.port = server.sockets[0].getsockname()[1]
+
+        poller = None
+        if hasattr(self.service.host, 'poll'):
+            poller = asyncio.ensure_future(self.poll_host())
+        self.ready.set()
+        if on_ready is not None:
+            on_ready(self)
+
+        async with server:
+            await self.stopping
+            if poller is not None:
+                poller.cancel()
+            # Fecha as conexões abertas para que os handlers terminem sozinhos,
+            # em vez de serem cancelados pelo asyncio.run
+            for writer in self.connections.values():
+                writer.close()
+            self.feed.wake()
+            if self.connections:
+                await asyncio.wait(list(self.connections), timeout=1)
+        self.feed.loop = None
+
+    def shutdown(self):
+
+        if not self.stopping.done():
+            self.stopping.set_result(None)
+
+    def stop(self):
+
+        if self.loop is not None and self.stopping is not None:
+            self.loop.call_soon_threadsafe(self.shutdown)
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+    async def poll_host(self):
+
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await asyncio.wrap_future(self.dispatcher.submit(self.service.host.poll))
+            except Exception:
+                pass
+
+    async def call(self, function, *args):
+
+        return await asyncio.wrap_future(self.dispatcher.submit(lambda: function(*args)))
+
+    async def route(self, method, path, params, body):
+
+        service = self.service
+        if path == "/tasks":
+            if method == "GET":
+                return await self.call(service.list_tasks, params)
+            if method == "POST":
+                return await self.call(service.add_task, body)
+            raise ApiError(405, "Método não permitido")
+        if path == "/tasks/bulk":
+            if method == "POST":
+                return await self.call(service.bulk, body)
+            raise ApiError(405, "Método não permitido")
+        if path == "/stats":
+            return await self.call(service.stats)
+
+        match = self.TASK_PATH.match(path)
+        if match is None:
+            raise ApiError(404, "Rota não encontrada")
+        task_id = int(match.group(1))
+        if match.group(2):
+            if method == "POST":
+                return await self.call(service.toggle_task, task_id, body)
+        elif method == "GET":
+            return await self.call(service.get_task, task_id)
+        elif method == "DELETE":
+            return await self.call(service.delete_task, task_id)
+        raise ApiError(405, "Método não permitido")
+
+    async def read_request(self, reader):
+
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode('latin-1').split(" ", 2)
+        except ValueError:
+            raise ApiError(400, "Linha de requisição inválida")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise ApiError(400, "Cabeçalhos demais")
+            name, _, value = line.decode('latin-1').partition(":")
+            headers[name.strip().casefold()] = value.strip()
+
+        body = None
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise ApiError(400, "Content-Length inválido")
+        if length > MAX_BODY_SIZE:
+            raise ApiError(413, "Corpo grande demais")
+        if length:
+            try:
+                body = json.loads(await reader.readexactly(length))
+            except ValueError:
+                raise ApiError(400, "Corpo JSON inválido")
+
+        url = urlsplit(target)
+        return method.upper(), url.path.rstrip("/") or "/", dict(parse_qsl(url.query)), headers, body
+
+    def response(self, status, payload, keep_alive):
+
+        body = encode_json(payload)
+        return (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode('latin-1') + body
+
+    async def handle(self, reader, writer):
+
+        handler = asyncio.current_task()
+        self.connections[handler] = writer
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self.read_request(reader)
+                    if request is None:
+                        break
+                    method, path, params, headers, body = request
+                    keep_alive = headers.get('connection', "").casefold() != "close"
+                    if path == "/changes" and method == "GET":
+                        await self.stream_changes(writer, params)
+                        break
+                    result = await self.route(method, path, params, body)
+                    status, payload = result if isinstance(result, tuple) else (200, result)
+                except ApiError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    break
+                except Exception as e:
+                    status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+
+                writer.write(self.response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            del self.connections[handler]
+            writer.close()
+
+    async def stream_changes(self, writer, params):
+
+        """Envia as mudanças como NDJSON em chunks, até o cliente desconectar.
+
+        Sem ``since``, começa pelas próximas mudanças. Se o cliente ficou
+        para trás do buffer, recebe ``{"op": "reset"}`` e deve listar de novo.
+        """
+        since = int_param(params, 'since', self.feed.sequence)
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/x-ndjson; charset=utf-8\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"Cache-Control: no-cache\r\n\r\n"
+        )
+        while True:
+            records = self.feed.since(since)
+            if records is None:
+                since = self.feed.sequence
+                records = [{'op': 'reset', 'seq': since}]
+            if records:
+                since = records[-1]['seq']
+                data = b"".join(encode_json(record) + b"\n" for record in records)
+            else:
+                await self.feed.wait(self.heartbeat)
+                if self.stopping.done():
+                    return
+                if self.feed.sequence != since:
+                    continue
+                # Linha vazia: mantém a conexão viva e detecta clientes que saíram
+                data = b"\n"
+            writer.write(f"{len(data):x}\r\n".encode('latin-1') + data + b"\r\n")
+            await writer.drain()
+
+
+def run_server(storage, host="127.0.0.1", port=DEFAULT_PORT, on_ready=None):
+
+    """Serve a API sem interface gráfica, até Ctrl+C."""
+    feed = ChangeFeed()
+    storage_host = StorageHost(storage, feed)
+    service = TaskService(storage_host)
+    dispatcher = InlineDispatcher(service.flush)
+    server = ApiServer(service, dispatcher, feed, host, port)
+
+    def started(server):
+        try:
+            server.loop.add_signal_handler(signal.SIGTERM, server.shutdown)
+        except (NotImplementedError, RuntimeError):
+            pass
+        if on_ready is not None:
+            on_ready(server)
+
+    try:
+        asyncio.run(server.serve(started))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dispatcher.stop()
+        storage_host.close()
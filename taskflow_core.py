@@ -0,0 +1,3599 @@
+import bisect
+import calendar
+import csv
+import gzip
+import io
+import json
+import mmap
+import os
+import re
+import shutil
+import sqlite3
+import struct
+import sys
+import threading
+import time
+import unicodedata
+import warnings
+from array import array
+from collections import deque
+from itertools import islice
+from datetime import datetime, timedelta, timezone
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# NumPy é opcional e demora a importar; load_numpy() o carrega na primeira
+# reconstrução das agregações, não na partida
+numpy = False
+
+FILTER_TYPES = ("all", "pending", "completed", "overdue")
+SORT_KEYS = ("manual", "created", "completed", "title", "due")
+DAY_SORT_KEYS = ("created", "completed", "due")
+RECURRENCES = ("", "daily", "weekly", "monthly")
+TASK_KEYS = (
+    'id', 'title', 'description', 'completed', 'created_at', 'completed_at',
+    'due_at', 'recurrence'
+)
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+META_VERSION = 2
+DAY_MICROS = 86400 * 1000000
+ROLLUP_KEYS = frozenset(('completed', 'created_at', 'completed_at'))
+LEGACY_TIME_FORMATS = (
+    "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y",
+    "%Y/%m/%d %H:%M:%S", "%Y/%m/%d %H:%M", "%Y/%m/%d"
+)
+
+
+def iso_to_micros(value):
+
+    if not value:
+        return None
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return (moment - EPOCH) // MICROSECOND
+
+
+def parse_timestamp(value):
+
+    """Como ``iso_to_micros``, mas tolerante com dados gravados.
+
+    Aceita também as datas dd/mm/aaaa de arquivos antigos; um valor ilegível
+    vira None, com um aviso, em vez de impedir a carga das outras tarefas.
+    """
+    try:
+        return iso_to_micros(value)
+    except (TypeError, ValueError):
+        pass
+    text = str(value).strip()
+    for time_format in LEGACY_TIME_FORMATS:
+        try:
+            return (datetime.strptime(text, time_format) - EPOCH) // MICROSECOND
+        except ValueError:
+            pass
+    warnings.warn(f"Data ilegível ignorada: {value!r}", stacklevel=2)
+    return None
+
+
+def normalize_timestamp(value):
+
+    return micros_to_iso(parse_timestamp(value))
+
+
+def micros_to_iso(value):
+
+    if value is None:
+        return None
+    return (EPOCH + timedelta(microseconds=value)).isoformat()
+
+
+def now_micros():
+
+    return (datetime.now() - EPOCH) // MICROSECOND
+
+
+class Task:
+
+    __slots__ = ('id', 'title', 'description', 'completed', 'created', 'finished', 'due', 'recurrence')
+    
+    def __init__(self, task_id, title, description="", completed=False, created=None, finished=None,
+                 due=None, recurrence=""):
+        self.id = task_id
+        self.title = sys.intern(title)
+        self.description = sys.intern(description) if description else ""
+        self.completed = bool(completed)
+        self.created = created
+        self.finished = finished
+        self.due = due
+        self.recurrence = recurrence if recurrence in RECURRENCES else ""
+    
+    @classmethod
+    def from_dict(cls, data):
+
+        if isinstance(data, cls):
+            return data
+        return cls(
+            data.get('id'),
+            str(data.get('title') or ""),
+            str(data.get('description') or ""),
+            data.get('completed', False),
+            parse_timestamp(data.get('created_at')),
+            parse_timestamp(data.get('completed_at')),
+            parse_timestamp(data.get('due_at')),
+            data.get('recurrence') or ""
+        )
+    
+    @property
+    def created_at(self):
+
+        return micros_to_iso(self.created)
+    
+    @created_at.setter
+    def created_at(self, value):
+
+        self.created = iso_to_micros(value)
+    
+    @property
+    def completed_at(self):
+
+        return micros_to_iso(self.finished)
+    
+    @completed_at.setter
+    def completed_at(self, value):
+
+        self.finished = iso_to_micros(value)
+    
+    @property
+    def due_at(self):
+
+        return micros_to_iso(self.due)
+    
+    @due_at.setter
+    def due_at(self, value):
+
+        self.due = iso_to_micros(value)
+    
+    def __getitem__(self, key):
+
+        if key not in TASK_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __setitem__(self, key, value):
+
+        if key not in TASK_KEYS:
+            raise KeyError(key)
+        if key in ('title', 'description'):
+            value = sys.intern(value) if value else ""
+        elif key == 'completed':
+            value = bool(value)
+        elif key == 'recurrence':
+            value = value if value in RECURRENCES else ""
+        setattr(self, key, value)
+    
+    def __contains__(self, key):
+
+        return key in TASK_KEYS
+    
+    def get(self, key, default=None):
+
+        return getattr(self, key) if key in TASK_KEYS else default
+    
+    def keys(self):
+
+        return TASK_KEYS
+    
+    def update(self, fields):
+
+        for key, value in fields.items():
+            self[key] = value
+    
+    def to_dict(self):
+
+        return {key: getattr(self, key) for key in TASK_KEYS}
+    
+    def copy(self):
+
+        task = Task.__new__(Task)
+        for slot in Task.__slots__:
+            setattr(task, slot, getattr(self, slot))
+        return task
+    
+    def __repr__(self):
+
+        return f"Task({self.to_dict()!r})"
+
+
+def task_to_json(value):
+
+    if isinstance(value, Task):
+        return value.to_dict()
+    raise TypeError(f"Objeto do tipo {type(value).__name__} não é serializável em JSON")
+
+
+def make_task(task_id, title, description=""):
+
+    return Task(task_id, title, description, created=now_micros())
+
+
+def task_matches_status(task, filter_type, now=None):
+
+    if filter_type == "pending":
+        return not task['completed']
+    elif filter_type == "completed":
+        return bool(task['completed'])
+    elif filter_type == "overdue":
+        return is_overdue(task, now)
+    return True
+
+
+def is_overdue(task, now=None):
+
+    if task['completed']:
+        return False
+    due = Task.from_dict(task).due
+    return due is not None and due < (now_micros() if now is None else now)
+
+
+def add_months(moment, months):
+
+    month = moment.month - 1 + months
+    year = moment.year + month // 12
+    month = month % 12 + 1
+    return moment.replace(year=year, month=month, day=min(moment.day, calendar.monthrange(year, month)[1]))
+
+
+def advance_due(due, recurrence, after):
+
+    """Próximo prazo da repetição que começa em ``due``, estritamente depois de ``after``."""
+    if due > after:
+        return due
+    if recurrence in ("daily", "weekly"):
+        step = DAY_MICROS * (1 if recurrence == "daily" else 7)
+        return due + ((after - due) // step + 1) * step
+    start = EPOCH + timedelta(microseconds=due)
+    limit = EPOCH + timedelta(microseconds=after)
+    months = (limit.year - start.year) * 12 + limit.month - start.month
+    moment = add_months(start, max(months, 0))
+    while moment <= limit:
+        months += 1
+        moment = add_months(start, months)
+    return (moment - EPOCH) // MICROSECOND
+
+
+def next_occurrence(task, task_id, now=None):
+
+    """Próxima ocorrência (pendente) de uma tarefa recorrente, ou None."""
+    task = Task.from_dict(task)
+    if not task.recurrence or task.due is None:
+        return None
+    now = now_micros() if now is None else now
+    return Task(
+        task_id, task.title, task.description,
+        created=now,
+        due=advance_due(task.due, task.recurrence, max(now, task.due)),
+        recurrence=task.recurrence
+    )
+
+
+def complete_task(storage, store, task_id, completed):
+
+    """Marca a conclusão de uma tarefa; as recorrentes geram a próxima ocorrência.
+
+    Retorna a tarefa atualizada e a nova ocorrência (ou None). A série
+    continua só na nova tarefa, então reabrir e concluir de novo a antiga
+    não duplica a repetição.
+    """
+    task = store.get(task_id)
+    follow_up = None
+    if completed and not task['completed'] and task.get('recurrence') and task.get('due_at'):
+        follow_up = store.add(next_occurrence(task, storage.reserve_ids(store)[0]))
+        store.update(task_id, recurrence="")
+    return store.set_completed(task_id, completed), follow_up
+
+
+def progress_percent(counts):
+
+    if counts['total'] > 0:
+        return (counts['completed'] / counts['total']) * 100
+    return 0.0
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def fold_text(text):
+
+    normalized = unicodedata.normalize('NFKD', text)
+    return "".join(c for c in normalized if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(text):
+
+    return set(TOKEN_PATTERN.findall(fold_text(text)))
+
+
+def task_tokens(task):
+
+    return tokenize(f"{task['title']} {task.get('description') or ''}")
+
+
+def matches_query(task, query):
+
+    tokens = task_tokens(task)
+    return all(
+        any(token.startswith(term) for token in tokens)
+        for term in tokenize(query)
+    )
+
+
+class SearchIndex:
+
+    def __init__(self, tasks=()):
+        self.postings = {}
+        self.doc_tokens = {}
+        
+        for task in tasks:
+            self.index_tokens(task)
+        self.vocabulary = sorted(self.postings)
+    
+    def index_tokens(self, task):
+
+        tokens = task_tokens(task)
+        self.doc_tokens[task['id']] = tokens
+        new_tokens = []
+        for token in tokens:
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = set()
+                new_tokens.append(token)
+            ids.add(task['id'])
+        return new_tokens
+    
+    def add(self, task):
+
+        for token in self.index_tokens(task):
+            bisect.insort(self.vocabulary, token)
+    
+    def remove(self, task_id):
+
+        for token in self.doc_tokens.pop(task_id, ()):
+            ids = self.postings[token]
+            ids.discard(task_id)
+            if not ids:
+                del self.postings[token]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+    
+    def update(self, task):
+
+        self.remove(task['id'])
+        self.add(task)
+    
+    def expand(self, prefix):
+
+        index = bisect.bisect_left(self.vocabulary, prefix)
+        while index < len(self.vocabulary) and self.vocabulary[index].startswith(prefix):
+            yield self.vocabulary[index]
+            index += 1
+    
+    def search(self, query):
+
+        result = None
+        for term in sorted(tokenize(query), key=len, reverse=True):
+            ids = set()
+            for token in self.expand(term):
+                ids |= self.postings[token]
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result if result is not None else set(self.doc_tokens)
+
+
+def sort_entry(task, sort_key, sequence):
+
+    # A sequência de inserção desempata e torna cada entrada única
+    if sort_key == "manual":
+        return (False, sequence, sequence, task.id)
+    if sort_key == "title":
+        return (False, task.title.casefold(), sequence, task.id)
+    if sort_key == "created":
+        value = task.created
+    elif sort_key == "due":
+        value = task.due
+    else:
+        value = task.finished
+    return (value is None, value or 0, sequence, task.id)
+
+
+def micros_to_date(value):
+
+    return (EPOCH + timedelta(microseconds=value)).date()
+
+
+def day_bounds(entries, index):
+
+    """Intervalo ``[início, fim)`` do dia da entrada ``index`` numa lista ordenada."""
+    missing, value = entries[index][:2]
+    if missing:
+        return None, bisect.bisect_left(entries, (True,)), len(entries)
+    day_start = value - value % DAY_MICROS
+    return (
+        micros_to_date(day_start),
+        bisect.bisect_left(entries, (False, day_start)),
+        bisect.bisect_left(entries, (False, day_start + DAY_MICROS))
+    )
+
+
+class SortedIndex:
+
+    """Listas de tarefas ordenadas por uma chave, mantidas com bisect.
+
+    Há uma lista para todas as tarefas e uma por status, para que filtro e
+    ordenação combinados custem O(log n) por mudança e O(1) por posição.
+    """
+
+    def __init__(self, store, sort_key):
+        self.sort_key = sort_key
+        self.entry_by_id = {
+            task.id: sort_entry(task, sort_key, store.order[task.id])
+            for task in store
+        }
+        everything = sorted(self.entry_by_id.values())
+        self.lists = {
+            'all': everything,
+            'pending': [entry for entry in everything if not store.by_id[entry[-1]].completed],
+            'completed': [entry for entry in everything if store.by_id[entry[-1]].completed]
+        }
+    
+    def status_list(self, completed):
+
+        return self.lists['completed' if completed else 'pending']
+    
+    def add(self, task, sequence):
+
+        entry = sort_entry(task, self.sort_key, sequence)
+        self.entry_by_id[task.id] = entry
+        bisect.insort(self.lists['all'], entry)
+        bisect.insort(self.status_list(task.completed), entry)
+    
+    def extend(self, tasks, order):
+
+        # Ordena só o lote e mescla: o Timsort junta duas sequências
+        # ordenadas em O(n), em vez de um insort O(n) por tarefa
+        batch = {'all': [], 'pending': [], 'completed': []}
+        for task in tasks:
+            entry = sort_entry(task, self.sort_key, order[task.id])
+            self.entry_by_id[task.id] = entry
+            batch['all'].append(entry)
+            batch['completed' if task.completed else 'pending'].append(entry)
+        for name, entries in batch.items():
+            entries.sort()
+            self.lists[name].extend(entries)
+            self.lists[name].sort()
+    
+    def remove(self, task_id, completed):
+
+        entry = self.entry_by_id.pop(task_id, None)
+        if entry is None:
+            return
+        for entries in (self.lists['all'], self.status_list(completed)):
+            index = bisect.bisect_left(entries, entry)
+            if index < len(entries) and entries[index] == entry:
+                del entries[index]
+    
+    def update(self, task, sequence, was_completed):
+
+        entry = sort_entry(task, self.sort_key, sequence)
+        if entry == self.entry_by_id.get(task.id) and was_completed == task.completed:
+            return
+        self.remove(task.id, was_completed)
+        self.add(task, sequence)
+    
+    def position(self, filter_type, task_id):
+
+        entry = self.entry_by_id.get(task_id)
+        if entry is None:
+            return None
+        entries = self.lists.get(filter_type, self.lists['all'])
+        index = bisect.bisect_left(entries, entry)
+        if index < len(entries) and entries[index] == entry:
+            return index
+        return None
+
+
+class SortedTaskSequence:
+
+    """Visão paginável e sempre atualizada de um ``SortedIndex``.
+
+    O acesso por posição é O(1); a lista segue o índice sem ser recriada e é
+    somente leitura: as mudanças passam pela store.
+    """
+
+    live = True
+    
+    def __init__(self, store, index, filter_type, reverse=False):
+        self.store = store
+        self.index = index
+        self.filter_type = filter_type
+        self.reverse = reverse
+    
+    @property
+    def entries(self):
+
+        return self.index.lists.get(self.filter_type, self.index.lists['all'])
+    
+    def __len__(self):
+
+        return len(self.entries)
+    
+    def position(self, index):
+
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(index)
+        return length - 1 - index if self.reverse else index
+    
+    def __getitem__(self, index):
+
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self.store.by_id[self.entries[self.position(index)][-1]]
+    
+    def __iter__(self):
+
+        length = len(self)
+        if self.reverse:
+            entries = (self.entries[index] for index in range(length - 1, -1, -1))
+        else:
+            entries = islice(self.entries, length)
+        return (self.store.by_id[entry[-1]] for entry in entries)
+    
+    def index_of(self, task_id):
+
+        index = self.index.position(self.filter_type, task_id)
+        if index is None or index >= len(self):
+            return None
+        return len(self) - 1 - index if self.reverse else index
+    
+    def group_of(self, index):
+
+        """Dia da tarefa na posição ``index`` e quantas tarefas há nesse dia."""
+        if self.index.sort_key not in DAY_SORT_KEYS or not len(self):
+            return None
+        day, start, end = day_bounds(self.entries, self.position(index))
+        return day, min(end, len(self)) - start
+    
+    def groups(self):
+
+        """Gera ``(dia, quantidade)`` na ordem da lista, com O(log n) por grupo."""
+        if self.index.sort_key not in DAY_SORT_KEYS:
+            return
+        entries = self.entries
+        length = len(self)
+        found = []
+        index = 0
+        while index < length:
+            day, start, end = day_bounds(entries, index)
+            end = min(end, length)
+            found.append((day, end - start))
+            index = end
+        yield from (reversed(found) if self.reverse else found)
+
+
+def overdue_count(entries, now=None):
+
+    """Quantas entradas de uma lista ordenada por prazo já venceram."""
+    return bisect.bisect_left(entries, (False, now_micros() if now is None else now))
+
+
+class OverdueTaskSequence(SortedTaskSequence):
+
+    """Tarefas pendentes com prazo vencido, das mais atrasadas às mais novas.
+
+    É um prefixo da lista de pendentes do índice de prazos: o tamanho
+    acompanha o relógio com uma busca binária, sem filtrar a store.
+    """
+
+    def __init__(self, store, index, reverse=False, now=None):
+        super().__init__(store, index, "pending", reverse)
+        self.now = now
+    
+    def __len__(self):
+
+        return overdue_count(self.entries, self.now)
+
+
+def sort_tasks(tasks, sort_key, reverse=False, order=None):
+
+    """Ordena uma lista pequena de tarefas (ex.: resultado de busca)."""
+    if sort_key not in SORT_KEYS[1:]:
+        return list(reversed(tasks)) if reverse else list(tasks)
+    sequence = order.__getitem__ if order is not None else (lambda task_id: 0)
+    return sorted(
+        tasks,
+        key=lambda task: sort_entry(Task.from_dict(task), sort_key, sequence(task['id'])),
+        reverse=reverse
+    )
+
+
+class IdAllocator:
+
+    def __init__(self, next_id=1):
+        self.next_id = next_id
+    
+    def allocate(self):
+
+        task_id = self.next_id
+        self.next_id += 1
+        return task_id
+    
+    def observe(self, task_id):
+
+        if task_id >= self.next_id:
+            self.next_id = task_id + 1
+
+
+def is_valid_id(task_id):
+
+    return isinstance(task_id, int) and not isinstance(task_id, bool) and task_id > 0
+
+
+def repair_task_ids(tasks):
+
+    """Corrige IDs duplicados ou inválidos, mantendo a primeira ocorrência.
+
+    As ocorrências repetidas recebem IDs novos acima do maior ID existente,
+    na ordem em que aparecem. Retorna a quantidade de tarefas alteradas.
+    """
+    allocator = IdAllocator()
+    for task in tasks:
+        if is_valid_id(task.get('id')):
+            allocator.observe(task['id'])
+    
+    seen = set()
+    repaired = 0
+    for task in tasks:
+        if not is_valid_id(task.get('id')) or task['id'] in seen:
+            task['id'] = allocator.allocate()
+            repaired += 1
+        seen.add(task['id'])
+    return repaired
+
+
+def load_numpy():
+
+    global numpy
+    if numpy is False:
+        try:
+            import numpy as module
+        except ImportError:
+            module = None
+        numpy = module
+    return numpy
+
+
+def rollup_values(task):
+
+    """Criação, status e conclusão (microssegundos) que entram nas agregações diárias."""
+    if isinstance(task, Task):
+        return task.created, task.completed, task.finished
+    return (
+        parse_timestamp(task['created_at']),
+        bool(task['completed']),
+        parse_timestamp(task['completed_at'])
+    )
+
+
+def bump(counter, key, delta):
+
+    value = counter.get(key, 0) + delta
+    if value:
+        counter[key] = value
+    else:
+        counter.pop(key, None)
+
+
+class DailyRollups:
+
+    """Tarefas criadas e concluídas por dia, e o tempo somado até a conclusão.
+
+    A store mantém as agregações a cada mudança e o armazenamento as grava
+    ao lado dos dados, então o painel de análise lê só os dias que mostra,
+    sem percorrer as tarefas. Os dias contam a partir de 1970-01-01 (hora
+    local), e o tempo até a conclusão é somado em microssegundos no dia da
+    conclusão.
+    """
+
+    # Versão 2: tarefas arquivadas continuam nos dias (a 1 as descontava)
+    VERSION = 2
+    
+    def __init__(self):
+        self.created = {}
+        self.completed = {}
+        self.lead = {}
+        self.total = 0
+        self.done = 0
+        self.dirty = False
+    
+    @classmethod
+    def from_columns(cls, created, finished, total, done):
+
+        """Reconstrói as agregações a partir de colunas ``array('q')``.
+
+        ``finished`` só tem valor para tarefas concluídas; datas ausentes são
+        ``BINARY_NO_TIME``. Com NumPy a contagem é vetorizada; sem ele, usa
+        um laço simples sobre os arrays.
+        """
+        rollups = cls()
+        rollups.total = total
+        rollups.done = done
+        rollups.dirty = True
+        numpy = load_numpy()
+        if numpy is not None:
+            created = numpy.frombuffer(created, dtype=numpy.int64)
+            finished = numpy.frombuffer(finished, dtype=numpy.int64)
+            has_created = created != BINARY_NO_TIME
+            has_finished = finished != BINARY_NO_TIME
+            days, counts = numpy.unique(created[has_created] // DAY_MICROS, return_counts=True)
+            rollups.created = dict(zip(days.tolist(), counts.tolist()))
+            days, counts = numpy.unique(finished[has_finished] // DAY_MICROS, return_counts=True)
+            rollups.completed = dict(zip(days.tolist(), counts.tolist()))
+            
+            both = has_created & has_finished
+            days, inverse = numpy.unique(finished[both] // DAY_MICROS, return_inverse=True)
+            sums = numpy.zeros(len(days), dtype=numpy.int64)
+            numpy.add.at(sums, inverse, numpy.maximum(finished[both] - created[both], 0))
+            rollups.lead = {day: lead for day, lead in zip(days.tolist(), sums.tolist()) if lead}
+            return rollups
+        
+        for start, end in zip(created, finished):
+            if start != BINARY_NO_TIME:
+                bump(rollups.created, start // DAY_MICROS, 1)
+            if end != BINARY_NO_TIME:
+                day = end // DAY_MICROS
+                bump(rollups.completed, day, 1)
+                if start != BINARY_NO_TIME:
+                    bump(rollups.lead, day, max(end - start, 0))
+        return rollups
+    
+    @classmethod
+    def from_tasks(cls, tasks):
+
+        created = array('q')
+        finished = array('q')
+        total = done = 0
+        for task in tasks:
+            start, completed, end = rollup_values(task)
+            created.append(BINARY_NO_TIME if start is None else start)
+            finished.append(BINARY_NO_TIME if end is None or not completed else end)
+            total += 1
+            done += bool(completed)
+        return cls.from_columns(created, finished, total, done)
+    
+    @classmethod
+    def from_dict(cls, data):
+
+        if data.get('version') != cls.VERSION:
+            raise ValueError("versão de agregações desconhecida")
+        rollups = cls()
+        rollups.total = int(data['total'])
+        rollups.done = int(data['done'])
+        for day, created, completed, lead in data['days']:
+            if created:
+                rollups.created[day] = created
+            if completed:
+                rollups.completed[day] = completed
+            if lead:
+                rollups.lead[day] = lead
+        return rollups
+    
+    def to_dict(self):
+
+        days = sorted(self.created.keys() | self.completed.keys())
+        return {
+            'version': self.VERSION,
+            'total': self.total,
+            'done': self.done,
+            'days': [
+                [day, self.created.get(day, 0), self.completed.get(day, 0), self.lead.get(day, 0)]
+                for day in days
+            ]
+        }
+    
+    def matches(self, counts):
+
+        return self.total == counts['total'] and self.done == counts['completed']
+    
+    def apply(self, task, sign, live=True, history=True):
+
+        """Soma (ou subtrai) a tarefa nas contagens atuais e/ou no histórico por dia."""
+        start, completed, end = rollup_values(task)
+        self.dirty = True
+        if live:
+            self.total += sign
+            self.done += sign if completed else 0
+        if not history:
+            return
+        if start is not None:
+            bump(self.created, start // DAY_MICROS, sign)
+        if completed and end is not None:
+            day = end // DAY_MICROS
+            bump(self.completed, day, sign)
+            if start is not None:
+                bump(self.lead, day, sign * max(end - start, 0))
+    
+    def add(self, task):
+
+        self.apply(task, 1)
+    
+    def discard(self, task):
+
+        self.apply(task, -1)
+    
+    def retire(self, task):
+
+        """Tarefa arquivada: sai das contagens, mas continua no histórico."""
+        self.apply(task, -1, history=False)
+    
+    def unretire(self, task):
+
+        self.apply(task, 1, history=False)
+    
+    def add_archived(self, tasks):
+
+        for task in tasks:
+            self.apply(task, 1, live=False)
+    
+    def first_day(self):
+
+        return min(self.created.keys() | self.completed.keys(), default=None)
+    
+    def series(self, first_day, last_day, period=1):
+
+        """Agrupa os dias de ``first_day`` a ``last_day`` em períodos de ``period`` dias.
+
+        Cada linha traz o dia inicial, as tarefas criadas e concluídas no
+        período, o tempo médio até a conclusão (em dias, ou None) e as
+        tarefas em aberto ao fim do período, para o gráfico de burndown.
+        O custo depende só da quantidade de dias, não de tarefas.
+        """
+        opened = sum(self.created.values()) - sum(self.completed.values())
+        opened -= sum(count for day, count in self.created.items() if day > last_day)
+        opened += sum(count for day, count in self.completed.items() if day > last_day)
+        
+        rows = []
+        for start in range(last_day - (last_day - first_day) % period, first_day - 1, -period):
+            end = min(start + period - 1, last_day)
+            created = completed = lead = 0
+            for day in range(start, end + 1):
+                created += self.created.get(day, 0)
+                completed += self.completed.get(day, 0)
+                lead += self.lead.get(day, 0)
+            rows.append({
+                'day': start,
+                'created': created,
+                'completed': completed,
+                'lead_days': lead / completed / DAY_MICROS if completed else None,
+                'open': opened
+            })
+            opened += completed - created
+        rows.reverse()
+        return rows
+    
+    def recent(self, count, period=1, today=None):
+
+        """Os últimos ``count`` períodos até hoje; semanas começam na segunda-feira."""
+        last_day = (now_micros() if today is None else today) // DAY_MICROS
+        first_day = last_day - period * count + 1
+        if period == 7:
+            # O dia 0 (01/01/1970) foi uma quinta-feira
+            first_day -= (first_day + 3) % 7
+        return self.series(first_day, last_day, period)
+
+
+class TaskStore:
+
+    def __init__(self, tasks=None):
+        self.by_id = {}
+        self.status_ids = {False: {}, True: {}}
+        self.unordered = set()
+        self.order = {}
+        self.sequence = 0
+        self.ids = IdAllocator()
+        self.search_index = None
+        self.sorted_indexes = {}
+        self.rollups = None
+        self.archived_tasks = None
+        
+        if tasks:
+            self.load(tasks)
+    
+    def __len__(self):
+
+        return len(self.by_id)
+    
+    def __iter__(self):
+
+        return iter(self.by_id.values())
+    
+    def __contains__(self, task_id):
+
+        return task_id in self.by_id
+    
+    def load(self, tasks):
+
+        self.by_id.clear()
+        self.status_ids = {False: {}, True: {}}
+        self.unordered.clear()
+        self.order.clear()
+        self.sequence = 0
+        self.search_index = None
+        self.sorted_indexes = {}
+        self.rollups = None
+        
+        self.extend(tasks)
+    
+    def extend(self, tasks):
+
+        indexes, self.sorted_indexes = self.sorted_indexes, {}
+        added = []
+        try:
+            for task in tasks:
+                task = Task.from_dict(task)
+                if task.id in self.by_id or not is_valid_id(task.id):
+                    task.id = self.ids.allocate()
+                added.append(self.add(task))
+        finally:
+            # Mesmo se o lote falhar no meio, os índices cobrem o que entrou
+            self.sorted_indexes = indexes
+            for index in indexes.values():
+                index.extend(added, self.order)
+        return added
+    
+    def next_id(self):
+
+        return self.ids.next_id
+    
+    def get(self, task_id):
+
+        return self.by_id.get(task_id)
+    
+    def add(self, task, archived=False):
+
+        """Inclui a tarefa; ``archived`` indica que ela volta do arquivo morto."""
+        task = Task.from_dict(task)
+        task_id = task.id
+        self.by_id[task_id] = task
+        self.order[task_id] = self.sequence
+        self.sequence += 1
+        self.ids.observe(task_id)
+        self.status_ids[bool(task['completed'])][task_id] = task
+        if self.search_index is not None:
+            self.search_index.add(task)
+        for index in self.sorted_indexes.values():
+            index.add(task, self.order[task_id])
+        if self.rollups is not None:
+            if archived:
+                self.rollups.unretire(task)
+            else:
+                self.rollups.add(task)
+        return task
+    
+    def update(self, task_id, **fields):
+
+        task = self.by_id[task_id]
+        was_completed = task.completed
+        rollups = self.rollups if ROLLUP_KEYS.intersection(fields) else None
+        if rollups is not None:
+            rollups.discard(task)
+        if 'completed' in fields and bool(fields['completed']) != bool(task['completed']):
+            self.move_status(task, bool(fields['completed']))
+        task.update(fields)
+        if self.search_index is not None and ('title' in fields or 'description' in fields):
+            self.search_index.update(task)
+        for index in self.sorted_indexes.values():
+            index.update(task, self.order[task_id], was_completed)
+        if rollups is not None:
+            rollups.add(task)
+        return task
+    
+    def set_completed(self, task_id, completed):
+
+        return self.update(
+            task_id,
+            completed=completed,
+            completed_at=datetime.now().isoformat() if completed else None
+        )
+    
+    def move_status(self, task, completed):
+
+        task_id = task['id']
+        del self.status_ids[not completed][task_id]
+        bucket = self.status_ids[completed]
+        if bucket and self.order[next(reversed(bucket))] > self.order[task_id]:
+            self.unordered.add(completed)
+        bucket[task_id] = task
+    
+    def remove(self, task_id, archived=False):
+
+        """Tira a tarefa; com ``archived`` ela continua no histórico diário."""
+        task = self.by_id.pop(task_id, None)
+        if task is None:
+            return None
+        del self.status_ids[bool(task['completed'])][task_id]
+        del self.order[task_id]
+        if self.search_index is not None:
+            self.search_index.remove(task_id)
+        for index in self.sorted_indexes.values():
+            index.remove(task_id, task.completed)
+        if self.rollups is not None:
+            if archived:
+                self.rollups.retire(task)
+            else:
+                self.rollups.discard(task)
+        return task
+    
+    def status_bucket(self, completed):
+
+        if completed in self.unordered:
+            bucket = self.status_ids[completed]
+            self.status_ids[completed] = {
+                task_id: bucket[task_id]
+                for task_id in sorted(bucket, key=self.order.__getitem__)
+            }
+            self.unordered.discard(completed)
+        return self.status_ids[completed]
+    
+    def filtered(self, filter_type):
+
+        if filter_type == "pending":
+            return list(self.status_bucket(False).values())
+        elif filter_type == "completed":
+            return list(self.status_bucket(True).values())
+        elif filter_type == "overdue":
+            return self.overdue()
+        return list(self.by_id.values())
+    
+    def count(self, filter_type):
+
+        if filter_type == "overdue":
+            return self.count_overdue()
+        counts = self.counts()
+        return counts.get(filter_type, counts['total'])
+    
+    def overdue(self, reverse=False, now=None):
+
+        return OverdueTaskSequence(self, self.sorted_index("due"), reverse, now)
+    
+    def count_overdue(self, now=None):
+
+        return overdue_count(self.sorted_index("due").lists['pending'], now)
+    
+    def next_deadline(self, after):
+
+        """Menor prazo pendente depois de ``after`` (microssegundos), ou None."""
+        entries = self.sorted_index("due").lists['pending']
+        index = bisect.bisect_left(entries, (False, after + 1))
+        if index < len(entries) and not entries[index][0]:
+            return entries[index][1]
+        return None
+    
+    def deadlines(self, start, end):
+
+        """Tarefas pendentes com prazo em ``(start, end]``, em ordem de prazo."""
+        entries = self.sorted_index("due").lists['pending']
+        first = bisect.bisect_left(entries, (False, start + 1))
+        last = bisect.bisect_left(entries, (False, end + 1))
+        return [self.by_id[entry[-1]] for entry in entries[first:last]]
+    
+    def sorted_index(self, sort_key):
+
+        index = self.sorted_indexes.get(sort_key)
+        if index is None:
+            index = self.sorted_indexes[sort_key] = SortedIndex(self, sort_key)
+        return index
+    
+    def sorted(self, filter_type, sort_key, reverse=False):
+
+        if filter_type == "overdue":
+            if sort_key in ("manual", "due"):
+                return self.overdue(reverse)
+            return sort_tasks(list(self.overdue()), sort_key, reverse, self.order)
+        return SortedTaskSequence(self, self.sorted_index(sort_key), filter_type, reverse)
+    
+    def page(self, filter_type, offset, limit, sort_key="manual", reverse=False):
+
+        if sort_key != "manual" or filter_type == "overdue":
+            tasks = self.sorted(filter_type, sort_key, reverse)
+            return tasks[offset:offset + limit]
+        if filter_type == "pending":
+            tasks = self.status_bucket(False).values()
+        elif filter_type == "completed":
+            tasks = self.status_bucket(True).values()
+        else:
+            tasks = self.by_id.values()
+        if reverse:
+            tasks = reversed(tasks)
+        return list(islice(tasks, offset, offset + limit))
+    
+    def iter_tasks(self, filter_type, sort_key="manual", reverse=False):
+
+        if sort_key == "manual" and not reverse and filter_type != "overdue":
+            # Uma lista de referências: a store pode mudar durante a iteração
+            return iter(self.filtered(filter_type))
+        return iter(self.sorted(filter_type, sort_key, reverse))
+    
+    def search(self, query, filter_type, sort_key="manual", reverse=False):
+
+        if self.search_index is None:
+            self.search_index = SearchIndex(self.by_id.values())
+        
+        ids = sorted(self.search_index.search(query), key=self.order.__getitem__)
+        tasks = (self.by_id[task_id] for task_id in ids)
+        found = [t for t in tasks if task_matches_status(t, filter_type)]
+        if sort_key != "manual" or reverse:
+            found = sort_tasks(found, sort_key, reverse, self.order)
+        return found
+    
+    def counts(self):
+
+        return {
+            'total': len(self.by_id),
+            'pending': len(self.status_ids[False]),
+            'completed': len(self.status_ids[True])
+        }
+    
+    def daily_rollups(self):
+
+        if self.rollups is None:
+            self.rollups = DailyRollups.from_tasks(self.by_id.values())
+            self.add_archived_history()
+        return self.rollups
+    
+    def add_archived_history(self):
+
+        """Soma ao histórico diário as tarefas que já foram para o arquivo morto."""
+        if self.archived_tasks is not None:
+            self.rollups.add_archived(
+                task for task in self.archived_tasks() if task['id'] not in self
+            )
+    
+    def attach_rollups(self, rollups):
+
+        """Adota agregações gravadas, se baterem com as contagens atuais."""
+        if rollups is None or not rollups.matches(self.counts()):
+            return False
+        self.rollups = rollups
+        return True
+    
+    def recount(self):
+
+        completed = sum(1 for task in self.by_id.values() if task['completed'])
+        return {
+            'total': len(self.by_id),
+            'pending': len(self.by_id) - completed,
+            'completed': completed
+        }
+    
+    def to_list(self):
+
+        return list(self.by_id.values())
+
+
+class DeadlineScheduler:
+
+    """Calcula quando disparar lembretes a partir do índice de prazos da store.
+
+    Não há varredura periódica: o próximo instante vem de uma busca binária
+    na lista de prazos pendentes, e quem usa o agendador arma um único timer
+    para ele. Incluir, editar, concluir ou excluir tarefas só exige pedir de
+    novo ``next_wakeup``.
+    """
+
+    def __init__(self, store, lead_minutes=0, now=None):
+        self.store = store
+        self.lead = lead_minutes * 60 * 1000000
+        self.checked = now_micros() if now is None else now
+    
+    def next_wakeup(self):
+
+        """Próximo instante (microssegundos) em que um lembrete dispara ou um prazo vence."""
+        times = []
+        reminder = self.store.next_deadline(self.checked + self.lead)
+        if reminder is not None:
+            times.append(reminder - self.lead)
+        if self.lead:
+            deadline = self.store.next_deadline(self.checked)
+            if deadline is not None:
+                times.append(deadline)
+        return min(times, default=None)
+    
+    def advance(self, now=None):
+
+        """Avança o relógio e devolve as tarefas cujo lembrete venceu desde a última chamada."""
+        now = now_micros() if now is None else now
+        if now <= self.checked:
+            return []
+        due = self.store.deadlines(self.checked + self.lead, now + self.lead)
+        self.checked = now
+        return due
+
+
+def iter_json_array(path, chunk_size=1 << 16):
+
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ""
+        position = 0
+        consumed = 0
+        started = False
+        eof = False
+        
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            
+            if position < len(buffer):
+                if not started:
+                    if buffer[position] != "[":
+                        raise ValueError("O arquivo de tarefas deve conter uma lista JSON")
+                    started = True
+                    position += 1
+                    continue
+                if buffer[position] == "]":
+                    return
+                try:
+                    item, position = decoder.raw_decode(buffer, position)
+                except ValueError:
+                    if eof:
+                        raise
+                else:
+                    yield item, consumed - len(buffer) + position
+                    continue
+            elif eof:
+                if started:
+                    raise ValueError("Lista JSON de tarefas incompleta")
+                return
+            
+            chunk = f.read(chunk_size)
+            consumed += len(chunk)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+
+TRUE_VALUES = {"1", "true", "sim", "yes", "x", "s", "y"}
+
+
+def parse_import_record(record):
+
+    title = str(record.get('title') or record.get('titulo') or "").strip()
+    if not title:
+        return None
+    completed = record.get('completed', False)
+    if isinstance(completed, str):
+        completed = completed.strip().casefold() in TRUE_VALUES
+    return {
+        'title': title,
+        'description': str(record.get('description') or record.get('descricao') or "").strip(),
+        'completed': bool(completed),
+        'created_at': record.get('created_at') or datetime.now().isoformat(),
+        'completed_at': record.get('completed_at') or None,
+        'due_at': record.get('due_at') or record.get('prazo') or None,
+        'recurrence': record.get('recurrence') or ""
+    }
+
+
+def read_import_file(path):
+
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if path.lower().endswith('.csv'):
+            records = csv.DictReader(f)
+        else:
+            records = (json.loads(line) for line in f if line.strip())
+        
+        for record in records:
+            task = parse_import_record(record)
+            if task is not None:
+                yield task
+
+
+EXPORT_FIELDS = TASK_KEYS
+ICS_RECURRENCES = {'daily': "DAILY", 'weekly': "WEEKLY", 'monthly': "MONTHLY"}
+
+
+def filtered_tasks(store, filter_type="all", query="", sort_key="manual", reverse=False):
+
+    """As tarefas que a lista mostra para um filtro, uma busca e uma ordenação."""
+    if query:
+        return store.search(query, filter_type, sort_key, reverse)
+    if sort_key != "manual" or reverse:
+        return store.sorted(filter_type, sort_key, reverse)
+    return store.filtered(filter_type)
+
+
+def iter_filtered_tasks(store, filter_type="all", query="", sort_key="manual", reverse=False):
+
+    """Como ``filtered_tasks``, mas em fluxo, para exportar sem paginar."""
+    if query:
+        return iter(store.search(query, filter_type, sort_key, reverse))
+    return store.iter_tasks(filter_type, sort_key, reverse)
+
+
+def project_tasks(tasks, fields, chunk_size=1000):
+
+    """Agrupa as tarefas em pedaços de dicionários só com ``fields``."""
+    tasks = iter(tasks)
+    while True:
+        chunk = [task_snapshot(task) for task in islice(tasks, chunk_size)]
+        if not chunk:
+            return
+        yield [{field: task[field] for field in fields} for task in chunk]
+
+
+def format_csv(chunks, fields):
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for chunk in chunks:
+        writer.writerows(
+            ["" if task[field] is None else task[field] for field in fields]
+            for task in chunk
+        )
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        yield text, len(chunk)
+
+
+def format_jsonl(chunks, fields):
+
+    for chunk in chunks:
+        text = "".join(
+            json.dumps(task, ensure_ascii=False, separators=(',', ':')) + "\n"
+            for task in chunk
+        )
+        yield text, len(chunk)
+
+
+def ics_text(value):
+
+    return (
+        value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def ics_time(value, utc=False):
+
+    moment = datetime.fromisoformat(value)
+    if utc:
+        # Datas locais sem fuso; CREATED e COMPLETED precisam estar em UTC
+        return moment.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return moment.strftime("%Y%m%dT%H%M%S")
+
+
+def ics_fold(line):
+
+    # Linhas de no máximo 75 octetos; as continuações começam com um espaço
+    data = line.encode('utf-8')
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts = []
+    while data:
+        size = min(len(data), 75 if not parts else 74)
+        while size < len(data) and (data[size] & 0xC0) == 0x80:
+            size -= 1
+        parts.append(data[:size].decode('utf-8'))
+        data = data[size:]
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def ics_todo(task, stamp):
+
+    lines = [
+        "BEGIN:VTODO",
+        f"UID:taskflow-{task['id']}",
+        f"DTSTAMP:{stamp}",
+        f"SUMMARY:{ics_text(task['title'])}"
+    ]
+    if task['description']:
+        lines.append(f"DESCRIPTION:{ics_text(task['description'])}")
+    if task['created_at']:
+        lines.append(f"CREATED:{ics_time(task['created_at'], utc=True)}")
+    if task['due_at']:
+        lines.append(f"DUE:{ics_time(task['due_at'])}")
+        if task['recurrence']:
+            lines.append(f"RRULE:FREQ={ICS_RECURRENCES[task['recurrence']]}")
+    if task['completed']:
+        lines.append("STATUS:COMPLETED")
+        if task['completed_at']:
+            lines.append(f"COMPLETED:{ics_time(task['completed_at'], utc=True)}")
+    else:
+        lines.append("STATUS:NEEDS-ACTION")
+    lines.append("END:VTODO")
+    return "".join(ics_fold(line) for line in lines)
+
+
+def format_ics(chunks, fields):
+
+    # O iCalendar precisa de todos os campos, qualquer que seja a projeção
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//TaskFlow//Exportação//PT\r\n", 0
+    for chunk in chunks:
+        yield "".join(ics_todo(task, stamp) for task in chunk), len(chunk)
+    yield "END:VCALENDAR\r\n", 0
+
+
+EXPORT_FORMATS = {'csv': format_csv, 'jsonl': format_jsonl, 'ics': format_ics}
+
+
+def export_format(path):
+
+    """Formato de exportação pela extensão do arquivo (CSV se desconhecida)."""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    return {'json': "jsonl", 'ical': "ics"}.get(extension, extension if extension in EXPORT_FORMATS else "csv")
+
+
+def write_export(tasks, output, format_name="csv", fields=EXPORT_FIELDS, chunk_size=1000):
+
+    """Escreve as tarefas em ``output`` (um arquivo de texto aberto), em pedaços.
+
+    É um pipeline de geradores: filtro (``tasks``), projeção dos campos,
+    formatação e escrita. Só um pedaço fica em memória por vez, e a cada
+    pedaço escrito o gerador devolve o total de tarefas exportadas, o que
+    permite mostrar o progresso ou cancelar com ``close()``.
+    """
+    if format_name == "ics":
+        fields = TASK_KEYS
+    exported = 0
+    for text, count in EXPORT_FORMATS[format_name](project_tasks(tasks, fields, chunk_size), fields):
+        output.write(text)
+        exported += count
+        yield exported
+
+
+def export_tasks(tasks, path, format_name=None, fields=EXPORT_FIELDS, chunk_size=1000):
+
+    """Exporta para ``path`` via ``write_export``; o arquivo só aparece completo.
+
+    Se o gerador for fechado antes do fim (cancelamento), o arquivo
+    temporário é apagado e ``path`` não é tocado.
+    """
+    format_name = format_name or export_format(path)
+    temp_path = path + ".tmp"
+    finished = False
+    try:
+        with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+            yield from write_export(tasks, f, format_name, fields, chunk_size)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        finished = True
+    finally:
+        if not finished and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def iter_json_batches(path, batch_size=2000):
+
+    if not os.path.exists(path):
+        return
+    
+    size = max(1, os.path.getsize(path))
+    batch = []
+    for task, position in iter_json_array(path):
+        batch.append(task)
+        if len(batch) >= batch_size:
+            yield batch, min(1.0, position / size)
+            batch = []
+    if batch:
+        yield batch, 1.0
+
+
+def write_json_atomic(path, data, **dump_options):
+
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, default=task_to_json, **dump_options)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def diff_tasks(current, tasks, skip=()):
+
+    """Lista as mudanças que levam ``current`` ao conteúdo de ``tasks``.
+
+    As mudanças usam o formato dos registros do journal (``put``/``delete``);
+    IDs em ``skip`` são ignorados.
+    """
+    current = {task['id']: task for task in current}
+    changes = []
+    seen = set()
+    for task in tasks:
+        task = Task.from_dict(task)
+        seen.add(task.id)
+        if task.id in skip:
+            continue
+        mine = current.get(task.id)
+        if mine is None or Task.from_dict(mine).to_dict() != task.to_dict():
+            changes.append({'op': 'put', 'task': task})
+    changes.extend(
+        {'op': 'delete', 'id': task_id}
+        for task_id in current
+        if task_id not in seen and task_id not in skip
+    )
+    return changes
+
+
+def task_snapshot(task):
+
+    return Task.from_dict(task).to_dict() if task is not None else None
+
+
+def change_task_id(change):
+
+    return change['task']['id'] if change['op'] == 'put' else change.get('id')
+
+
+class OperationLog:
+
+    """Histórico de operações para desfazer e refazer.
+
+    Cada operação guarda as imagens anterior e posterior das tarefas que
+    alterou, então desfazer ou refazer um passo custa O(tarefas alteradas),
+    sem reaplicar o histórico. A memória é limitada por ``max_operations``
+    e ``max_changes``: o que passa disso é descartado, e o estado gravado em
+    disco passa a ser o ponto de partida (checkpoint) do histórico.
+    """
+
+    def __init__(self, max_operations=100, max_changes=50000):
+        self.max_operations = max_operations
+        self.max_changes = max_changes
+        self.undo_stack = deque()
+        self.redo_stack = deque()
+        self.changes = 0
+    
+    def record(self, label, changes, archived=False):
+
+        """Registra uma operação; ``changes`` são pares (antes, depois) de tarefas.
+
+        ``archived`` marca operações que trazem tarefas do arquivo morto: os
+        registros gerados por elas levam ``'archived': True``.
+        """
+        changes = tuple(
+            (task_snapshot(before), task_snapshot(after))
+            for before, after in changes
+            if before is not None or after is not None
+        )
+        if not changes:
+            return
+        
+        self.undo_stack.append((label, changes, archived))
+        self.changes += len(changes)
+        self.changes -= sum(len(operation[1]) for operation in self.redo_stack)
+        self.redo_stack.clear()
+        while len(self.undo_stack) > 1 and (
+            len(self.undo_stack) > self.max_operations or self.changes > self.max_changes
+        ):
+            self.changes -= len(self.undo_stack.popleft()[1])
+    
+    @staticmethod
+    def to_records(changes, target, archived=False):
+
+        # Registros no formato do journal que levam as tarefas ao estado alvo
+        records = []
+        for change in changes:
+            state = change[target]
+            if state is None:
+                record = {'op': 'delete', 'id': change[1 - target]['id']}
+            else:
+                record = {'op': 'put', 'task': state}
+            if archived:
+                record['archived'] = True
+            records.append(record)
+        return records
+    
+    def undo(self):
+
+        if not self.undo_stack:
+            return None
+        operation = self.undo_stack.pop()
+        self.redo_stack.append(operation)
+        label, changes, archived = operation
+        return label, self.to_records(reversed(changes), 0, archived)
+    
+    def redo(self):
+
+        if not self.redo_stack:
+            return None
+        operation = self.redo_stack.pop()
+        self.undo_stack.append(operation)
+        label, changes, archived = operation
+        return label, self.to_records(changes, 1, archived)
+    
+    def can_undo(self):
+
+        return bool(self.undo_stack)
+    
+    def can_redo(self):
+
+        return bool(self.redo_stack)
+    
+    def next_undo_label(self):
+
+        return self.undo_stack[-1][0] if self.undo_stack else None
+    
+    def next_redo_label(self):
+
+        return self.redo_stack[-1][0] if self.redo_stack else None
+
+
+class FileLock:
+
+    """Trava exclusiva entre processos (``fcntl.flock``) e entre threads.
+
+    É reentrante no mesmo processo. Sem ``fcntl`` (Windows), protege apenas
+    as threads do processo atual. O arquivo de trava só existe enquanto
+    alguém a segura: quem solta por último o apaga.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.mutex = threading.RLock()
+        self.file = None
+        self.depth = 0
+    
+    def acquire(self, blocking=True):
+
+        if not self.mutex.acquire(blocking):
+            return False
+        if self.depth == 0 and fcntl is not None:
+            try:
+                self.lock_file(blocking)
+            except OSError:
+                if self.file is not None:
+                    self.file.close()
+                    self.file = None
+                self.mutex.release()
+                if blocking:
+                    raise
+                return False
+        self.depth += 1
+        return True
+    
+    def lock_file(self, blocking):
+
+        operation = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        while True:
+            self.file = open(self.path, 'a+b')
+            fcntl.flock(self.file.fileno(), operation)
+            # Quem soltou antes pode ter apagado o arquivo enquanto esperávamos:
+            # a trava só vale se ainda for o arquivo que está no caminho
+            try:
+                current = os.stat(self.path)
+            except FileNotFoundError:
+                current = None
+            locked = os.fstat(self.file.fileno())
+            if current is not None and (current.st_dev, current.st_ino) == (locked.st_dev, locked.st_ino):
+                return
+            self.file.close()
+            self.file = None
+    
+    def release(self):
+
+        self.depth -= 1
+        if self.depth == 0 and self.file is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+            self.file.close()
+            self.file = None
+        self.mutex.release()
+    
+    def __enter__(self):
+
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc_info):
+
+        self.release()
+
+
+class Trash:
+
+    """Lixeira de tarefas excluídas, gravada em JSON lines ao lado dos dados.
+
+    Exclusões e restaurações só acrescentam linhas. A limpeza das tarefas
+    excluídas há mais de ``retention_days`` dias reescreve o arquivo e roda
+    em segundo plano.
+    """
+
+    def __init__(self, path, retention_days=30):
+        self.path = path
+        self.retention = timedelta(days=retention_days)
+        self.lock = FileLock(path + ".lock")
+        self.purging = None
+        self.error = None
+    
+    def append(self, records):
+
+        if not records:
+            return
+        lines = "".join(
+            json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=task_to_json) + "\n"
+            for record in records
+        )
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+    
+    def add(self, tasks, deleted_at=None):
+
+        deleted_at = deleted_at or datetime.now().isoformat()
+        self.append([
+            {'op': 'put', 'task': task_snapshot(task), 'deleted_at': deleted_at}
+            for task in tasks
+        ])
+    
+    def remove(self, task_ids):
+
+        self.append([{'op': 'delete', 'id': task_id} for task_id in task_ids])
+    
+    def read(self):
+
+        entries = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get('op') == 'put':
+                        entries.pop(record['task']['id'], None)
+                        entries[record['task']['id']] = record
+                    elif record.get('op') == 'delete':
+                        entries.pop(record['id'], None)
+        except FileNotFoundError:
+            pass
+        return entries
+    
+    def entries(self):
+
+        """Tarefas na lixeira, das excluídas mais recentemente às mais antigas."""
+        return sorted(self.read().values(), key=lambda entry: entry['deleted_at'], reverse=True)
+    
+    def rewrite(self, keep):
+
+        with self.lock:
+            entries = self.read()
+            kept = [entry for entry in entries.values() if keep(entry)]
+            temp_path = self.path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                for entry in kept:
+                    f.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        return len(entries) - len(kept)
+    
+    def purge(self, before=None):
+
+        """Apaga de vez as tarefas excluídas antes de ``before``."""
+        before = before or (datetime.now() - self.retention).isoformat()
+        return self.rewrite(lambda entry: entry['deleted_at'] >= before)
+    
+    def discard(self, task_ids=None):
+
+        """Apaga de vez as tarefas indicadas, ou esvazia a lixeira."""
+        if task_ids is None:
+            return self.rewrite(lambda entry: False)
+        task_ids = set(task_ids)
+        return self.rewrite(lambda entry: entry['task']['id'] not in task_ids)
+    
+    def start_purge(self):
+
+        if self.purging is not None and self.purging.is_alive():
+            return
+        self.purging = threading.Thread(target=self.run_purge, daemon=True)
+        self.purging.start()
+    
+    def run_purge(self):
+
+        try:
+            if os.path.exists(self.path):
+                self.purge()
+        except Exception as e:
+            self.error = e
+    
+    def busy(self):
+
+        return self.purging is not None and self.purging.is_alive()
+    
+    def take_error(self):
+
+        error, self.error = self.error, None
+        return error
+    
+    def close(self):
+
+        if self.purging is not None:
+            self.purging.join()
+
+
+def archive_candidates(store, days, limit=None):
+
+    """Tarefas concluídas há mais de ``days`` dias, das mais antigas às mais novas.
+
+    Usa a ordenação por data de conclusão, então custa O(k log n) para as
+    ``k`` tarefas devolvidas, não uma varredura da store.
+    """
+    cutoff = now_micros() - days * DAY_MICROS
+    found = []
+    while True:
+        page = store.page("completed", len(found), 1000, "completed")
+        if not page:
+            return found
+        for task in page:
+            finished = Task.from_dict(task).finished
+            if finished is None or finished >= cutoff:
+                return found
+            found.append(task)
+            if limit is not None and len(found) >= limit:
+                return found
+
+
+class TaskArchive:
+
+    """Arquivo morto de tarefas concluídas, em JSON lines comprimido.
+
+    As tarefas ficam num arquivo por mês de conclusão (``AAAA-MM.jsonl.gz``)
+    e cada arquivamento só acrescenta um membro gzip ao arquivo do mês.
+    Nada é lido na abertura: as buscas descomprimem os meses sob demanda,
+    dos mais recentes aos mais antigos.
+    """
+
+    SUFFIX = ".jsonl.gz"
+    
+    def __init__(self, path):
+        self.path = path
+        self.lock = FileLock(path + ".lock")
+    
+    def month_path(self, month):
+
+        return os.path.join(self.path, month + self.SUFFIX)
+    
+    def months(self):
+
+        """Meses arquivados, do mais recente ao mais antigo."""
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            (name[:-len(self.SUFFIX)] for name in names if name.endswith(self.SUFFIX)),
+            reverse=True
+        )
+    
+    def size(self):
+
+        return sum(os.path.getsize(self.month_path(month)) for month in self.months())
+    
+    @staticmethod
+    def month_of(task):
+
+        return (task['completed_at'] or "0000-00")[:7]
+    
+    def add(self, tasks):
+
+        by_month = {}
+        for task in tasks:
+            task = task_snapshot(task)
+            by_month.setdefault(self.month_of(task), []).append(task)
+        if not by_month:
+            return 0
+        
+        with self.lock:
+            os.makedirs(self.path, exist_ok=True)
+            for month, month_tasks in by_month.items():
+                data = "".join(
+                    json.dumps(task, ensure_ascii=False, separators=(',', ':')) + "\n"
+                    for task in month_tasks
+                ).encode('utf-8')
+                with open(self.month_path(month), 'ab') as f:
+                    f.write(gzip.compress(data, compresslevel=6))
+                    f.flush()
+                    os.fsync(f.fileno())
+        return len(tasks)
+    
+    def read_month(self, month):
+
+        tasks = []
+        try:
+            with gzip.open(self.month_path(month), 'rt', encoding='utf-8') as f:
+                for line in f:
+                    tasks.append(json.loads(line))
+        except FileNotFoundError:
+            pass
+        except (EOFError, gzip.BadGzipFile, ValueError):
+            # Membro incompleto no fim: gravação interrompida
+            pass
+        return tasks
+    
+    def search(self, query=""):
+
+        """Gera ``(mês, tarefa)`` das tarefas arquivadas que casam com ``query``."""
+        seen = set()
+        for month in self.months():
+            for task in reversed(self.read_month(month)):
+                if task['id'] in seen or (query and not matches_query(task, query)):
+                    continue
+                seen.add(task['id'])
+                yield month, task
+    
+    def remove(self, entries):
+
+        """Tira do arquivo as tarefas ``(mês, tarefa)`` indicadas."""
+        by_month = {}
+        for month, task in entries:
+            by_month.setdefault(month, set()).add(task['id'])
+        
+        with self.lock:
+            for month, task_ids in by_month.items():
+                path = self.month_path(month)
+                kept = [task for task in self.read_month(month) if task['id'] not in task_ids]
+                if not kept:
+                    if os.path.exists(path):
+                        os.remove(path)
+                    continue
+                data = "".join(
+                    json.dumps(task, ensure_ascii=False, separators=(',', ':')) + "\n"
+                    for task in kept
+                ).encode('utf-8')
+                temp_path = path + ".tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(gzip.compress(data, compresslevel=6))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, path)
+
+
+class BackgroundWriter:
+
+    def __init__(self, write):
+        self.write = write
+        self.condition = threading.Condition()
+        self.payload = None
+        self.has_payload = False
+        self.writing = False
+        self.closed = False
+        self.error = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+    
+    def submit(self, payload):
+
+        with self.condition:
+            self.payload = payload
+            self.has_payload = True
+            self.condition.notify_all()
+    
+    def run(self):
+
+        while True:
+            with self.condition:
+                while not self.has_payload and not self.closed:
+                    self.condition.wait()
+                if not self.has_payload:
+                    return
+                payload = self.payload
+                self.payload = None
+                self.has_payload = False
+                self.writing = True
+            
+            try:
+                self.write(payload)
+            except Exception as e:
+                self.error = e
+            
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+    
+    def busy(self):
+
+        with self.condition:
+            return self.has_payload or self.writing
+    
+    def flush(self):
+
+        with self.condition:
+            while self.has_payload or self.writing:
+                self.condition.wait()
+    
+    def close(self):
+
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+
+
+class Storage:
+
+    supports_streaming_load = True
+    saved_next_id = None
+    rollups_interval = 5.0
+    rollups_saved_at = 0.0
+    rollups_store = None
+    rollups_dropped = False
+    
+    def open_store(self):
+
+        store = TaskStore(self.load())
+        self.attach(store)
+        return store
+    
+    def meta_path(self):
+
+        return self.path + ".meta"
+    
+    def open_trash(self, retention_days=30):
+
+        return Trash(self.path + ".trash", retention_days)
+    
+    def open_archive(self):
+
+        return TaskArchive(self.path + ".archive")
+    
+    def archive_completed(self, store, days, batch_size=2000):
+
+        """Move para o arquivo morto as tarefas concluídas há mais de ``days`` dias.
+
+        Cada lote é gravado no arquivo antes de sair da store, então uma
+        interrupção no meio deixa no máximo tarefas repetidas, nunca perdidas.
+        """
+        archive = self.open_archive()
+        archived = 0
+        while True:
+            tasks = archive_candidates(store, days, batch_size)
+            if not tasks:
+                return archived
+            archive.add(tasks)
+            deleted = [task['id'] for task in tasks]
+            for task_id in deleted:
+                store.remove(task_id, archived=True)
+            self.commit(store, deletes=deleted)
+            archived += len(tasks)
+    
+    def read_next_id(self):
+
+        try:
+            with open(self.meta_path(), 'r', encoding='utf-8') as f:
+                return int(json.load(f)['next_id'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    def write_next_id(self, next_id):
+
+        write_json_atomic(self.meta_path(), {'version': META_VERSION, 'next_id': next_id})
+        self.saved_next_id = next_id
+    
+    def advance_next_id(self, next_id):
+
+        # Outro processo pode ter reservado IDs acima do nosso
+        if self.saved_next_id is None or next_id > self.saved_next_id:
+            self.write_next_id(max(next_id, self.read_next_id() or 1))
+    
+    def reserve_ids(self, store, count=1):
+
+        """Reserva ``count`` IDs novos, únicos entre processos que compartilham os dados."""
+        with self.file_lock:
+            first = max(store.next_id(), self.read_next_id() or 1)
+            self.write_next_id(first + count)
+        store.ids.observe(first + count - 1)
+        return range(first, first + count)
+    
+    def poll_changes(self, store):
+
+        """Devolve as mudanças gravadas por outros processos desde a última consulta."""
+        return []
+    
+    def attach(self, store):
+
+        """Ajusta o alocador da store ao próximo ID persistido.
+
+        Deve ser chamado depois que todas as tarefas foram carregadas, para
+        que IDs de tarefas já excluídas nunca voltem a ser usados.
+        """
+        next_id = self.read_next_id()
+        if next_id is not None:
+            store.ids.observe(next_id - 1)
+        self.saved_next_id = next_id
+        store.archived_tasks = self.archived_tasks
+        store.attach_rollups(self.read_rollups())
+        self.rollups_store = store
+    
+    def archived_tasks(self):
+
+        return (task for _, task in self.open_archive().search())
+    
+    def rollups_path(self):
+
+        return self.path + ".rollups"
+    
+    def read_rollups(self):
+
+        try:
+            with open(self.rollups_path(), 'r', encoding='utf-8') as f:
+                return DailyRollups.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    def write_rollups(self, data):
+
+        if data is not None:
+            write_json_atomic(self.rollups_path(), data, separators=(',', ':'))
+        elif os.path.exists(self.rollups_path()):
+            os.remove(self.rollups_path())
+    
+    def save_rollups(self, store=None, force=True):
+
+        """Grava as agregações diárias da store, se mudaram.
+
+        Nos commits a gravação acontece no máximo a cada ``rollups_interval``
+        segundos; ``flush`` e ``close`` gravam o que faltar. Uma store sem
+        agregações apaga as gravadas, que deixariam de refletir os dados.
+        """
+        if store is not None:
+            self.rollups_store = store
+        if self.rollups_store is None:
+            return
+        rollups = self.rollups_store.rollups
+        if rollups is None:
+            if not self.rollups_dropped:
+                self.write_rollups(None)
+                self.rollups_dropped = True
+            return
+        
+        now = time.monotonic()
+        if not rollups.dirty or (not force and now - self.rollups_saved_at < self.rollups_interval):
+            return
+        self.write_rollups(rollups.to_dict())
+        rollups.dirty = False
+        self.rollups_dropped = False
+        self.rollups_saved_at = now
+    
+    def read_tasks(self):
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def write_tasks(self, tasks, next_id):
+
+        write_json_atomic(self.path, tasks, indent=2)
+        self.advance_next_id(next_id)
+    
+    def migrate(self):
+
+        """Migra arquivos antigos, sem o próximo ID persistido.
+
+        Na primeira abertura, IDs duplicados são corrigidos (com cópia de
+        segurança em ``.bak``) e o alocador passa a ser gravado junto dos dados.
+        """
+        with self.file_lock:
+            if not os.path.exists(self.path) or self.read_next_id() is not None:
+                return 0
+            
+            tasks = self.read_tasks()
+            repaired = repair_task_ids(tasks)
+            next_id = max((task['id'] for task in tasks), default=0) + 1
+            if repaired:
+                shutil.copyfile(self.path, self.path + ".bak")
+                self.write_tasks(tasks, next_id)
+            else:
+                self.write_next_id(next_id)
+            return repaired
+    
+    def load(self):
+
+        return []
+    
+    def load_batches(self, batch_size=2000):
+
+        tasks = self.load()
+        for start in range(0, len(tasks), batch_size):
+            batch = tasks[start:start + batch_size]
+            yield batch, (start + len(batch)) / len(tasks)
+    
+    def commit(self, store, upserts=(), deletes=()):
+
+        pass
+    
+    def busy(self):
+
+        return False
+    
+    def take_error(self):
+
+        return None
+    
+    def read_counts(self):
+
+        return None
+    
+    def read_page(self, filter_type, offset, limit):
+
+        """``(tarefas, total)`` lidos direto do arquivo, sem abrir a store.
+
+        Só os backends que conseguem filtrar sem decodificar tudo implementam;
+        os demais devolvem None.
+        """
+        return None
+    
+    def flush(self):
+
+        pass
+    
+    def close(self):
+
+        pass
+
+
+class JsonStorage(Storage):
+
+    def __init__(self, path):
+        self.path = path
+        self.file_lock = FileLock(path + ".lock")
+        self.signature = None
+        self.changes_lock = threading.Lock()
+        self.dirty_upserts = set()
+        self.dirty_deletes = set()
+        self.external = []
+        self.writer = BackgroundWriter(self.write_snapshot)
+    
+    def file_signature(self):
+
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+    
+    def load(self):
+
+        self.migrate()
+        self.signature = self.file_signature()
+        if self.signature is None:
+            return []
+        return self.read_tasks()
+    
+    def load_batches(self, batch_size=2000):
+
+        self.migrate()
+        self.signature = self.file_signature()
+        yield from iter_json_batches(self.path, batch_size)
+    
+    def commit(self, store, upserts=(), deletes=()):
+
+        if not upserts and not deletes:
+            # Nada mudou: regravar o arquivo só custaria tempo
+            return
+        upserted = {task['id'] for task in upserts}
+        with self.changes_lock:
+            self.dirty_upserts |= upserted
+            self.dirty_upserts -= set(deletes)
+            self.dirty_deletes |= set(deletes)
+            self.dirty_deletes -= upserted
+        # A cópia é feita aqui, na thread que altera as tarefas: o writer
+        # nunca lê uma tarefa no meio de uma edição
+        self.writer.submit(([Task.from_dict(task).copy() for task in store], store.next_id()))
+        self.save_rollups(store, force=False)
+    
+    def write_snapshot(self, payload):
+
+        tasks, next_id = payload
+        with self.changes_lock:
+            upserts, self.dirty_upserts = self.dirty_upserts, set()
+            deletes, self.dirty_deletes = self.dirty_deletes, set()
+        
+        try:
+            with self.file_lock:
+                # Versionamento otimista: se outro processo gravou desde a
+                # última leitura, as mudanças dele são mescladas às nossas
+                if self.file_signature() != self.signature:
+                    tasks = self.merge_external(tasks, upserts, deletes)
+                self.write_tasks(tasks, next_id)
+                self.signature = self.file_signature()
+        except Exception:
+            with self.changes_lock:
+                self.dirty_upserts |= upserts - self.dirty_deletes
+                self.dirty_deletes |= deletes - self.dirty_upserts
+            raise
+    
+    def merge_external(self, tasks, upserts, deletes):
+
+        disk = self.read_tasks() if os.path.exists(self.path) else []
+        external = diff_tasks(tasks, disk, skip=upserts | deletes)
+        with self.changes_lock:
+            self.external.extend(external)
+        
+        merged = {}
+        for task in disk:
+            task = Task.from_dict(task)
+            merged[task.id] = task
+        for task_id in deletes:
+            merged.pop(task_id, None)
+        merged.update((task['id'], task) for task in tasks if task['id'] in upserts)
+        return list(merged.values())
+    
+    def poll_changes(self, store):
+
+        if self.writer.busy():
+            # Conflitos com uma gravação em andamento são mesclados pelo writer
+            return []
+        
+        changes = []
+        if self.file_signature() != self.signature:
+            with self.file_lock:
+                signature = self.file_signature()
+                tasks = self.read_tasks() if signature is not None else []
+                self.signature = signature
+            changes = diff_tasks(store, tasks)
+        
+        with self.changes_lock:
+            external, self.external = self.external, []
+        return external + changes
+    
+    def busy(self):
+
+        return self.writer.busy()
+    
+    def take_error(self):
+
+        error, self.writer.error = self.writer.error, None
+        return error
+    
+    def flush(self):
+
+        self.writer.flush()
+        self.save_rollups()
+    
+    def close(self):
+
+        self.writer.close()
+        self.save_rollups()
+
+
+class JournalStorage(Storage):
+
+    def __init__(self, path, compact_threshold=1000, fsync=True):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.compacting_path = path + ".journal.compacting"
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+        self.file_lock = FileLock(path + ".lock")
+        self.compaction_lock = FileLock(path + ".compact.lock")
+        self.journal = None
+        self.reader = None
+        self.generation = 0
+        self.external = []
+        self.records = 0
+        self.compaction = None
+        self.compaction_error = None
+    
+    def load(self):
+
+        self.migrate()
+        with self.file_lock:
+            tasks = self.read_state()
+            self.records = self.replay(self.journal_path, tasks, repair=True)
+            
+            self.journal = open(self.journal_path, 'a', encoding='utf-8')
+            self.reader = open(self.journal_path, 'rb')
+            self.generation = self.read_generation(self.reader)
+            self.reader.seek(0, os.SEEK_END)
+        
+        if self.records >= self.compact_threshold or os.path.exists(self.compacting_path):
+            self.start_compaction()
+        return list(tasks.values())
+    
+    def read_state(self):
+
+        """Lê o snapshot e o journal em compactação. Requer ``file_lock``."""
+        # A trava de compactação impede que o snapshot seja trocado entre a
+        # leitura dele e a do journal em compactação
+        with self.compaction_lock:
+            tasks = self.read_snapshot()
+            self.replay(self.compacting_path, tasks)
+        return tasks
+    
+    def read_generation(self, reader):
+
+        # Cada journal começa com um registro que numera a rotação
+        line = reader.readline()
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = {}
+        reader.seek(0)
+        return record.get('generation', 0) if record.get('op') == 'start' else 0
+    
+    def read_snapshot(self):
+
+        tasks = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for task in json.load(f):
+                    tasks[task['id']] = task
+        return tasks
+    
+    def write_tasks(self, tasks, next_id):
+
+        write_json_atomic(self.path, tasks, separators=(',', ':'))
+        self.advance_next_id(next_id)
+    
+    def replay(self, path, tasks, repair=False):
+
+        records = 0
+        valid_size = 0
+        if not os.path.exists(path):
+            return records
+        
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Registro truncado por uma falha durante a escrita
+                    break
+                if record['op'] == 'put':
+                    tasks.pop(record['task']['id'], None)
+                    tasks[record['task']['id']] = record['task']
+                elif record['op'] == 'delete':
+                    tasks.pop(record['id'], None)
+                records += 1
+                valid_size += len(line)
+        
+        if repair and valid_size < os.path.getsize(path):
+            with open(path, 'r+b') as f:
+                f.truncate(valid_size)
+        return records
+    
+    def open_journal(self):
+
+        # Outro processo pode ter movido o journal para compactação
+        try:
+            current = os.stat(self.journal_path).st_ino
+        except FileNotFoundError:
+            current = None
+        if self.journal is None or current != os.fstat(self.journal.fileno()).st_ino:
+            if self.journal is not None:
+                self.journal.close()
+            self.journal = open(self.journal_path, 'a', encoding='utf-8')
+    
+    def read_tail(self, store):
+
+        """Lê os registros anexados por outros processos. Requer ``file_lock``."""
+        changes = []
+        while True:
+            while True:
+                line = self.reader.readline()
+                if not line.endswith(b"\n"):
+                    self.reader.seek(-len(line), os.SEEK_CUR)
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('op') in ('put', 'delete'):
+                    changes.append(record)
+                self.records += 1
+            
+            try:
+                current = os.stat(self.journal_path).st_ino
+            except FileNotFoundError:
+                break
+            if current == os.fstat(self.reader.fileno()).st_ino:
+                break
+            # O journal antigo foi lido até o fim; continua no novo
+            self.reader.close()
+            self.reader = open(self.journal_path, 'rb')
+            self.records = 0
+            generation = self.read_generation(self.reader)
+            if generation != self.generation + 1:
+                # Mais de uma rotação desde a última leitura: os registros
+                # intermediários já estão no snapshot
+                self.generation = generation
+                return self.resync(store)
+            self.generation = generation
+        return changes
+    
+    def resync(self, store):
+
+        tasks = self.read_state()
+        self.records = self.replay(self.journal_path, tasks)
+        self.reader.seek(0, os.SEEK_END)
+        return diff_tasks(store, tasks.values())
+    
+    def journal_changed(self):
+
+        try:
+            stat = os.stat(self.journal_path)
+        except FileNotFoundError:
+            return False
+        return (
+            stat.st_ino != os.fstat(self.reader.fileno()).st_ino
+            or stat.st_size != self.reader.tell()
+        )
+    
+    def commit(self, store, upserts=(), deletes=()):
+
+        lines = [
+            json.dumps(
+                {'op': 'put', 'task': task},
+                ensure_ascii=False,
+                separators=(',', ':'),
+                default=task_to_json
+            )
+            for task in upserts
+        ]
+        lines.extend(
+            json.dumps({'op': 'delete', 'id': task_id}, separators=(',', ':'))
+            for task_id in deletes
+        )
+        if not lines:
+            return
+        
+        with self.file_lock:
+            self.open_journal()
+            external = self.read_tail(store)
+            if self.reader.tell() < os.fstat(self.journal.fileno()).st_size:
+                # Cauda truncada por um processo que falhou durante a escrita
+                os.ftruncate(self.journal.fileno(), self.reader.tell())
+            
+            self.journal.write("\n".join(lines) + "\n")
+            self.journal.flush()
+            if self.fsync:
+                os.fsync(self.journal.fileno())
+            self.reader.seek(0, os.SEEK_END)
+            self.records += len(lines)
+            self.advance_next_id(store.next_id())
+        
+        # Nossos registros vêm depois no journal e prevalecem sobre os externos
+        ours = {task['id'] for task in upserts} | set(deletes)
+        self.external.extend(change for change in external if change_task_id(change) not in ours)
+        self.save_rollups(store, force=False)
+        
+        if self.records >= self.compact_threshold:
+            self.start_compaction()
+    
+    def poll_changes(self, store):
+
+        if self.reader is None or not (self.external or self.journal_changed()):
+            return []
+        with self.file_lock:
+            changes = self.read_tail(store)
+        external, self.external = self.external, []
+        return external + changes
+    
+    def start_compaction(self):
+
+        if self.compaction is not None and self.compaction.is_alive():
+            return
+        
+        with self.file_lock:
+            if not os.path.exists(self.compacting_path):
+                self.open_journal()
+                with open(self.journal_path, 'rb') as f:
+                    generation = self.read_generation(f) + 1
+                self.journal.close()
+                os.replace(self.journal_path, self.compacting_path)
+                self.journal = open(self.journal_path, 'a', encoding='utf-8')
+                self.journal.write(json.dumps({'op': 'start', 'generation': generation}) + "\n")
+                self.journal.flush()
+                self.records = 0
+        
+        self.compaction = threading.Thread(target=self.compact, daemon=True)
+        self.compaction.start()
+    
+    def compact(self):
+
+        if not self.compaction_lock.acquire(blocking=False):
+            # Outro processo já está compactando
+            return
+        try:
+            if os.path.exists(self.compacting_path):
+                tasks = self.read_snapshot()
+                self.replay(self.compacting_path, tasks)
+                
+                write_json_atomic(self.path, list(tasks.values()), separators=(',', ':'))
+                os.remove(self.compacting_path)
+        except Exception as e:
+            self.compaction_error = e
+        finally:
+            self.compaction_lock.release()
+    
+    def busy(self):
+
+        return self.compaction is not None and self.compaction.is_alive()
+    
+    def take_error(self):
+
+        error, self.compaction_error = self.compaction_error, None
+        return error
+    
+    def flush(self):
+
+        if self.compaction is not None:
+            self.compaction.join()
+        self.save_rollups()
+    
+    def close(self):
+
+        if self.compaction is not None:
+            self.compaction.join()
+        self.save_rollups()
+        with self.file_lock:
+            for handle in (self.journal, self.reader):
+                if handle is not None:
+                    handle.close()
+            self.journal = None
+            self.reader = None
+
+
+class SqliteTaskSequence:
+
+    live = True
+    
+    def __init__(self, store, filter_type, page_size=200, max_pages=16,
+                 sort_key="manual", reverse=False):
+        self.store = store
+        self.filter_type = filter_type
+        self.sort_key = sort_key
+        self.reverse = reverse
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.pages = {}
+        self.positions = {}
+        self.length = None
+        self.version = store.version
+    
+    def invalidate(self):
+
+        self.pages.clear()
+        self.positions.clear()
+        self.length = None
+        self.version = self.store.version
+    
+    def check_version(self):
+
+        if self.version != self.store.version:
+            self.invalidate()
+    
+    def __len__(self):
+
+        self.check_version()
+        if self.length is None:
+            self.length = self.store.count(self.filter_type)
+        return self.length
+    
+    def __getitem__(self, index):
+
+        self.check_version()
+        if index < 0:
+            index += len(self)
+        page_number, offset = divmod(index, self.page_size)
+        
+        page = self.pages.get(page_number)
+        if page is None:
+            if len(self.pages) >= self.max_pages:
+                for task in self.pages.pop(next(iter(self.pages))):
+                    self.positions.pop(task['id'], None)
+            start = page_number * self.page_size
+            page = self.store.page(
+                self.filter_type, start, self.page_size, self.sort_key, self.reverse
+            )
+            self.pages[page_number] = page
+            # Posições conhecidas de graça: index_of não precisa ir ao banco
+            self.positions.update((task['id'], start + offset) for offset, task in enumerate(page))
+        
+        if offset >= len(page):
+            raise IndexError(index)
+        return page[offset]
+    
+    def __iter__(self):
+
+        for offset in range(0, len(self), self.page_size):
+            yield from self.store.page(
+                self.filter_type, offset, self.page_size, self.sort_key, self.reverse
+            )
+    
+    def index_of(self, task_id):
+
+        self.check_version()
+        index = self.positions.get(task_id)
+        if index is not None:
+            return index
+        if self.sort_key != "manual" or self.reverse or self.filter_type == "overdue":
+            return None
+        index = self.store.index_of(self.filter_type, task_id)
+        if index is not None:
+            self.positions[task_id] = index
+        return index
+    
+    def group_of(self, index):
+
+        if self.sort_key not in DAY_SORT_KEYS or not len(self):
+            return None
+        return self.store.day_group(self.filter_type, self.sort_key, self[index])
+
+
+class SqliteTaskStore:
+
+    FIELDS = TASK_KEYS
+    FILTERS = {
+        'all': '',
+        'pending': 'WHERE completed = 0',
+        'completed': 'WHERE completed = 1',
+        # As datas são gravadas normalizadas por micros_to_iso e ordenam como
+        # texto; taskflow_now() usa o mesmo relógio e formato da TaskStore
+        'overdue': (
+            "WHERE completed = 0 AND due_at IS NOT NULL AND due_at < taskflow_now()"
+        )
+    }
+    ORDERS = {
+        'manual': ('seq',),
+        'created': ('created_at IS NULL', 'created_at', 'seq'),
+        'completed': ('completed_at IS NULL', 'completed_at', 'seq'),
+        'title': ('title COLLATE NOCASE', 'seq'),
+        'due': ('due_at IS NULL', 'due_at', 'seq')
+    }
+    SORT_COLUMNS = {'created': 'created_at', 'completed': 'completed_at', 'due': 'due_at'}
+    
+    def __init__(self, connection):
+        self.connection = connection
+        self.version = 0
+        self.columns = ", ".join(self.FIELDS)
+        self.placeholders = ", ".join("?" * len(self.FIELDS))
+        self.ids = IdAllocator()
+        self.ids.observe(connection.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM tasks"
+        ).fetchone()[0])
+        row = connection.execute("SELECT value FROM meta WHERE key = 'next_id'").fetchone()
+        if row is not None:
+            self.ids.observe(int(row[0]) - 1)
+        self.status_counts = {False: 0, True: 0}
+        self.search_index = None
+        self.rollups = None
+        self.archived_tasks = None
+        self.reload_counts()
+    
+    def reload_counts(self):
+
+        self.status_counts = {False: 0, True: 0}
+        rows = self.connection.execute(
+            "SELECT completed, COUNT(*) FROM tasks GROUP BY completed"
+        )
+        for completed, count in rows:
+            self.status_counts[bool(completed)] = count
+    
+    def row_to_task(self, row):
+
+        task = dict(zip(self.FIELDS, row))
+        task['completed'] = bool(task['completed'])
+        task['recurrence'] = task['recurrence'] or ""
+        return task
+    
+    def task_to_row(self, task):
+
+        return (
+            task['id'],
+            task['title'],
+            task.get('description') or "",
+            int(bool(task['completed'])),
+            normalize_timestamp(task.get('created_at')),
+            normalize_timestamp(task.get('completed_at')),
+            normalize_timestamp(task.get('due_at')),
+            task.get('recurrence') or ""
+        )
+    
+    def __len__(self):
+
+        return self.status_counts[False] + self.status_counts[True]
+    
+    def __iter__(self):
+
+        rows = self.connection.execute(f"SELECT {self.columns} FROM tasks ORDER BY seq")
+        return (self.row_to_task(row) for row in rows)
+    
+    def __contains__(self, task_id):
+
+        return self.connection.execute(
+            "SELECT 1 FROM tasks WHERE id = ?", (task_id,)
+        ).fetchone() is not None
+    
+    def load(self, tasks):
+
+        self.connection.execute("DELETE FROM tasks")
+        tasks = list(tasks)
+        repair_task_ids(tasks)
+        for task in tasks:
+            self.ids.observe(task['id'])
+        self.connection.executemany(
+            f"INSERT INTO tasks ({self.columns}) VALUES ({self.placeholders})",
+            (self.task_to_row(task) for task in tasks)
+        )
+        self.save_next_id()
+        self.reload_counts()
+        self.search_index = None
+        self.rollups = None
+        self.version += 1
+    
+    def next_id(self):
+
+        return self.ids.next_id
+    
+    def save_next_id(self):
+
+        self.connection.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('next_id', 1)")
+        self.connection.execute(
+            "UPDATE meta SET value = MAX(value, ?) WHERE key = 'next_id'",
+            (self.ids.next_id,)
+        )
+    
+    def reserve_ids(self, count):
+
+        # O UPDATE toma a trava de escrita do banco, serializando as reservas
+        # entre processos
+        self.connection.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('next_id', 1)")
+        self.connection.execute(
+            "UPDATE meta SET value = MAX(value, ?) + ? WHERE key = 'next_id'",
+            (self.ids.next_id, count)
+        )
+        next_id = self.connection.execute(
+            "SELECT value FROM meta WHERE key = 'next_id'"
+        ).fetchone()[0]
+        self.ids.observe(next_id - 1)
+        return range(next_id - count, next_id)
+    
+    def reload(self):
+
+        self.ids.observe(self.connection.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM tasks"
+        ).fetchone()[0])
+        self.reload_counts()
+        self.search_index = None
+        self.rollups = None
+        self.version += 1
+    
+    def get(self, task_id):
+
+        row = self.connection.execute(
+            f"SELECT {self.columns} FROM tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+        return self.row_to_task(row) if row else None
+    
+    def add(self, task, archived=False):
+
+        """Inclui a tarefa; ``archived`` indica que ela volta do arquivo morto."""
+        self.connection.execute(
+            f"INSERT INTO tasks ({self.columns}) VALUES ({self.placeholders})",
+            self.task_to_row(task)
+        )
+        if task['id'] >= self.ids.next_id:
+            self.ids.observe(task['id'])
+            self.save_next_id()
+        self.status_counts[bool(task['completed'])] += 1
+        if self.search_index is not None:
+            self.search_index.add(task)
+        if self.rollups is not None:
+            if archived:
+                self.rollups.unretire(task)
+            else:
+                self.rollups.add(task)
+        self.version += 1
+        return task
+    
+    def update(self, task_id, **fields):
+
+        task = self.get(task_id)
+        if task is None:
+            raise KeyError(task_id)
+        if 'completed' in fields and bool(fields['completed']) != task['completed']:
+            self.status_counts[task['completed']] -= 1
+            self.status_counts[bool(fields['completed'])] += 1
+        rollups = self.rollups if ROLLUP_KEYS.intersection(fields) else None
+        if rollups is not None:
+            rollups.discard(task)
+        task.update(fields)
+        if rollups is not None:
+            rollups.add(task)
+        
+        self.connection.execute(
+            "UPDATE tasks SET title = ?, description = ?, completed = ?, "
+            "created_at = ?, completed_at = ?, due_at = ?, recurrence = ? WHERE id = ?",
+            self.task_to_row(task)[1:] + (task_id,)
+        )
+        if self.search_index is not None and ('title' in fields or 'description' in fields):
+            self.search_index.update(task)
+        self.version += 1
+        return task
+    
+    def set_completed(self, task_id, completed):
+
+        return self.update(
+            task_id,
+            completed=completed,
+            completed_at=datetime.now().isoformat() if completed else None
+        )
+    
+    def remove(self, task_id, archived=False):
+
+        """Tira a tarefa; com ``archived`` ela continua no histórico diário."""
+        task = self.get(task_id)
+        if task is None:
+            return None
+        self.connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        self.status_counts[task['completed']] -= 1
+        if self.search_index is not None:
+            self.search_index.remove(task_id)
+        if self.rollups is not None:
+            if archived:
+                self.rollups.retire(task)
+            else:
+                self.rollups.discard(task)
+        self.version += 1
+        return task
+    
+    def filtered(self, filter_type):
+
+        return SqliteTaskSequence(self, filter_type)
+    
+    def count(self, filter_type):
+
+        if filter_type == "overdue":
+            return self.count_overdue()
+        counts = self.counts()
+        return counts.get(filter_type, counts['total'])
+    
+    def overdue(self, reverse=False):
+
+        return self.sorted("overdue", "due", reverse)
+    
+    def count_overdue(self):
+
+        return self.connection.execute(
+            f"SELECT COUNT(*) FROM tasks {self.FILTERS['overdue']}"
+        ).fetchone()[0]
+    
+    def next_deadline(self, after):
+
+        value = self.connection.execute(
+            "SELECT MIN(due_at) FROM tasks WHERE completed = 0 AND due_at > ?",
+            (micros_to_iso(after),)
+        ).fetchone()[0]
+        return iso_to_micros(value)
+    
+    def deadlines(self, start, end):
+
+        rows = self.connection.execute(
+            f"SELECT {self.columns} FROM tasks "
+            "WHERE completed = 0 AND due_at > ? AND due_at <= ? ORDER BY due_at, seq",
+            (micros_to_iso(start), micros_to_iso(end))
+        )
+        return [self.row_to_task(row) for row in rows]
+    
+    def order_by(self, sort_key, reverse=False):
+
+        direction = " DESC" if reverse else ""
+        return ", ".join(term + direction for term in self.ORDERS.get(sort_key, ('seq',)))
+    
+    def sorted(self, filter_type, sort_key, reverse=False):
+
+        return SqliteTaskSequence(self, filter_type, sort_key=sort_key, reverse=reverse)
+    
+    def page(self, filter_type, offset, limit, sort_key="manual", reverse=False):
+
+        if filter_type == "overdue" and sort_key == "manual":
+            sort_key = "due"
+        where = self.FILTERS.get(filter_type, '')
+        rows = self.connection.execute(
+            f"SELECT {self.columns} FROM tasks {where} "
+            f"ORDER BY {self.order_by(sort_key, reverse)} LIMIT ? OFFSET ?",
+            (limit, offset)
+        )
+        return [self.row_to_task(row) for row in rows]
+    
+    def iter_tasks(self, filter_type, sort_key="manual", reverse=False):
+
+        """Todas as tarefas do filtro num único cursor, sem paginar com OFFSET."""
+        if filter_type == "overdue" and sort_key == "manual":
+            sort_key = "due"
+        rows = self.connection.execute(
+            f"SELECT {self.columns} FROM tasks {self.FILTERS.get(filter_type, '')} "
+            f"ORDER BY {self.order_by(sort_key, reverse)}"
+        )
+        return (self.row_to_task(row) for row in rows)
+    
+    def day_group(self, filter_type, sort_key, task):
+
+        column = self.SORT_COLUMNS[sort_key]
+        value = task.get(column)
+        where = self.FILTERS.get(filter_type, '').replace('WHERE', 'AND')
+        if not value:
+            count = self.connection.execute(
+                f"SELECT COUNT(*) FROM tasks WHERE {column} IS NULL {where}"
+            ).fetchone()[0]
+            return None, count
+        
+        # Datas ISO ordenam como texto: o intervalo do dia usa o índice da coluna
+        day = datetime.fromisoformat(value).date()
+        count = self.connection.execute(
+            f"SELECT COUNT(*) FROM tasks WHERE {column} >= ? AND {column} < ? {where}",
+            (day.isoformat(), (day + timedelta(days=1)).isoformat())
+        ).fetchone()[0]
+        return day, count
+    
+    def search(self, query, filter_type, sort_key="manual", reverse=False):
+
+        if self.search_index is None:
+            rows = self.connection.execute("SELECT id, title, description FROM tasks")
+            self.search_index = SearchIndex(
+                {'id': row[0], 'title': row[1], 'description': row[2]} for row in rows
+            )
+        
+        ids = list(self.search_index.search(query))
+        where = self.FILTERS.get(filter_type, '').replace('WHERE', 'AND')
+        found = []
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            found.extend(self.connection.execute(
+                f"SELECT seq, {self.columns} FROM tasks WHERE id IN ({placeholders}) {where}",
+                chunk
+            ))
+        found.sort()
+        found = [self.row_to_task(row[1:]) for row in found]
+        if sort_key != "manual" or reverse:
+            found = sort_tasks(found, sort_key, reverse)
+        return found
+    
+    def index_of(self, filter_type, task_id):
+
+        row = self.connection.execute(
+            "SELECT seq, completed FROM tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        seq, completed = row
+        if filter_type == "pending" and completed or filter_type == "completed" and not completed:
+            return None
+        
+        # Contagem pelo índice de cobertura (completed, seq), sem ler as linhas;
+        # em 'all' o IN faz o mesmo índice servir em vez da tabela inteira
+        where = self.FILTERS.get(filter_type) or "WHERE completed IN (0, 1)"
+        where = f"{where} AND seq < ?"
+        return self.connection.execute(
+            f"SELECT COUNT(*) FROM tasks {where}", (seq,)
+        ).fetchone()[0]
+    
+    def counts(self):
+
+        return {
+            'total': len(self),
+            'pending': self.status_counts[False],
+            'completed': self.status_counts[True]
+        }
+    
+    def daily_rollups(self):
+
+        if self.rollups is None:
+            rows = self.connection.execute("SELECT created_at, completed, completed_at FROM tasks")
+            self.rollups = DailyRollups.from_tasks(
+                {'created_at': created, 'completed': completed, 'completed_at': finished}
+                for created, completed, finished in rows
+            )
+            self.add_archived_history()
+        return self.rollups
+    
+    def add_archived_history(self):
+
+        """Soma ao histórico diário as tarefas que já foram para o arquivo morto."""
+        if self.archived_tasks is not None:
+            self.rollups.add_archived(
+                task for task in self.archived_tasks() if task['id'] not in self
+            )
+    
+    def attach_rollups(self, rollups):
+
+        if rollups is None or not rollups.matches(self.counts()):
+            return False
+        self.rollups = rollups
+        return True
+    
+    def recount(self):
+
+        total, completed = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(completed), 0) FROM tasks"
+        ).fetchone()
+        return {
+            'total': total,
+            'pending': total - completed,
+            'completed': completed
+        }
+    
+    def to_list(self):
+
+        return list(self)
+
+
+class SqliteStorage(Storage):
+
+    supports_streaming_load = False
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER NOT NULL UNIQUE,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL DEFAULT '',
+            completed INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT,
+            completed_at TEXT,
+            due_at TEXT,
+            recurrence TEXT NOT NULL DEFAULT ''
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks (completed, seq);
+        CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks (created_at);
+        CREATE INDEX IF NOT EXISTS idx_tasks_completed_at ON tasks (completed_at);
+        CREATE INDEX IF NOT EXISTS idx_tasks_created_order
+            ON tasks (created_at IS NULL, created_at, seq);
+        CREATE INDEX IF NOT EXISTS idx_tasks_completed_order
+            ON tasks (completed_at IS NULL, completed_at, seq);
+        CREATE INDEX IF NOT EXISTS idx_tasks_title_order ON tasks (title COLLATE NOCASE, seq);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value
+        );
+    """
+    DUE_SCHEMA = """
+        CREATE INDEX IF NOT EXISTS idx_tasks_due_pending ON tasks (completed, due_at);
+        CREATE INDEX IF NOT EXISTS idx_tasks_due_order ON tasks (due_at IS NULL, due_at, seq);
+    """
+    
+    def __init__(self, path):
+        self.json_path = path
+        self.path = os.path.splitext(path)[0] + ".db"
+        self.connection = None
+        self.data_version = None
+    
+    def connect(self):
+
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path)
+            self.connection.create_function(
+                "taskflow_now", 0, lambda: micros_to_iso(now_micros())
+            )
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.executescript(self.SCHEMA)
+            self.upgrade_schema()
+        return self.connection
+    
+    def upgrade_schema(self):
+
+        # Bancos criados antes dos prazos não têm as colunas novas
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(tasks)")}
+        if 'due_at' not in columns:
+            self.connection.execute("ALTER TABLE tasks ADD COLUMN due_at TEXT")
+        if 'recurrence' not in columns:
+            self.connection.execute(
+                "ALTER TABLE tasks ADD COLUMN recurrence TEXT NOT NULL DEFAULT ''"
+            )
+        self.connection.executescript(self.DUE_SCHEMA)
+        self.normalize_times()
+    
+    def normalize_times(self):
+
+        """Regrava uma vez, no formato de micros_to_iso, as datas de bancos antigos.
+
+        Sem isso, datas com fuso ou em outro formato não comparariam como
+        texto com as novas (ex.: no filtro de atrasadas).
+        """
+        if self.connection.execute(
+            "SELECT 1 FROM meta WHERE key = 'time_format'"
+        ).fetchone() is not None:
+            return
+        rows = self.connection.execute("SELECT id, created_at, completed_at, due_at FROM tasks")
+        changed = []
+        for task_id, *values in rows:
+            normalized = [normalize_timestamp(value) for value in values]
+            if normalized != values:
+                changed.append((*normalized, task_id))
+        self.connection.executemany(
+            "UPDATE tasks SET created_at = ?, completed_at = ?, due_at = ? WHERE id = ?", changed
+        )
+        self.connection.execute("INSERT INTO meta (key, value) VALUES ('time_format', 1)")
+        self.connection.commit()
+    
+    def open_store(self):
+
+        is_new = not os.path.exists(self.path)
+        store = SqliteTaskStore(self.connect())
+        if is_new and os.path.exists(self.json_path):
+            with open(self.json_path, 'r', encoding='utf-8') as f:
+                store.load(json.load(f))
+            self.connection.commit()
+        self.data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        store.archived_tasks = self.archived_tasks
+        store.attach_rollups(self.read_rollups())
+        self.rollups_store = store
+        return store
+    
+    def load(self):
+
+        return self.open_store().to_list()
+    
+    def commit(self, store, upserts=(), deletes=()):
+
+        # As agregações vão na mesma transação que as tarefas
+        self.save_rollups(store, force=False)
+        self.connect().commit()
+    
+    def read_rollups(self):
+
+        row = self.connect().execute("SELECT value FROM meta WHERE key = 'rollups'").fetchone()
+        try:
+            return DailyRollups.from_dict(json.loads(row[0])) if row else None
+        except (ValueError, KeyError, TypeError):
+            return None
+    
+    def write_rollups(self, data):
+
+        if data is None:
+            self.connect().execute("DELETE FROM meta WHERE key = 'rollups'")
+        else:
+            self.connect().execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('rollups', ?)",
+                (json.dumps(data, separators=(',', ':')),)
+            )
+    
+    def reserve_ids(self, store, count=1):
+
+        return store.reserve_ids(count)
+    
+    def poll_changes(self, store):
+
+        # data_version muda quando outra conexão grava no banco
+        version = self.connect().execute("PRAGMA data_version").fetchone()[0]
+        if version == self.data_version:
+            return []
+        self.data_version = version
+        store.reload()
+        return [{'op': 'reload'}]
+    
+    def close(self):
+
+        if self.connection is not None:
+            self.save_rollups()
+            self.connection.commit()
+            self.connection.close()
+            self.connection = None
+
+
+BINARY_MAGIC = b"TFB1"
+BINARY_VERSION = 2
+BINARY_HEADER = struct.Struct("<4sHHQQQQ")
+BINARY_NEXT_ID = struct.Struct("<Q")
+BINARY_NEXT_ID_OFFSET = BINARY_HEADER.size - BINARY_NEXT_ID.size
+BINARY_NO_TIME = -(1 << 63)
+BINARY_COMPLETED = 0x01
+BINARY_RECURRENCE_SHIFT = 1
+BINARY_RECURRENCE_MASK = 0x06
+BINARY_STATUS_MASK = bytes(value & BINARY_COMPLETED for value in range(256))
+
+
+def align8(offset):
+
+    return (offset + 7) & ~7
+
+
+def write_binary_tasks(path, tasks, next_id=0):
+
+    ids = array('q')
+    created = array('q')
+    completed_at = array('q')
+    due = array('q')
+    title_offsets = array('Q', [0])
+    description_offsets = array('Q', [0])
+    flags = bytearray()
+    heap = bytearray()
+    max_id = 0
+    
+    for task in tasks:
+        task = Task.from_dict(task)
+        ids.append(task.id)
+        max_id = max(max_id, task.id)
+        created.append(BINARY_NO_TIME if task.created is None else task.created)
+        completed_at.append(BINARY_NO_TIME if task.finished is None else task.finished)
+        due.append(BINARY_NO_TIME if task.due is None else task.due)
+        flags.append(
+            (BINARY_COMPLETED if task.completed else 0)
+            | RECURRENCES.index(task.recurrence) << BINARY_RECURRENCE_SHIFT
+        )
+        heap += task.title.encode('utf-8')
+        title_offsets.append(len(heap))
+        heap += task.description.encode('utf-8')
+        description_offsets.append(len(heap))
+    
+    for column in (ids, created, completed_at, due, title_offsets, description_offsets):
+        if column.itemsize != 8:
+            raise RuntimeError("Plataforma sem inteiros de 64 bits em array")
+        if sys.byteorder != 'little':
+            column.byteswap()
+    
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(BINARY_HEADER.pack(
+            BINARY_MAGIC, BINARY_VERSION, 0, len(ids), len(heap), max_id, max(next_id, 0)
+        ))
+        for column in (ids, created, completed_at, due, title_offsets, description_offsets):
+            column.tofile(f)
+        f.write(flags)
+        f.write(b"\0" * (align8(len(flags)) - len(flags)))
+        f.write(heap)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class BinaryTaskFile:
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.count, heap_size, self.max_id, self.next_id = (
+            BINARY_HEADER.unpack_from(self.map)
+        )
+        if magic != BINARY_MAGIC or version not in (1, BINARY_VERSION):
+            self.close()
+            raise ValueError("Arquivo binário de tarefas inválido")
+        
+        # A versão 1 não tem a coluna de prazos
+        view = memoryview(self.map)
+        offset = BINARY_HEADER.size
+        columns = []
+        time_columns = 3 if version == 1 else 4
+        for length in [self.count] * time_columns + [self.count + 1, self.count + 1]:
+            columns.append(self.column(view, offset, length))
+            offset += 8 * length
+        if version == 1:
+            columns.insert(3, None)
+        self.ids, self.created, self.completed_at, self.due, self.title_offsets, self.description_offsets = columns
+        self.flags = view[offset:offset + self.count]
+        self.heap = view[align8(offset + self.count):align8(offset + self.count) + heap_size]
+    
+    def column(self, view, offset, length):
+
+        data = view[offset:offset + 8 * length]
+        if sys.byteorder == 'little':
+            return data.cast('q' if length == self.count else 'Q')
+        values = array('q' if length == self.count else 'Q', data.tobytes())
+        values.byteswap()
+        return values
+    
+    def __len__(self):
+
+        return self.count
+    
+    def counts(self):
+
+        completed = self.flags.tobytes().translate(BINARY_STATUS_MASK).count(BINARY_COMPLETED)
+        return {
+            'total': self.count,
+            'pending': self.count - completed,
+            'completed': completed
+        }
+    
+    def status_indexes(self, completed):
+
+        statuses = self.flags.tobytes().translate(BINARY_STATUS_MASK)
+        wanted = BINARY_COMPLETED if completed else 0
+        index = statuses.find(wanted)
+        while index != -1:
+            yield index
+            index = statuses.find(wanted, index + 1)
+    
+    def page(self, filter_type, offset, limit):
+
+        """Tarefas de um filtro de status, decodificando só as da página."""
+        if filter_type == "all":
+            indexes = range(min(offset, self.count), min(offset + limit, self.count))
+        else:
+            indexes = islice(self.status_indexes(filter_type == "completed"), offset, offset + limit)
+        return [self.task(index) for index in indexes]
+    
+    def task(self, index):
+
+        title_start = self.description_offsets[index]
+        title_end = self.title_offsets[index + 1]
+        description_end = self.description_offsets[index + 1]
+        created = self.created[index]
+        finished = self.completed_at[index]
+        due = self.due[index] if self.due is not None else BINARY_NO_TIME
+        flags = self.flags[index]
+        return Task(
+            self.ids[index],
+            bytes(self.heap[title_start:title_end]).decode('utf-8'),
+            bytes(self.heap[title_end:description_end]).decode('utf-8'),
+            flags & BINARY_COMPLETED,
+            None if created == BINARY_NO_TIME else created,
+            None if finished == BINARY_NO_TIME else finished,
+            None if due == BINARY_NO_TIME else due,
+            RECURRENCES[(flags & BINARY_RECURRENCE_MASK) >> BINARY_RECURRENCE_SHIFT]
+        )
+    
+    def iter_tasks(self, start=0, stop=None):
+
+        stop = self.count if stop is None else min(stop, self.count)
+        for index in range(start, stop):
+            yield self.task(index)
+    
+    def close(self):
+
+        for name in ('ids', 'created', 'completed_at', 'due', 'title_offsets',
+                     'description_offsets', 'flags', 'heap'):
+            column = getattr(self, name, None)
+            if isinstance(column, memoryview):
+                column.release()
+        self.map.close()
+        self.file.close()
+
+
+def read_binary_tasks(path):
+
+    task_file = BinaryTaskFile(path)
+    try:
+        return list(task_file.iter_tasks())
+    finally:
+        task_file.close()
+
+
+def convert_tasks_file(source, target):
+
+    if source.lower().endswith(".tfb"):
+        tasks = read_binary_tasks(source)
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            tasks = json.load(f)
+    repair_task_ids(tasks)
+    
+    if target.lower().endswith(".tfb"):
+        write_binary_tasks(target, tasks, max((task['id'] for task in tasks), default=0) + 1)
+    else:
+        write_json_atomic(target, tasks, indent=2)
+    return len(tasks)
+
+
+class BinaryStorage(JsonStorage):
+
+    def __init__(self, path):
+        super().__init__(os.path.splitext(path)[0] + ".tfb")
+        self.json_path = path
+    
+    def load(self):
+
+        if os.path.exists(self.path):
+            self.migrate()
+            self.signature = self.file_signature()
+            return read_binary_tasks(self.path)
+        if os.path.exists(self.json_path):
+            with open(self.json_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return []
+    
+    def load_batches(self, batch_size=2000):
+
+        if not os.path.exists(self.path):
+            yield from iter_json_batches(self.json_path, batch_size)
+            return
+        
+        self.migrate()
+        self.signature = self.file_signature()
+        task_file = BinaryTaskFile(self.path)
+        try:
+            total = max(1, len(task_file))
+            for start in range(0, len(task_file), batch_size):
+                batch = list(task_file.iter_tasks(start, start + batch_size))
+                yield batch, (start + len(batch)) / total
+        finally:
+            task_file.close()
+    
+    def read_counts(self):
+
+        if not os.path.exists(self.path):
+            return None
+        task_file = BinaryTaskFile(self.path)
+        try:
+            return task_file.counts()
+        finally:
+            task_file.close()
+    
+    def read_page(self, filter_type, offset, limit):
+
+        if filter_type not in ("all", "pending", "completed") or not os.path.exists(self.path):
+            return None
+        task_file = BinaryTaskFile(self.path)
+        try:
+            counts = task_file.counts()
+            total = counts['total'] if filter_type == "all" else counts[filter_type]
+            return task_file.page(filter_type, offset, limit), total
+        finally:
+            task_file.close()
+    
+    def read_next_id(self):
+
+        if not os.path.exists(self.path):
+            # Ainda sem .tfb (dados no JSON): o alocador fica no arquivo .meta
+            return super().read_next_id()
+        with open(self.path, 'rb') as f:
+            header = f.read(BINARY_HEADER.size)
+        if len(header) < BINARY_HEADER.size:
+            return None
+        return BINARY_NEXT_ID.unpack_from(header, BINARY_NEXT_ID_OFFSET)[0] or None
+    
+    def write_next_id(self, next_id):
+
+        if not os.path.exists(self.path):
+            super().write_next_id(next_id)
+            return
+        
+        with self.file_lock:
+            unchanged = self.file_signature() == self.signature
+            with open(self.path, 'r+b') as f:
+                f.seek(BINARY_NEXT_ID_OFFSET)
+                f.write(BINARY_NEXT_ID.pack(next_id))
+                f.flush()
+                os.fsync(f.fileno())
+            if unchanged:
+                self.signature = self.file_signature()
+        self.saved_next_id = next_id
+    
+    def read_tasks(self):
+
+        return read_binary_tasks(self.path)
+    
+    def write_tasks(self, tasks, next_id):
+
+        next_id = max(next_id, self.read_next_id() or 1)
+        write_binary_tasks(self.path, tasks, next_id)
+        self.saved_next_id = next_id
+
+
+STORAGE_BACKENDS = {
+    'json': JsonStorage,
+    'journal': JournalStorage,
+    'sqlite': SqliteStorage,
+    'binary': BinaryStorage
+}
+
+
+def create_storage(mode, path):
+
+    if mode not in STORAGE_BACKENDS:
+        raise ValueError(f"Modo de armazenamento desconhecido: {mode}")
+    return STORAGE_BACKENDS[mode](path)
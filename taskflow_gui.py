@@ -1,19 +1,504 @@
 
 
 import tkinter as tk
-from tkinter import ttk, messagebox, font
-import json
+from tkinter import ttk, messagebox, filedialog, font
+import math
 import os
+import queue
+import sys
+import threading
+import time
 from datetime import datetime
-from typing import List, Dict, Optional
+from itertools import islice
+
+from taskflow_core import (
+    DAY_MICROS,
+    RECURRENCES,
+    SORT_KEYS,
+    DeadlineScheduler,
+    OperationLog,
+    Task,
+    TaskStore,
+    archive_candidates,
+    change_task_id,
+    complete_task,
+    create_storage,
+    export_tasks,
+    filtered_tasks,
+    is_overdue,
+    iter_filtered_tasks,
+    make_task,
+    matches_query,
+    micros_to_date,
+    now_micros,
+    progress_percent,
+    read_import_file,
+    task_snapshot,
+    task_matches_status
+)
+from taskflow_profiling import (
+    Profiler,
+    StallMonitor,
+    StartupTimer,
+    install_callback_timing,
+    profiler_from_environment,
+    startup_timer_from_environment
+)
+
+RECURRENCE_LABELS = {
+    '': "Não repete",
+    'daily': "Diariamente",
+    'weekly': "Semanalmente",
+    'monthly': "Mensalmente"
+}
+DUE_FORMATS = ("%d/%m/%Y %H:%M", "%d/%m/%Y")
+
+
+def parse_due(text):
+
+    """Converte "dd/mm/aaaa [HH:MM]" em data ISO; vazio vira None."""
+    text = text.strip()
+    if not text:
+        return None
+    for due_format in DUE_FORMATS:
+        try:
+            return datetime.strptime(text, due_format).isoformat()
+        except ValueError:
+            pass
+    raise ValueError(f"Prazo inválido: {text!r} (use dd/mm/aaaa HH:MM)")
+
+
+def format_due(value):
+
+    return datetime.fromisoformat(value).strftime(DUE_FORMATS[0]) if value else ""
+
+
+def recurrence_from_label(label):
+
+    labels = {text: key for key, text in RECURRENCE_LABELS.items()}
+    return labels.get(label, "")
+
+
+class VirtualTaskList:
+
+    def __init__(self, app, parent, row_height=44, overscan=4):
+        self.app = app
+        self.row_height = row_height
+        self.overscan = overscan
+        self.items = []
+        self.row_pool = []
+        self.row_by_task_id = {}
+        self.selected_ids = set()
+        self.anchor_index = None
+        self.canvas_width = 1
+        
+        self.canvas = tk.Canvas(
+            parent,
+            highlightthickness=0,
+            yscrollincrement=row_height
+        )
+        self.scrollbar = ttk.Scrollbar(
+            parent,
+            orient="vertical",
+            command=self.canvas.yview
+        )
+        self.canvas.configure(yscrollcommand=self.on_yview)
+        
+        self.canvas.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        
+        parent.columnconfigure(0, weight=1)
+        parent.rowconfigure(0, weight=1)
+        
+        self.canvas.bind("<Configure>", self.on_configure)
+        self.canvas.bind_class("TaskRow", "<MouseWheel>", self.on_mousewheel)
+        self.canvas.bind_class("TaskRow", "<Button-4>", self.on_mousewheel)
+        self.canvas.bind_class("TaskRow", "<Button-5>", self.on_mousewheel)
+        self.add_row_bindtag(self.canvas)
+    
+    def add_row_bindtag(self, widget):
+
+        widget.bindtags(widget.bindtags() + ("TaskRow",))
+    
+    def set_items(self, items):
+
+        self.items = items
+        self.selected_ids.clear()
+        self.anchor_index = None
+        self.update_scrollregion()
+        self.render()
+        self.app.on_selection_changed()
+    
+    def on_row_click(self, row, mode):
+
+        if row['task_id'] is None:
+            return
+        index = row['key'][0]
+        
+        if mode == 'range' and self.anchor_index is not None:
+            first, last = sorted((self.anchor_index, index))
+            self.selected_ids = {self.items[i]['id'] for i in range(first, last + 1)}
+        elif mode == 'toggle':
+            self.selected_ids.symmetric_difference_update({row['task_id']})
+            self.anchor_index = index
+        else:
+            self.selected_ids = {row['task_id']}
+            self.anchor_index = index
+        
+        self.render()
+        self.app.on_selection_changed()
+    
+    def select_all(self):
+
+        self.selected_ids = {task['id'] for task in self.items}
+        self.render()
+        self.app.on_selection_changed()
+    
+    def clear_selection(self):
+
+        self.selected_ids.clear()
+        self.anchor_index = None
+        self.render()
+        self.app.on_selection_changed()
+    
+    def index_of(self, task_id):
+
+        row = self.row_by_task_id.get(task_id)
+        if row is not None:
+            return row['key'][0]
+        if hasattr(self.items, 'index_of'):
+            return self.items.index_of(task_id)
+        for index, task in enumerate(self.items):
+            if task['id'] == task_id:
+                return index
+        return None
+    
+    def is_live(self):
+
+        # Sequências ligadas a um índice já refletem a mudança na store
+        return getattr(self.items, 'live', False)
+    
+    def insert_item(self, task, index=None):
+
+        if self.is_live():
+            self.update_scrollregion()
+            self.render()
+            return
+        if index is None:
+            index = len(self.items)
+        self.items.insert(index, task)
+        self.update_scrollregion()
+        if index < self.visible_range()[1]:
+            self.render()
+    
+    def extend_items(self, tasks):
+
+        if not tasks:
+            return
+        if self.is_live():
+            self.update_scrollregion()
+            self.render()
+            return
+        start = len(self.items)
+        self.items.extend(tasks)
+        self.update_scrollregion()
+        if start < self.visible_range()[1]:
+            self.render()
+    
+    def update_item(self, task):
+
+        if self.is_live():
+            self.render()
+            return
+        row = self.row_by_task_id.get(task['id'])
+        if row is not None:
+            self.bind_row(row, task, row['key'][0])
+    
+    def remove_item(self, task_id):
+
+        if not self.is_live():
+            index = self.index_of(task_id)
+            if index is not None:
+                del self.items[index]
+        self.selected_ids.discard(task_id)
+        self.update_scrollregion()
+        self.render()
+    
+    def update_scrollregion(self):
+
+        height = len(self.items) * self.row_height
+        self.canvas.configure(scrollregion=(0, 0, self.canvas_width, height))
+    
+    def on_configure(self, event):
+
+        self.canvas_width = event.width
+        for row in self.row_pool:
+            self.canvas.itemconfigure(row['window'], width=self.canvas_width)
+        self.update_scrollregion()
+        self.render()
+    
+    def on_yview(self, first, last):
+
+        self.scrollbar.set(first, last)
+        self.render()
+    
+    def on_mousewheel(self, event):
+
+        if event.num == 4 or event.delta > 0:
+            self.canvas.yview_scroll(-3, "units")
+        else:
+            self.canvas.yview_scroll(3, "units")
+    
+    def top_index(self):
+
+        return max(0, int(self.canvas.canvasy(0))) // self.row_height
+    
+    def rows_per_page(self):
+
+        return max(1, self.canvas.winfo_height() // self.row_height)
+    
+    def visible_range(self):
+
+        top = max(0, int(self.canvas.canvasy(0))) // self.row_height
+        rows_in_view = self.canvas.winfo_height() // self.row_height + 1
+        first = max(0, top - self.overscan)
+        last = min(len(self.items), top + rows_in_view + self.overscan)
+        return first, max(first, last)
+    
+    def render(self):
+
+        first, last = self.visible_range()
+        while len(self.row_pool) < last - first:
+            self.row_pool.append(self.create_row())
+        
+        used = set()
+        pool_size = len(self.row_pool)
+        for index in range(first, last):
+            slot = index % pool_size
+            used.add(slot)
+            self.bind_row(self.row_pool[slot], self.items[index], index)
+        
+        for slot, row in enumerate(self.row_pool):
+            if slot not in used and row['key'] is not None:
+                self.canvas.itemconfigure(row['window'], state='hidden')
+                self.release_row(row)
+        
+        self.app.update_list_position()
+    
+    def release_row(self, row):
+
+        if self.row_by_task_id.get(row['task_id']) is row:
+            del self.row_by_task_id[row['task_id']]
+        row['key'] = None
+        row['task_id'] = None
+    
+    def create_row(self):
+
+        row = {'key': None, 'task_id': None}
+        
+        frame = ttk.Frame(self.canvas)
+        frame.columnconfigure(1, weight=1)
+        row['frame'] = frame
+        
+        row['var'] = tk.BooleanVar(value=False)
+        checkbox = ttk.Checkbutton(
+            frame,
+            variable=row['var'],
+            command=lambda: self.app.toggle_task_completion(row['task_id'], row['var'].get())
+        )
+        checkbox.grid(row=0, column=0, padx=(0, 5))
+        
+        text_frame = ttk.Frame(frame)
+        text_frame.grid(row=0, column=1, sticky=(tk.W, tk.E))
+        text_frame.columnconfigure(0, weight=1)
+        
+        row['title'] = ttk.Label(text_frame, font=self.app.fonts['body'])
+        row['title'].grid(row=0, column=0, sticky=tk.W)
+        
+        row['due'] = ttk.Label(text_frame, font=self.app.fonts['small'])
+        row['due'].grid(row=0, column=1, sticky=tk.E, padx=(5, 0))
+        
+        row['description'] = ttk.Label(
+            text_frame,
+            font=self.app.fonts['small'],
+            foreground=self.app.colors['border']
+        )
+        row['description'].grid(row=1, column=0, sticky=tk.W)
+        
+        action_frame = ttk.Frame(frame)
+        action_frame.grid(row=0, column=2, padx=(5, 0))
+        
+        edit_button = ttk.Button(
+            action_frame,
+            text="✏️",
+            width=3,
+            command=lambda: self.app.edit_task(row['task_id'])
+        )
+        edit_button.grid(row=0, column=0, padx=(0, 2))
+        
+        delete_button = ttk.Button(
+            action_frame,
+            text="🗑️",
+            width=3,
+            style='Danger.TButton',
+            command=lambda: self.app.delete_task(row['task_id'])
+        )
+        delete_button.grid(row=0, column=1)
+        
+        for widget in (frame, checkbox, text_frame, row['title'], row['description'], row['due'],
+                       action_frame, edit_button, delete_button):
+            self.add_row_bindtag(widget)
+        
+        for widget in (frame, text_frame, row['title'], row['description'], row['due']):
+            widget.bind("<Button-1>", lambda e: self.on_row_click(row, 'single'))
+            widget.bind("<Control-Button-1>", lambda e: self.on_row_click(row, 'toggle'))
+            widget.bind("<Shift-Button-1>", lambda e: self.on_row_click(row, 'range'))
+        row['text_frame'] = text_frame
+        
+        row['window'] = self.canvas.create_window(
+            (0, 0),
+            window=frame,
+            anchor="nw",
+            width=self.canvas_width,
+            height=self.row_height - 4,
+            state='hidden'
+        )
+        return row
+    
+    def bind_row(self, row, task, index):
+
+        selected = task['id'] in self.selected_ids
+        overdue = is_overdue(task)
+        key = (
+            index, task['id'], task['title'], task['description'], task['completed'], selected,
+            task.get('due_at'), task.get('recurrence'), overdue
+        )
+        if row['key'] == key:
+            return
+        
+        if row['task_id'] != task['id']:
+            self.release_row(row)
+            self.row_by_task_id[task['id']] = row
+        row['key'] = key
+        row['task_id'] = task['id']
+        row['var'].set(task['completed'])
+        
+        title_font = self.app.fonts['body']
+        if task['completed']:
+            title_font = (title_font[0], title_font[1], 'overstrike')
+        row['title'].configure(
+            text=task['title'],
+            font=title_font,
+            foreground=self.app.colors['dark'] if not task['completed'] else self.app.colors['border']
+        )
+        
+        if task['description']:
+            row['description'].configure(text=f"📝 {task['description']}")
+            row['description'].grid()
+        else:
+            row['description'].grid_remove()
+        
+        if task.get('due_at'):
+            repeat = " ↻" if task.get('recurrence') else ""
+            row['due'].configure(
+                text=f"⏰ {format_due(task['due_at'])}{repeat}",
+                foreground=self.app.colors['danger'] if overdue else self.app.colors['dark']
+            )
+            row['due'].grid()
+        else:
+            row['due'].grid_remove()
+        
+        frame_style = 'Selected.TFrame' if selected else 'TFrame'
+        label_style = 'Selected.TLabel' if selected else 'TLabel'
+        row['frame'].configure(style=frame_style)
+        row['text_frame'].configure(style=frame_style)
+        row['title'].configure(style=label_style)
+        row['description'].configure(style=label_style)
+        row['due'].configure(style=label_style)
+        
+        self.canvas.coords(row['window'], 0, index * self.row_height + 2)
+        self.canvas.itemconfigure(row['window'], state='normal')
+
 
 class TaskFlowGUI:
 
-    def __init__(self):
+    SORT_LABELS = {
+        'manual': "Ordem de criação",
+        'created': "Data de criação",
+        'completed': "Data de conclusão",
+        'title': "Título",
+        'due': "Prazo"
+    }
+
+    PROFILED_METHODS = (
+        'add_task', 'toggle_task_completion', 'edit_task', 'delete_task',
+        'set_filter', 'set_sort', 'apply_search', 'refresh_task_list', 'get_filtered_tasks',
+        'sync_task_row', 'update_statistics', 'update_filter_buttons',
+        'save_tasks', 'flush_saves', 'apply_bulk_change', 'poll_loaded_batches',
+        'apply_external_changes', 'apply_history_step', 'archive_step',
+        'fire_deadlines', 'apply_service_changes', 'refresh_analytics', 'export_step',
+        'create_toolbars'
+    )
+    ANALYTICS_PERIODS = (
+        ("Últimos 30 dias", 1, 30),
+        ("Últimas 12 semanas", 7, 12),
+        ("Últimas 52 semanas", 7, 52)
+    )
+    PROFILED_VIEW_METHODS = ('render', 'set_items', 'insert_item', 'update_item', 'remove_item')
+    PROFILED_STORE_METHODS = ('add', 'update', 'remove', 'filtered', 'search', 'counts', 'extend')
+    PROFILED_STORAGE_METHODS = ('open_store', 'commit', 'flush', 'poll_changes', 'reserve_ids')
+
+    def __init__(self, data_file="tasks_gui.json", storage_mode="json", profiler=None, api_port=None,
+                 startup=None):
         self.root = tk.Tk()
-        self.tasks = []
+        self.profiler = profiler or Profiler()
+        self.startup = startup or StartupTimer()
+        self.toolbars_ready = False
+        self.profiler_overlay = None
+        self.store = TaskStore()
         self.current_filter = "all"  
-        self.data_file = "tasks_gui.json"
+        self.sort_key = "manual"
+        self.sort_reverse = False
+        self.search_query = ""
+        self.search_job = None
+        self.data_file = data_file
+        self.storage = create_storage(storage_mode, data_file)
+        self.trash = self.storage.open_trash()
+        self.history = OperationLog()
+        self.trash_window = None
+        self.archive = self.storage.open_archive()
+        self.archive_after_days = 90
+        self.archive_batch_size = 500
+        self.archive_job = None
+        self.archive_window = None
+        self.deadlines = None
+        self.deadline_job = None
+        self.deadline_wake = None
+        self.reminder_lead_minutes = 0
+        self.max_timer_delay = 3600 * 1000
+        self.reminder_window = None
+        self.analytics_window = None
+        self.analytics_job = None
+        self.export_run = None
+        self.export_job = None
+        self.export_window = None
+        self.export_total = 0
+        self.api_server = None
+        self.api_dispatcher = None
+        self.api_feed = None
+        self.save_delay = 250
+        self.save_job = None
+        self.watch_job = None
+        self.external_poll_interval = 1000
+        self.external_job = None
+        self.pending_upserts = {}
+        self.pending_deletes = set()
+        self.loading = False
+        self.load_failed = False
+        self.loader = None
+        self.load_queue = queue.Queue(maxsize=8)
+        
+        self.instrument(self, self.PROFILED_METHODS, "app")
         
         self.setup_window()
         
@@ -21,10 +506,17 @@ class TaskFlowGUI:
         
         self.create_interface()
         
-        self.load_tasks()
+        self.setup_profiling()
         
         self.refresh_task_list()
         self.update_statistics()
+        self.update_filter_buttons()
+        
+        self.root.bind("<Map>", self.on_first_map, add="+")
+        self.start_loading()
+        
+        if api_port is not None:
+            self.start_api(api_port)
     
     def setup_window(self):
         self.root.title("TaskFlow - Gerenciador de Tarefas")
@@ -54,7 +546,8 @@ class TaskFlowGUI:
             'light': '#F5F5F5',       
             'dark': '#212121',         
             'white': '#FFFFFF',        
-            'border': '#E0E0E0'        
+            'border': '#E0E0E0',
+            'selected': '#E3F2FD'
         }
         
         self.fonts = {
@@ -101,6 +594,9 @@ class TaskFlowGUI:
             relief='solid',
             borderwidth=1
         )
+        
+        self.style.configure('Selected.TFrame', background=self.colors['selected'])
+        self.style.configure('Selected.TLabel', background=self.colors['selected'])
     
     def create_interface(self):
 
@@ -138,6 +634,15 @@ class TaskFlowGUI:
             foreground=self.colors['dark']
         )
         subtitle_label.grid(row=1, column=0)
+        
+        self.loading_label = ttk.Label(
+            header_frame,
+            text="",
+            font=self.fonts['small'],
+            foreground=self.colors['warning']
+        )
+        self.loading_label.grid(row=2, column=0)
+        self.loading_label.grid_remove()
     
     def create_add_task_section(self, parent):
 
@@ -179,6 +684,30 @@ class TaskFlowGUI:
             row=1, column=1, columnspan=2,
             sticky=(tk.W, tk.E), pady=(5, 0)
         )
+        
+        ttk.Label(section_frame, text="Prazo:", font=self.fonts['body']).grid(
+            row=2, column=0, sticky=tk.W, padx=(0, 5), pady=(5, 0)
+        )
+        
+        due_frame = ttk.Frame(section_frame)
+        due_frame.grid(row=2, column=1, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 0))
+        
+        self.due_entry = ttk.Entry(due_frame, font=self.fonts['body'], width=18)
+        self.due_entry.grid(row=0, column=0)
+        self.due_entry.bind('<Return>', lambda e: self.add_task())
+        
+        ttk.Label(due_frame, text="dd/mm/aaaa HH:MM", font=self.fonts['small']).grid(
+            row=0, column=1, padx=(5, 10)
+        )
+        
+        self.recurrence_var = tk.StringVar(value=RECURRENCE_LABELS[''])
+        ttk.Combobox(
+            due_frame,
+            textvariable=self.recurrence_var,
+            values=[RECURRENCE_LABELS[key] for key in RECURRENCES],
+            state='readonly',
+            width=14
+        ).grid(row=0, column=2)
     
     def create_filter_section(self, parent):
 
@@ -214,7 +743,134 @@ class TaskFlowGUI:
             text="Concluídas (0)",
             command=lambda: self.set_filter('completed')
         )
-        self.filter_buttons['completed'].grid(row=0, column=2)
+        self.filter_buttons['completed'].grid(row=0, column=2, padx=(0, 5))
+        
+        self.filter_buttons['overdue'] = ttk.Button(
+            button_frame,
+            text="Atrasadas (0)",
+            command=lambda: self.set_filter('overdue')
+        )
+        self.filter_buttons['overdue'].grid(row=0, column=3)
+        
+        search_frame = ttk.Frame(section_frame)
+        search_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
+        search_frame.columnconfigure(1, weight=1)
+        section_frame.columnconfigure(0, weight=1)
+        
+        ttk.Label(search_frame, text="Buscar:", font=self.fonts['body']).grid(
+            row=0, column=0, sticky=tk.W, padx=(0, 5)
+        )
+        
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(
+            search_frame,
+            textvariable=self.search_var,
+            font=self.fonts['body']
+        )
+        self.search_entry.grid(row=0, column=1, sticky=(tk.W, tk.E))
+        self.search_var.trace_add('write', lambda *args: self.schedule_search())
+        
+        ttk.Label(search_frame, text="Ordenar:", font=self.fonts['body']).grid(
+            row=0, column=2, sticky=tk.W, padx=(10, 5)
+        )
+        
+        self.sort_var = tk.StringVar(value=self.SORT_LABELS[self.sort_key])
+        self.sort_combo = ttk.Combobox(
+            search_frame,
+            textvariable=self.sort_var,
+            values=[self.SORT_LABELS[key] for key in SORT_KEYS],
+            state='readonly',
+            width=17
+        )
+        self.sort_combo.grid(row=0, column=3)
+        self.sort_combo.bind('<<ComboboxSelected>>', lambda e: self.on_sort_changed())
+        
+        self.sort_reverse_var = tk.BooleanVar(value=self.sort_reverse)
+        ttk.Checkbutton(
+            search_frame,
+            text="Decrescente",
+            variable=self.sort_reverse_var,
+            command=self.on_sort_changed
+        ).grid(row=0, column=4, padx=(5, 0))
+        
+        self.filter_frame = section_frame
+        self.root.bind("<Control-z>", lambda e: self.undo_shortcut(e, self.undo))
+        self.root.bind("<Control-y>", lambda e: self.undo_shortcut(e, self.redo))
+        self.root.bind("<Control-Z>", lambda e: self.undo_shortcut(e, self.redo))
+    
+    def create_toolbars(self):
+
+        """Ações em lote e histórico; criadas depois da primeira pintura."""
+        section_frame = self.filter_frame
+        bulk_frame = ttk.Frame(section_frame)
+        bulk_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
+        
+        ttk.Button(
+            bulk_frame,
+            text="Selecionar todas",
+            command=lambda: self.task_view.select_all()
+        ).grid(row=0, column=0, padx=(0, 5))
+        
+        self.bulk_buttons = [
+            ttk.Button(
+                bulk_frame,
+                text="✔ Concluir",
+                command=lambda: self.bulk_set_completed(True)
+            ),
+            ttk.Button(
+                bulk_frame,
+                text="↺ Reabrir",
+                command=lambda: self.bulk_set_completed(False)
+            ),
+            ttk.Button(
+                bulk_frame,
+                text="🗑️ Excluir",
+                style='Danger.TButton',
+                command=self.bulk_delete
+            )
+        ]
+        for column, button in enumerate(self.bulk_buttons, start=1):
+            button.grid(row=0, column=column, padx=(0, 5))
+            button.state(['disabled'])
+        
+        ttk.Button(
+            bulk_frame,
+            text="📥 Importar...",
+            command=self.import_tasks
+        ).grid(row=0, column=4, padx=(0, 5))
+        
+        ttk.Button(
+            bulk_frame,
+            text="📤 Exportar...",
+            command=self.export_view
+        ).grid(row=0, column=5, padx=(0, 5))
+        
+        self.selection_label = ttk.Label(bulk_frame, text="", font=self.fonts['small'])
+        self.selection_label.grid(row=0, column=6)
+        
+        history_frame = ttk.Frame(section_frame)
+        history_frame.grid(row=3, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
+        
+        self.undo_button = ttk.Button(history_frame, text="↶ Desfazer", command=self.undo)
+        self.undo_button.grid(row=0, column=0, padx=(0, 5))
+        self.redo_button = ttk.Button(history_frame, text="↷ Refazer", command=self.redo)
+        self.redo_button.grid(row=0, column=1, padx=(0, 5))
+        self.toolbars_ready = True
+        self.update_history_buttons()
+        
+        ttk.Button(
+            history_frame,
+            text="🗑 Lixeira",
+            command=self.show_trash
+        ).grid(row=0, column=2, padx=(0, 5))
+        
+        ttk.Button(
+            history_frame,
+            text="📦 Arquivo",
+            command=self.show_archive
+        ).grid(row=0, column=3)
+        
+        self.on_selection_changed()
     
     def create_task_list_section(self, parent):
 
@@ -228,45 +884,19 @@ class TaskFlowGUI:
         section_frame.rowconfigure(0, weight=1)
         parent.rowconfigure(3, weight=1)
         
-        self.create_scrollable_task_list(section_frame)
-    
-    def create_scrollable_task_list(self, parent):
-
-        self.task_canvas = tk.Canvas(parent, highlightthickness=0)
-        self.task_scrollbar = ttk.Scrollbar(
-            parent,
-            orient="vertical",
-            command=self.task_canvas.yview
-        )
-        self.task_canvas.configure(yscrollcommand=self.task_scrollbar.set)
-        
-        self.task_list_frame = ttk.Frame(self.task_canvas)
-        self.task_canvas_window = self.task_canvas.create_window(
-            (0, 0),
-            window=self.task_list_frame,
-            anchor="nw"
-        )
-        
-        self.task_canvas.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        self.task_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        list_frame = ttk.Frame(section_frame)
+        list_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
-        parent.columnconfigure(0, weight=1)
-        parent.rowconfigure(0, weight=1)
-    
-        self.task_list_frame.bind(
-            "<Configure>",
-            lambda e: self.task_canvas.configure(scrollregion=self.task_canvas.bbox("all"))
-        )
+        self.position_label = ttk.Label(section_frame, text="", font=self.fonts['small'])
+        self.position_label.grid(row=1, column=0, sticky=tk.E, pady=(5, 0))
         
-        self.task_canvas.bind(
-            "<Configure>",
-            self.on_canvas_configure
-        )
+        self.create_scrollable_task_list(list_frame)
     
-    def on_canvas_configure(self, event):
+    def create_scrollable_task_list(self, parent):
 
-        canvas_width = event.width
-        self.task_canvas.itemconfig(self.task_canvas_window, width=canvas_width)
+        self.task_view = VirtualTaskList(self, parent)
+        self.task_canvas = self.task_view.canvas
+        self.task_scrollbar = self.task_view.scrollbar
     
     def create_statistics_section(self, parent):
 
@@ -285,6 +915,12 @@ class TaskFlowGUI:
         )
         self.stats_label.grid(row=0, column=0, columnspan=2, sticky=tk.W)
         
+        ttk.Button(
+            section_frame,
+            text="📈 Análise",
+            command=self.show_analytics
+        ).grid(row=0, column=2, padx=(5, 0))
+        
         ttk.Label(section_frame, text="Progresso:", font=self.fonts['body']).grid(
             row=1, column=0, sticky=tk.W, pady=(5, 0)
         )
@@ -307,6 +943,9 @@ class TaskFlowGUI:
     
     def add_task(self):
 
+        if self.loading:
+            return
+        
         title = self.title_entry.get().strip()
         description = self.description_entry.get("1.0", tk.END).strip()
         
@@ -318,23 +957,33 @@ class TaskFlowGUI:
             self.title_entry.focus()
             return
         
-        task = {
-            'id': len(self.tasks) + 1,
-            'title': title,
-            'description': description if description else "",
-            'completed': False,
-            'created_at': datetime.now().isoformat(),
-            'completed_at': None
-        }
+        try:
+            due_at = parse_due(self.due_entry.get())
+        except ValueError as e:
+            messagebox.showwarning("Prazo Inválido", str(e))
+            self.due_entry.focus()
+            return
         
-        self.tasks.append(task)
+        try:
+            task_id = self.storage.reserve_ids(self.store)[0]
+        except Exception as e:
+            self.show_save_error(e)
+            return
+        task = make_task(task_id, title, description)
+        task['due_at'] = due_at
+        task['recurrence'] = recurrence_from_label(self.recurrence_var.get()) if due_at else ""
+        task = self.store.add(task)
         
-        self.save_tasks()
+        self.save_tasks(upserts=[task])
+        self.record_operation("adicionar", [(None, task)])
         
         self.title_entry.delete(0, tk.END)
         self.description_entry.delete("1.0", tk.END)
+        self.due_entry.delete(0, tk.END)
+        self.recurrence_var.set(RECURRENCE_LABELS[''])
         
-        self.refresh_task_list()
+        if self.task_matches_filter(task):
+            self.task_view.insert_item(task)
         self.update_statistics()
         self.update_filter_buttons()
         
@@ -353,15 +1002,45 @@ class TaskFlowGUI:
         self.refresh_task_list()
         self.update_filter_buttons()
     
+    def on_sort_changed(self):
+
+        labels = {label: key for key, label in self.SORT_LABELS.items()}
+        self.set_sort(labels.get(self.sort_var.get(), "manual"), self.sort_reverse_var.get())
+    
+    def set_sort(self, sort_key, reverse=False):
+
+        self.sort_key = sort_key
+        self.sort_reverse = reverse
+        self.refresh_task_list()
+    
+    def update_list_position(self):
+
+        """Mostra "página N de M" e o dia do topo da lista, em O(log n)."""
+        items = self.task_view.items
+        total = len(items)
+        rows = self.task_view.rows_per_page()
+        pages = max(1, math.ceil(total / rows))
+        top = min(self.task_view.top_index(), max(0, total - 1))
+        text = f"Página {min(pages, top // rows + 1)} de {pages}"
+        
+        group_of = getattr(items, 'group_of', None)
+        group = group_of(top) if group_of is not None and total else None
+        if group is not None:
+            day, count = group
+            day_text = day.strftime("%d/%m/%Y") if day is not None else "Sem data"
+            text = f"📅 {day_text} ({count}) · {text}"
+        self.position_label.configure(text=text)
+    
     def update_filter_buttons(self):
 
-        total = len(self.tasks)
-        pending = len([t for t in self.tasks if not t['completed']])
-        completed = len([t for t in self.tasks if t['completed']])
+        counts = self.store.counts()
         
-        self.filter_buttons['all'].configure(text=f"Todas ({total})")
-        self.filter_buttons['pending'].configure(text=f"Pendentes ({pending})")
-        self.filter_buttons['completed'].configure(text=f"Concluídas ({completed})")
+        self.filter_buttons['all'].configure(text=f"Todas ({counts['total']})")
+        self.filter_buttons['pending'].configure(text=f"Pendentes ({counts['pending']})")
+        self.filter_buttons['completed'].configure(text=f"Concluídas ({counts['completed']})")
+        # O índice de prazos só é montado depois da carga completa
+        overdue = self.store.count_overdue() if self.deadlines is not None else 0
+        self.filter_buttons['overdue'].configure(text=f"Atrasadas ({overdue})")
         
         for filter_name, button in self.filter_buttons.items():
             if filter_name == self.current_filter:
@@ -371,114 +1050,258 @@ class TaskFlowGUI:
     
     def refresh_task_list(self):
 
-        for widget in self.task_list_frame.winfo_children():
-            widget.destroy()
-        
-        filtered_tasks = self.get_filtered_tasks()
-        
-        for i, task in enumerate(filtered_tasks):
-            self.create_task_widget(task, i)
-        
-        self.task_list_frame.update_idletasks()
-        self.task_canvas.configure(scrollregion=self.task_canvas.bbox("all"))
+        self.task_view.set_items(self.get_filtered_tasks())
+    
+    def schedule_search(self):
+
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(200, self.apply_search)
+    
+    def apply_search(self):
+
+        self.search_job = None
+        query = self.search_var.get().strip()
+        if query != self.search_query:
+            self.search_query = query
+            self.refresh_task_list()
+    
+    def task_matches_filter(self, task):
+
+        if self.search_query and not matches_query(task, self.search_query):
+            return False
+        return task_matches_status(task, self.current_filter)
+    
+    def sync_task_row(self, task):
+
+        if self.task_matches_filter(task):
+            self.task_view.update_item(task)
+        else:
+            self.task_view.remove_item(task['id'])
     
     def get_filtered_tasks(self):
 
-        if self.current_filter == "pending":
-            return [t for t in self.tasks if not t['completed']]
-        elif self.current_filter == "completed":
-            return [t for t in self.tasks if t['completed']]
-        else: 
-            return self.tasks
+        return filtered_tasks(
+            self.store, self.current_filter, self.search_query, self.sort_key, self.sort_reverse
+        )
+    
+    def on_selection_changed(self):
+
+        if not self.toolbars_ready:
+            return
+        count = len(self.task_view.selected_ids)
+        self.selection_label.configure(text=f"{count} selecionada(s)" if count else "")
+        for button in self.bulk_buttons:
+            button.state(['!disabled'] if count else ['disabled'])
+    
+    def apply_bulk_change(self, upserts=(), deletes=()):
+
+        self.save_tasks(upserts=upserts, deletes=deletes)
+        self.refresh_task_list()
+        self.update_statistics()
+        self.update_filter_buttons()
+    
+    def bulk_set_completed(self, completed):
+
+        changed = []
+        operation = []
+        for task_id in list(self.task_view.selected_ids):
+            task = self.store.get(task_id)
+            if task is not None and bool(task['completed']) != completed:
+                before = task_snapshot(task)
+                try:
+                    task, follow_up = complete_task(self.storage, self.store, task_id, completed)
+                except Exception as e:
+                    self.show_save_error(e)
+                    break
+                changed.append(task)
+                operation.append((before, task))
+                if follow_up is not None:
+                    changed.append(follow_up)
+                    operation.append((None, follow_up))
+        self.apply_bulk_change(upserts=changed)
+        self.record_operation("concluir" if completed else "reabrir", operation)
     
-    def create_task_widget(self, task, index):
+    def bulk_delete(self):
 
-        task_frame = ttk.Frame(self.task_list_frame)
-        task_frame.grid(row=index, column=0, sticky=(tk.W, tk.E), pady=2)
-        task_frame.columnconfigure(1, weight=1)
+        task_ids = list(self.task_view.selected_ids)
+        if not task_ids:
+            return
         
-        completed_var = tk.BooleanVar(value=task['completed'])
-        checkbox = ttk.Checkbutton(
-            task_frame,
-            variable=completed_var,
-            command=lambda: self.toggle_task_completion(task['id'], completed_var.get())
+        result = messagebox.askyesno(
+            "Confirmar Exclusão",
+            f"Tem certeza que deseja excluir {len(task_ids)} tarefa(s)?\n\n"
+            "As tarefas ficam na lixeira e podem ser restauradas.",
+            icon='warning'
         )
-        checkbox.grid(row=0, column=0, padx=(0, 5))
         
-        text_frame = ttk.Frame(task_frame)
-        text_frame.grid(row=0, column=1, sticky=(tk.W, tk.E))
-        text_frame.columnconfigure(0, weight=1)
+        if result:
+            removed = [task for task in map(self.store.remove, task_ids) if task is not None]
+            self.apply_bulk_change(deletes=[task['id'] for task in removed])
+            self.discard_to_trash(removed)
+    
+    def import_tasks(self):
+
+        if self.loading:
+            return
         
-        title_font = self.fonts['body']
-        if task['completed']:
-            title_font = (title_font[0], title_font[1], 'overstrike')
+        path = filedialog.askopenfilename(
+            title="Importar Tarefas",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Todos os arquivos", "*.*")]
+        )
+        if not path:
+            return
         
-        title_label = ttk.Label(
-            text_frame,
-            text=task['title'],
-            font=title_font,
-            foreground=self.colors['dark'] if not task['completed'] else self.colors['border']
-        )
-        title_label.grid(row=0, column=0, sticky=tk.W)
-        
-        if task['description']:
-            desc_label = ttk.Label(
-                text_frame,
-                text=f"📝 {task['description']}",
-                font=self.fonts['small'],
-                foreground=self.colors['border']
+        imported = []
+        try:
+            records = list(read_import_file(path))
+            for task, task_id in zip(records, self.storage.reserve_ids(self.store, len(records))):
+                task['id'] = task_id
+                imported.append(self.store.add(task))
+        except Exception as e:
+            messagebox.showerror(
+                "Erro ao Importar",
+                f"Não foi possível importar as tarefas:\n{str(e)}"
             )
-            desc_label.grid(row=1, column=0, sticky=tk.W)
         
-        action_frame = ttk.Frame(task_frame)
-        action_frame.grid(row=0, column=2, padx=(5, 0))
+        if imported:
+            self.apply_bulk_change(upserts=imported)
+            self.record_operation("importar", [(None, task) for task in imported])
+            messagebox.showinfo("Importação Concluída", f"{len(imported)} tarefa(s) importada(s).")
+    
+    def export_view(self):
+
+        """Exporta a lista como está (filtro, busca e ordem), em segundo plano."""
+        if self.loading or self.export_run is not None:
+            return
         
-        edit_button = ttk.Button(
-            action_frame,
-            text="✏️",
-            width=3,
-            command=lambda: self.edit_task(task['id'])
+        path = filedialog.asksaveasfilename(
+            title="Exportar Tarefas",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("iCalendar", "*.ics")]
         )
-        edit_button.grid(row=0, column=0, padx=(0, 2))
+        if not path:
+            return
         
-        delete_button = ttk.Button(
-            action_frame,
-            text="🗑️",
-            width=3,
-            style='Danger.TButton',
-            command=lambda: self.delete_task(task['id'])
+        tasks = iter_filtered_tasks(
+            self.store, self.current_filter, self.search_query, self.sort_key, self.sort_reverse
         )
-        delete_button.grid(row=0, column=1)
+        self.export_total = len(self.task_view.items)
+        self.export_run = export_tasks(tasks, path)
+        
+        window = tk.Toplevel(self.root)
+        window.title("Exportando")
+        window.geometry("360x120")
+        window.transient(self.root)
+        window.protocol("WM_DELETE_WINDOW", self.cancel_export)
+        self.export_window = window
+        
+        main_frame = ttk.Frame(window, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        window.columnconfigure(0, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+        
+        window.status_label = ttk.Label(
+            main_frame,
+            text=f"0 de {self.export_total} tarefa(s)",
+            font=self.fonts['small']
+        )
+        window.status_label.grid(row=0, column=0, sticky=tk.W)
+        window.progress_var = tk.DoubleVar()
+        ttk.Progressbar(
+            main_frame,
+            variable=window.progress_var,
+            maximum=max(1, self.export_total)
+        ).grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(5, 10))
+        ttk.Button(main_frame, text="Cancelar", command=self.cancel_export).grid(row=2, column=0)
+        
+        self.export_job = self.root.after(1, self.export_step)
+    
+    def export_step(self):
+
+        # Cada passo escreve pedaços de 1000 tarefas por até 20 ms; a
+        # interface continua respondendo entre os passos
+        self.export_job = None
+        deadline = time.perf_counter() + 0.02
+        exported = None
+        try:
+            while time.perf_counter() < deadline:
+                exported = next(self.export_run)
+        except StopIteration:
+            self.finish_export()
+            messagebox.showinfo("Exportação Concluída", f"{self.export_total} tarefa(s) exportada(s).")
+            return
+        except Exception as e:
+            self.finish_export()
+            messagebox.showerror("Erro ao Exportar", f"Não foi possível exportar as tarefas:\n{str(e)}")
+            return
+        
+        if exported is not None:
+            self.export_total = max(self.export_total, exported)
+            self.export_window.progress_var.set(exported)
+            self.export_window.status_label.configure(text=f"{exported} de {self.export_total} tarefa(s)")
+        self.export_job = self.root.after(1, self.export_step)
+    
+    def cancel_export(self):
+
+        if self.export_run is not None:
+            # Fechar o gerador apaga o arquivo temporário
+            self.export_run.close()
+        self.finish_export()
+    
+    def finish_export(self):
+
+        if self.export_job is not None:
+            self.root.after_cancel(self.export_job)
+            self.export_job = None
+        self.export_run = None
+        if self.export_window is not None:
+            self.export_window.destroy()
+            self.export_window = None
     
     def toggle_task_completion(self, task_id, completed):
 
-        for task in self.tasks:
-            if task['id'] == task_id:
-                task['completed'] = completed
-                task['completed_at'] = datetime.now().isoformat() if completed else None
-                break
+        if task_id not in self.store:
+            return
         
-        self.save_tasks()
-        self.refresh_task_list()
+        before = task_snapshot(self.store.get(task_id))
+        try:
+            task, follow_up = complete_task(self.storage, self.store, task_id, completed)
+        except Exception as e:
+            self.show_save_error(e)
+            return
+        
+        upserts = [task]
+        operation = [(before, task)]
+        if follow_up is not None:
+            # A próxima ocorrência de uma tarefa recorrente
+            upserts.append(follow_up)
+            operation.append((None, follow_up))
+            if self.task_matches_filter(follow_up):
+                self.task_view.insert_item(follow_up)
+        
+        self.save_tasks(upserts=upserts)
+        self.record_operation("concluir" if completed else "reabrir", operation)
+        self.sync_task_row(task)
         self.update_statistics()
         self.update_filter_buttons()
     
     def edit_task(self, task_id):
 
-        task = next((t for t in self.tasks if t['id'] == task_id), None)
+        task = self.store.get(task_id)
         if not task:
             return
         
         edit_window = tk.Toplevel(self.root)
         edit_window.title("Editar Tarefa")
-        edit_window.geometry("400x300")
+        edit_window.geometry("400x360")
         edit_window.transient(self.root)
         edit_window.grab_set()
         
         edit_window.update_idletasks()
         x = self.root.winfo_x() + (self.root.winfo_width() // 2) - 200
-        y = self.root.winfo_y() + (self.root.winfo_height() // 2) - 150
-        edit_window.geometry(f"400x300+{x}+{y}")
+        y = self.root.winfo_y() + (self.root.winfo_height() // 2) - 180
+        edit_window.geometry(f"400x360+{x}+{y}")
         
         main_frame = ttk.Frame(edit_window, padding="20")
         main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -504,20 +1327,56 @@ class TaskFlowGUI:
         
         main_frame.rowconfigure(1, weight=1)
         
+        ttk.Label(main_frame, text="Prazo:", font=self.fonts['body']).grid(
+            row=2, column=0, sticky=tk.W, pady=(0, 5)
+        )
+        
+        due_entry = ttk.Entry(main_frame, font=self.fonts['body'])
+        due_entry.grid(row=2, column=1, sticky=(tk.W, tk.E), pady=(0, 5))
+        due_entry.insert(0, format_due(task.get('due_at')))
+        
+        ttk.Label(main_frame, text="Repetir:", font=self.fonts['body']).grid(
+            row=3, column=0, sticky=tk.W
+        )
+        
+        recurrence_var = tk.StringVar(value=RECURRENCE_LABELS[task.get('recurrence') or ''])
+        ttk.Combobox(
+            main_frame,
+            textvariable=recurrence_var,
+            values=[RECURRENCE_LABELS[key] for key in RECURRENCES],
+            state='readonly'
+        ).grid(row=3, column=1, sticky=(tk.W, tk.E))
+        
         button_frame = ttk.Frame(main_frame)
-        button_frame.grid(row=2, column=0, columnspan=2, pady=(10, 0))
+        button_frame.grid(row=4, column=0, columnspan=2, pady=(10, 0))
         
         def save_changes():
             new_title = title_entry.get().strip()
             if not new_title:
                 messagebox.showwarning("Campo Obrigatório", "Título não pode estar vazio.")
                 return
+            try:
+                due_at = parse_due(due_entry.get())
+            except ValueError as e:
+                messagebox.showwarning("Prazo Inválido", str(e), parent=edit_window)
+                return
             
-            task['title'] = new_title
-            task['description'] = desc_text.get("1.0", tk.END).strip()
+            before = task_snapshot(task)
+            # A store SQLite devolve um dicionário novo; o de antes ficou velho
+            updated = self.store.update(
+                task['id'],
+                title=new_title,
+                description=desc_text.get("1.0", tk.END).strip(),
+                due_at=due_at,
+                recurrence=recurrence_from_label(recurrence_var.get()) if due_at else ""
+            )
             
-            self.save_tasks()
-            self.refresh_task_list()
+            self.save_tasks(upserts=[updated])
+            self.record_operation("editar", [(before, updated)])
+            self.sync_task_row(updated)
+            if updated.get('due_at') != before.get('due_at'):
+                # O prazo mudou: a contagem de atrasadas pode ter mudado
+                self.update_filter_buttons()
             edit_window.destroy()
         
         def cancel_edit():
@@ -542,69 +1401,1039 @@ class TaskFlowGUI:
     
     def delete_task(self, task_id):
 
-        task = next((t for t in self.tasks if t['id'] == task_id), None)
+        task = self.store.get(task_id)
         if not task:
             return
         
         result = messagebox.askyesno(
             "Confirmar Exclusão",
-            f"Tem certeza que deseja excluir a tarefa '{task['title']}'?\n\nEsta ação não pode ser desfeita.",
+            f"Tem certeza que deseja excluir a tarefa '{task['title']}'?\n\n"
+            "A tarefa fica na lixeira e pode ser restaurada.",
             icon='warning'
         )
         
         if result:
-            self.tasks = [t for t in self.tasks if t['id'] != task_id]
+            self.store.remove(task_id)
             
-            self.save_tasks()
-            self.refresh_task_list()
+            self.save_tasks(deletes=[task_id])
+            self.task_view.remove_item(task_id)
             self.update_statistics()
             self.update_filter_buttons()
+            self.discard_to_trash([task])
+    
+    def discard_to_trash(self, tasks):
+
+        if not tasks:
+            return
+        self.record_operation("excluir", [(task, None) for task in tasks])
+        try:
+            self.trash.add(tasks)
+        except OSError as e:
+            self.show_save_error(e)
     
     def update_statistics(self):
 
-        total = len(self.tasks)
-        completed = len([t for t in self.tasks if t['completed']])
-        pending = total - completed
+        counts = self.store.counts()
+        total = counts['total']
+        pending = counts['pending']
+        completed = counts['completed']
         
         self.stats_label.configure(
             text=f"Total: {total} | Pendentes: {pending} | Concluídas: {completed}"
         )
         
-        if total > 0:
-            progress = (completed / total) * 100
-            self.progress_var.set(progress)
-            self.progress_label.configure(text=f"{progress:.0f}%")
+        progress = progress_percent(counts)
+        self.progress_var.set(progress)
+        self.progress_label.configure(text=f"{progress:.0f}%")
+        
+        if self.analytics_window is not None and self.analytics_job is None:
+            self.analytics_job = self.root.after(500, self.refresh_analytics)
+    
+    def save_tasks(self, upserts=(), deletes=()):
+
+        for task in upserts:
+            self.pending_upserts[task['id']] = task
+        for task_id in deletes:
+            self.pending_upserts.pop(task_id, None)
+            self.pending_deletes.add(task_id)
+        
+        if self.save_job is None:
+            self.save_job = self.root.after(self.save_delay, self.flush_saves)
+        self.arm_deadline_timer()
+        if self.api_feed is not None:
+            from taskflow_api import change_records
+            self.api_feed.publish(change_records(upserts, deletes))
+    
+    def flush_saves(self):
+
+        if self.save_job is not None:
+            self.root.after_cancel(self.save_job)
+            self.save_job = None
+        
+        if self.loading:
+            # Salvar agora gravaria uma lista incompleta
+            self.save_job = self.root.after(self.save_delay, self.flush_saves)
+            return
+        
+        upserts = list(self.pending_upserts.values())
+        deletes = list(self.pending_deletes)
+        self.pending_upserts.clear()
+        self.pending_deletes.clear()
+        
+        # Gravar uma store carregada pela metade apagaria as tarefas que faltaram
+        if (upserts or deletes) and not self.load_failed:
+            try:
+                self.storage.commit(self.store, upserts, deletes)
+            except Exception as e:
+                self.show_save_error(e)
+        if self.watch_job is None:
+            self.watch_storage()
+    
+    def watch_storage(self):
+
+        self.watch_job = None
+        error = self.storage.take_error()
+        if error is not None:
+            self.show_save_error(error)
+        if self.storage.busy():
+            self.watch_job = self.root.after(100, self.watch_storage)
+    
+    def watch_external_changes(self):
+
+        self.external_job = self.root.after(
+            self.external_poll_interval, self.watch_external_changes
+        )
+        if self.loading or self.save_job is not None:
+            # Mudanças locais ainda não gravadas: a próxima verificação cuida disso
+            return
+        
+        try:
+            changes = self.storage.poll_changes(self.store)
+        except Exception:
+            return
+        if changes:
+            self.apply_external_changes(changes)
+    
+    def apply_external_changes(self, changes):
+
+        """Aplica mudanças gravadas por outros processos sem recarregar a lista."""
+        pending = set(self.pending_upserts) | self.pending_deletes
+        changes = [
+            change for change in changes
+            if change['op'] == 'reload' or change_task_id(change) not in pending
+        ]
+        upserts, removed, _ = self.apply_changes(changes)
+        
+        if self.api_feed is not None:
+            from taskflow_api import change_records
+            records = change_records(upserts, [task['id'] for task in removed])
+            if any(change['op'] == 'reload' for change in changes):
+                records.append({'op': 'reload'})
+            self.api_feed.publish(records)
+    
+    def apply_changes(self, changes):
+
+        """Aplica registros put/delete à store e à lista, atualizando só as linhas afetadas.
+
+        Retorna as tarefas gravadas, as removidas e os IDs das que foram recriadas.
+        """
+        refresh = len(changes) > 200
+        upserts = []
+        removed = []
+        created = []
+        for change in changes:
+            if change['op'] == 'reload':
+                refresh = True
+                continue
+            
+            task_id = change_task_id(change)
+            archived = change.get('archived', False)
+            if change['op'] == 'delete':
+                task = self.store.remove(task_id, archived=archived)
+                if task is not None:
+                    removed.append(task)
+                    if not refresh:
+                        self.task_view.remove_item(task_id)
+                continue
+            
+            fields = Task.from_dict(change['task']).to_dict()
+            task = self.store.get(task_id)
+            if task is None:
+                task = self.store.add(fields, archived=archived)
+                upserts.append(task)
+                created.append(task_id)
+                if not refresh and self.task_matches_filter(task):
+                    self.task_view.insert_item(task)
+                continue
+            
+            was_visible = self.task_matches_filter(task)
+            del fields['id']
+            task = self.store.update(task_id, **fields)
+            upserts.append(task)
+            if not was_visible and self.task_matches_filter(task):
+                # A posição da tarefa na lista filtrada não é conhecida aqui
+                refresh = True
+            elif not refresh:
+                self.sync_task_row(task)
+        
+        if refresh:
+            self.refresh_task_list()
+        self.update_statistics()
+        self.update_filter_buttons()
+        self.arm_deadline_timer()
+        return upserts, removed, created
+    
+    def start_api(self, port):
+
+        """Serve a API local numa thread; as chamadas rodam aqui, em lotes."""
+        from taskflow_api import ApiServer, ChangeFeed, TaskService, TkDispatcher
+        
+        self.api_feed = ChangeFeed()
+        service = TaskService(self)
+        self.api_dispatcher = TkDispatcher(self.root, service.flush)
+        self.api_server = ApiServer(service, self.api_dispatcher, self.api_feed, port=port)
+        try:
+            self.api_server.start()
+        except OSError as e:
+            self.api_server = self.api_dispatcher = self.api_feed = None
+            messagebox.showwarning("API", f"Não foi possível iniciar a API na porta {port}:\n{e}")
+            return
+        self.api_dispatcher.start()
+    
+    def task_visible(self, task):
+
+        return self.task_matches_filter(task)
+    
+    def apply_service_changes(self, changes):
+
+        """Reflete na lista um lote de mudanças feitas pela API.
+
+        ``changes`` são tuplas (antes, depois, visível antes): sem ``antes``
+        a tarefa é nova, sem ``depois`` foi excluída.
+        """
+        refresh = len(changes) > 200
+        upserts = []
+        removed = []
+        for before, task, was_visible in changes:
+            if task is None:
+                removed.append(before)
+                if was_visible and not refresh:
+                    self.task_view.remove_item(before['id'])
+                continue
+            
+            upserts.append(task)
+            if refresh:
+                continue
+            if was_visible is None:
+                if self.task_matches_filter(task):
+                    self.task_view.insert_item(task)
+            elif not was_visible and self.task_matches_filter(task):
+                refresh = True
+            else:
+                self.sync_task_row(task)
+        
+        if refresh:
+            self.refresh_task_list()
+        self.save_tasks(upserts=upserts, deletes=[task['id'] for task in removed])
+        self.record_operation("API", [(before, task) for before, task, _ in changes])
+        if removed:
+            try:
+                self.trash.add(removed)
+            except OSError as e:
+                self.show_save_error(e)
+        self.update_statistics()
+        self.update_filter_buttons()
+    
+    def record_operation(self, label, changes, archived=False):
+
+        self.history.record(label, changes, archived)
+        self.update_history_buttons()
+    
+    def undo(self):
+
+        self.apply_history_step(self.history.undo())
+    
+    def redo(self):
+
+        self.apply_history_step(self.history.redo())
+    
+    def apply_history_step(self, step):
+
+        if step is None or self.loading:
+            return
+        label, changes = step
+        upserts, removed, created = self.apply_changes(changes)
+        self.save_tasks(upserts=upserts, deletes=[task['id'] for task in removed])
+        self.update_history_buttons()
+        try:
+            if any(change.get('archived') for change in changes):
+                # Desfazer uma restauração do arquivo morto devolve a tarefa a ele
+                self.archive.add(removed)
+                self.archive.remove([
+                    (self.archive.month_of(task), task)
+                    for task in map(self.store.get, created) if task is not None
+                ])
+            else:
+                # Desfazer uma exclusão tira a tarefa da lixeira, e vice-versa
+                self.trash.add(removed)
+                self.trash.remove(created)
+        except OSError as e:
+            self.show_save_error(e)
+    
+    def undo_shortcut(self, event, action):
+
+        # Campos de texto mantêm o próprio desfazer
+        if isinstance(event.widget, (tk.Entry, ttk.Entry, tk.Text)):
+            return None
+        action()
+        return "break"
+    
+    def update_history_buttons(self):
+
+        if not self.toolbars_ready:
+            return
+        for button, text, label in (
+            (self.undo_button, "↶ Desfazer", self.history.next_undo_label()),
+            (self.redo_button, "↷ Refazer", self.history.next_redo_label())
+        ):
+            button.configure(text=f"{text} {label}" if label else text)
+            button.state(['!disabled'] if label else ['disabled'])
+    
+    def show_trash(self):
+
+        if self.trash_window is not None:
+            self.trash_window.lift()
+            return
+        
+        error = self.trash.take_error()
+        if error is not None:
+            self.show_save_error(error)
+        
+        window = tk.Toplevel(self.root)
+        window.title("Lixeira")
+        window.geometry("520x360")
+        window.transient(self.root)
+        self.trash_window = window
+        
+        def close():
+            self.trash_window = None
+            window.destroy()
+        
+        window.protocol("WM_DELETE_WINDOW", close)
+        
+        main_frame = ttk.Frame(window, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        window.columnconfigure(0, weight=1)
+        window.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(0, weight=1)
+        
+        tree = ttk.Treeview(main_frame, columns=('title', 'deleted_at'), show='headings')
+        tree.heading('title', text="Título")
+        tree.heading('deleted_at', text="Excluída em")
+        tree.column('title', width=320)
+        tree.column('deleted_at', width=140, anchor=tk.CENTER)
+        tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        scrollbar = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=tree.yview)
+        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        tree.configure(yscrollcommand=scrollbar.set)
+        
+        entries = {}
+        
+        def reload():
+            tree.delete(*tree.get_children())
+            entries.clear()
+            try:
+                trashed = self.trash.entries()
+            except (OSError, ValueError) as e:
+                self.show_save_error(e)
+                trashed = []
+            for number, entry in enumerate(trashed):
+                item = str(number)
+                entries[item] = entry
+                tree.insert('', tk.END, iid=item, values=(
+                    entry['task']['title'],
+                    datetime.fromisoformat(entry['deleted_at']).strftime("%d/%m/%Y %H:%M")
+                ))
+        
+        def selected_entries():
+            return [entries[item] for item in tree.selection()]
+        
+        def restore():
+            chosen = selected_entries()
+            if chosen:
+                self.restore_from_trash(chosen)
+                reload()
+        
+        def discard():
+            chosen = selected_entries()
+            if not chosen or not messagebox.askyesno(
+                "Excluir Definitivamente",
+                f"Excluir {len(chosen)} tarefa(s) definitivamente?\n\nEsta ação não pode ser desfeita.",
+                icon='warning',
+                parent=window
+            ):
+                return
+            self.run_trash_action(lambda: self.trash.discard([entry['task']['id'] for entry in chosen]))
+            reload()
+        
+        def empty():
+            if entries and messagebox.askyesno(
+                "Esvaziar Lixeira",
+                "Excluir definitivamente todas as tarefas da lixeira?\n\nEsta ação não pode ser desfeita.",
+                icon='warning',
+                parent=window
+            ):
+                self.run_trash_action(self.trash.discard)
+                reload()
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=1, column=0, columnspan=2, pady=(10, 0))
+        
+        ttk.Button(
+            button_frame,
+            text="↺ Restaurar",
+            style='Success.TButton',
+            command=restore
+        ).grid(row=0, column=0, padx=(0, 5))
+        
+        ttk.Button(
+            button_frame,
+            text="Excluir definitivamente",
+            style='Danger.TButton',
+            command=discard
+        ).grid(row=0, column=1, padx=(0, 5))
+        
+        ttk.Button(button_frame, text="Esvaziar", command=empty).grid(row=0, column=2, padx=(0, 5))
+        ttk.Button(button_frame, text="Fechar", command=close).grid(row=0, column=3)
+        
+        reload()
+    
+    def run_trash_action(self, action):
+
+        try:
+            action()
+        except OSError as e:
+            self.show_save_error(e)
+    
+    def restore_tasks(self, tasks, archived=False):
+
+        """Devolve tarefas à lista; retorna quantas foram restauradas.
+
+        ``archived`` indica que vêm do arquivo morto, cujas tarefas já estão
+        no histórico diário.
+        """
+        if self.loading:
+            return 0
+        
+        restored = []
+        for task in tasks:
+            task = task_snapshot(task)
+            if task['id'] in self.store:
+                # O ID foi reutilizado por outro processo desde a exclusão
+                try:
+                    task['id'] = self.storage.reserve_ids(self.store)[0]
+                except Exception as e:
+                    self.show_save_error(e)
+                    break
+            restored.append(self.store.add(task, archived=archived))
+        
+        if restored:
+            self.apply_bulk_change(upserts=restored)
+            self.record_operation("restaurar", [(None, task) for task in restored], archived)
+        return len(restored)
+    
+    def restore_from_trash(self, entries):
+
+        count = self.restore_tasks([entry['task'] for entry in entries])
+        self.run_trash_action(lambda: self.trash.remove(
+            [entry['task']['id'] for entry in entries[:count]]
+        ))
+    
+    def schedule_archival(self):
+
+        if self.archive_after_days and self.archive_job is None:
+            self.archive_job = self.root.after(2000, self.archive_step)
+    
+    def archive_step(self):
+
+        """Arquiva um lote de tarefas antigas por vez, sem travar a interface."""
+        self.archive_job = None
+        if self.loading or self.load_failed:
+            return
+        
+        tasks = archive_candidates(self.store, self.archive_after_days, self.archive_batch_size)
+        if not tasks:
+            return
+        try:
+            # O lote vai para o arquivo antes de sair dos dados principais
+            self.archive.add(tasks)
+        except OSError as e:
+            self.show_save_error(e)
+            return
+        
+        deleted = [task['id'] for task in tasks]
+        for task_id in deleted:
+            self.store.remove(task_id, archived=True)
+        self.apply_bulk_change(deletes=deleted)
+        self.archive_job = self.root.after(50, self.archive_step)
+    
+    def start_deadlines(self):
+
+        self.deadlines = DeadlineScheduler(self.store, self.reminder_lead_minutes)
+        self.update_filter_buttons()
+        self.arm_deadline_timer()
+    
+    def arm_deadline_timer(self):
+
+        """Arma um único ``after`` para o próximo prazo; O(log n) por chamada."""
+        if self.deadlines is None:
+            return
+        wake = self.deadlines.next_wakeup()
+        if wake == self.deadline_wake and self.deadline_job is not None:
+            return
+        
+        if self.deadline_job is not None:
+            self.root.after_cancel(self.deadline_job)
+            self.deadline_job = None
+        self.deadline_wake = wake
+        if wake is None:
+            return
+        # Timers longos são limitados para acompanhar mudanças no relógio
+        delay = min(max(0, wake - now_micros()) // 1000 + 1, self.max_timer_delay)
+        self.deadline_job = self.root.after(delay, self.fire_deadlines)
+    
+    def fire_deadlines(self):
+
+        self.deadline_job = None
+        due = self.deadlines.advance()
+        if due:
+            self.show_reminders(due)
+        
+        # Prazos vencidos mudam o filtro de atrasadas e o destaque das linhas
+        if self.current_filter == "overdue":
+            self.refresh_task_list()
         else:
-            self.progress_var.set(0)
-            self.progress_label.configure(text="0%")
+            self.task_view.render()
+        self.update_filter_buttons()
+        self.arm_deadline_timer()
+    
+    def show_reminders(self, tasks):
+
+        self.root.bell()
+        if self.reminder_window is None:
+            window = tk.Toplevel(self.root)
+            window.title("⏰ Lembretes")
+            window.geometry("400x220")
+            window.transient(self.root)
+            
+            def close():
+                self.reminder_window = None
+                window.destroy()
+            
+            window.protocol("WM_DELETE_WINDOW", close)
+            listbox = tk.Listbox(window, font=self.fonts['body'])
+            listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+            ttk.Button(window, text="Fechar", command=close).pack(pady=(0, 10))
+            self.reminder_window = window
+            self.reminder_list = listbox
+        
+        for task in tasks:
+            self.reminder_list.insert(tk.END, f"{format_due(task['due_at'])} — {task['title']}")
+        self.reminder_window.lift()
+    
+    def show_archive(self):
+
+        if self.archive_window is not None:
+            self.archive_window.lift()
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Arquivo")
+        window.geometry("560x400")
+        window.transient(self.root)
+        self.archive_window = window
+        
+        def close():
+            self.archive_window = None
+            window.destroy()
+        
+        window.protocol("WM_DELETE_WINDOW", close)
+        
+        main_frame = ttk.Frame(window, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        window.columnconfigure(0, weight=1)
+        window.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(2, weight=1)
+        
+        months = self.archive.months()
+        ttk.Label(
+            main_frame,
+            text=(
+                f"Tarefas concluídas há mais de {self.archive_after_days} dias "
+                f"({len(months)} mês(es) arquivado(s), {self.archive.size() / 1024:.0f} KB)"
+            ),
+            font=self.fonts['small']
+        ).grid(row=0, column=0, columnspan=2, sticky=tk.W)
+        
+        search_frame = ttk.Frame(main_frame)
+        search_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 5))
+        search_frame.columnconfigure(0, weight=1)
+        
+        query_var = tk.StringVar()
+        query_entry = ttk.Entry(search_frame, textvariable=query_var, font=self.fonts['body'])
+        query_entry.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        
+        tree = ttk.Treeview(main_frame, columns=('title', 'completed_at'), show='headings')
+        tree.heading('title', text="Título")
+        tree.heading('completed_at', text="Concluída em")
+        tree.column('title', width=360)
+        tree.column('completed_at', width=120, anchor=tk.CENTER)
+        tree.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        scrollbar = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=tree.yview)
+        scrollbar.grid(row=2, column=1, sticky=(tk.N, tk.S))
+        tree.configure(yscrollcommand=scrollbar.set)
+        
+        entries = {}
+        results = {'iterator': iter(())}
+        
+        def show_more():
+            # Os meses só são descomprimidos à medida que os resultados são pedidos
+            try:
+                found = list(islice(results['iterator'], 200))
+            except OSError as e:
+                self.show_save_error(e)
+                found = []
+            for month, task in found:
+                item = str(len(entries))
+                entries[item] = (month, task)
+                completed_at = task['completed_at']
+                tree.insert('', tk.END, iid=item, values=(
+                    task['title'],
+                    datetime.fromisoformat(completed_at).strftime("%d/%m/%Y") if completed_at else ""
+                ))
+            more_button.state(['!disabled'] if len(found) == 200 else ['disabled'])
+        
+        def search():
+            tree.delete(*tree.get_children())
+            entries.clear()
+            results['iterator'] = self.archive.search(query_var.get().strip())
+            show_more()
+        
+        def restore():
+            chosen = [entries[item] for item in tree.selection()]
+            if not chosen:
+                return
+            count = self.restore_tasks([task for month, task in chosen], archived=True)
+            try:
+                self.archive.remove(chosen[:count])
+            except OSError as e:
+                self.show_save_error(e)
+            search()
+        
+        ttk.Button(search_frame, text="Buscar", command=search).grid(row=0, column=1, padx=(5, 0))
+        query_entry.bind('<Return>', lambda e: search())
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=3, column=0, columnspan=2, pady=(10, 0))
+        
+        more_button = ttk.Button(button_frame, text="Mais resultados", command=show_more)
+        more_button.grid(row=0, column=0, padx=(0, 5))
+        
+        ttk.Button(
+            button_frame,
+            text="↺ Restaurar",
+            style='Success.TButton',
+            command=restore
+        ).grid(row=0, column=1, padx=(0, 5))
+        
+        ttk.Button(button_frame, text="Fechar", command=close).grid(row=0, column=2)
+        
+        search()
+        query_entry.focus()
+    
+    def show_analytics(self):
+
+        if self.analytics_window is not None:
+            self.analytics_window.lift()
+            return
+        if self.loading:
+            messagebox.showinfo("Análise", "Aguarde o fim do carregamento das tarefas.")
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Análise de Produtividade")
+        window.geometry("640x440")
+        window.transient(self.root)
+        self.analytics_window = window
+        
+        def close():
+            if self.analytics_job is not None:
+                self.root.after_cancel(self.analytics_job)
+                self.analytics_job = None
+            self.analytics_window = None
+            window.destroy()
+        
+        window.protocol("WM_DELETE_WINDOW", close)
+        
+        main_frame = ttk.Frame(window, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        window.columnconfigure(0, weight=1)
+        window.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        main_frame.rowconfigure(2, weight=1)
+        
+        ttk.Label(main_frame, text="Período:", font=self.fonts['body']).grid(row=0, column=0, sticky=tk.W)
+        window.period_var = tk.StringVar(value=self.ANALYTICS_PERIODS[0][0])
+        period_box = ttk.Combobox(
+            main_frame,
+            textvariable=window.period_var,
+            values=[label for label, _, _ in self.ANALYTICS_PERIODS],
+            state='readonly',
+            width=18
+        )
+        period_box.grid(row=0, column=1, sticky=tk.W, padx=(5, 0))
+        period_box.bind('<<ComboboxSelected>>', lambda e: self.refresh_analytics())
+        
+        window.summary_label = ttk.Label(main_frame, text="Calculando...", font=self.fonts['small'])
+        window.summary_label.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(5, 5))
+        
+        window.chart = tk.Canvas(main_frame, background='white', highlightthickness=0)
+        window.chart.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        window.chart.bind('<Configure>', lambda e: self.draw_analytics_chart())
+        
+        ttk.Button(main_frame, text="Fechar", command=close).grid(row=3, column=0, columnspan=2, pady=(10, 0))
+        
+        window.rows = []
+        window.update_idletasks()
+        self.refresh_analytics()
+    
+    def refresh_analytics(self):
+
+        """Recalcula o painel a partir das agregações diárias da store.
+
+        Só a primeira abertura sem agregações gravadas percorre as tarefas;
+        depois, o custo depende apenas da quantidade de dias mostrados.
+        """
+        self.analytics_job = None
+        window = self.analytics_window
+        if window is None:
+            return
+        
+        label = window.period_var.get()
+        period, count = next(
+            (period, count) for text, period, count in self.ANALYTICS_PERIODS if text == label
+        )
+        window.rows = self.store.daily_rollups().recent(count, period)
+        
+        created = sum(row['created'] for row in window.rows)
+        completed = sum(row['completed'] for row in window.rows)
+        lead = [row['lead_days'] * row['completed'] for row in window.rows if row['completed']]
+        lead_text = f"{sum(lead) / completed:.1f} dia(s)" if completed else "—"
+        window.summary_label.configure(
+            text=(
+                f"Criadas: {created} | Concluídas: {completed} | "
+                f"Tempo médio até concluir: {lead_text} | "
+                f"Em aberto: {window.rows[-1]['open'] if window.rows else 0}"
+            )
+        )
+        self.draw_analytics_chart()
+    
+    def draw_analytics_chart(self):
+
+        window = self.analytics_window
+        if window is None:
+            return
+        chart = window.chart
+        chart.delete('all')
+        rows = window.rows
+        width = chart.winfo_width()
+        height = chart.winfo_height()
+        if not rows or width < 50 or height < 50:
+            return
+        
+        left, right, top, bottom = 40, 40, 20, 30
+        plot_width = width - left - right
+        plot_height = height - top - bottom
+        highest = max(max(row['created'], row['completed']) for row in rows) or 1
+        most_open = max(row['open'] for row in rows) or 1
+        slot = plot_width / len(rows)
+        bar = max(1.0, slot * 0.4)
+        
+        chart.create_line(left, top + plot_height, left + plot_width, top + plot_height, fill='#BDBDBD')
+        chart.create_text(left - 5, top, text=str(highest), anchor=tk.E, font=self.fonts['small'])
+        chart.create_text(
+            left + plot_width + 5, top, text=str(most_open), anchor=tk.W,
+            font=self.fonts['small'], fill=self.colors['warning']
+        )
+        
+        points = []
+        for index, row in enumerate(rows):
+            x = left + index * slot + slot / 2
+            for value, offset, color in (
+                (row['created'], -bar, self.colors['primary']),
+                (row['completed'], 0, self.colors['success'])
+            ):
+                if value:
+                    y = top + plot_height - value / highest * plot_height
+                    chart.create_rectangle(
+                        x + offset, y, x + offset + bar, top + plot_height, fill=color, outline=''
+                    )
+            points.extend((x, top + plot_height - row['open'] / most_open * plot_height))
+        if len(points) >= 4:
+            chart.create_line(*points, fill=self.colors['warning'], width=2)
+        
+        for index in (0, len(rows) - 1):
+            x = left + index * slot + slot / 2
+            chart.create_text(
+                x, top + plot_height + 12,
+                text=micros_to_date(rows[index]['day'] * DAY_MICROS).strftime("%d/%m"),
+                font=self.fonts['small']
+            )
+        chart.create_text(
+            left + plot_width / 2, top + plot_height + 12,
+            text="■ criadas  ■ concluídas  — em aberto",
+            font=self.fonts['small'],
+            fill=self.colors['dark']
+        )
+    
+    def show_save_error(self, error):
+
+        messagebox.showerror(
+            "Erro ao Salvar",
+            f"Não foi possível salvar as tarefas:\n{str(error)}"
+        )
     
-    def save_tasks(self):
+    def start_loading(self):
+
+        self.trash.start_purge()
+        if not self.storage.supports_streaming_load:
+            self.load_tasks()
+            self.refresh_task_list()
+            self.update_statistics()
+            self.update_filter_buttons()
+            self.watch_external_changes()
+            self.schedule_archival()
+            self.start_deadlines()
+            self.mark_startup('tasks')
+            return
+        
+        self.loading = True
+        self.add_button.configure(state='disabled')
+        self.loading_label.configure(text="⏳ Carregando tarefas...")
+        self.loading_label.grid()
+        
+        self.loader = threading.Thread(target=self.read_task_batches, daemon=True)
+        self.loader.start()
+        self.root.after(30, self.poll_loaded_batches)
+    
+    def read_task_batches(self):
 
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.tasks, f, ensure_ascii=False, indent=2)
+            for batch, progress in self.storage.load_batches():
+                self.load_queue.put(('batch', batch, progress))
         except Exception as e:
-            messagebox.showerror(
-                "Erro ao Salvar",
-                f"Não foi possível salvar as tarefas:\n{str(e)}"
-            )
+            self.load_queue.put(('error', e, None))
+        self.load_queue.put(('done', None, None))
+    
+    def poll_loaded_batches(self):
+
+        deadline = time.perf_counter() + 0.02
+        while time.perf_counter() < deadline:
+            try:
+                kind, payload, progress = self.load_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if kind == 'batch':
+                try:
+                    self.add_loaded_tasks(payload)
+                except Exception as e:
+                    self.fail_loading(e)
+                if not self.load_failed:
+                    self.loading_label.configure(text=f"⏳ Carregando tarefas... {progress:.0%}")
+            elif kind == 'error':
+                self.fail_loading(payload)
+            else:
+                self.finish_loading()
+                return
+        
+        self.update_statistics()
+        self.update_filter_buttons()
+        self.root.after(30, self.poll_loaded_batches)
+    
+    def add_loaded_tasks(self, tasks):
+
+        added = self.store.extend(tasks)
+        self.task_view.extend_items([t for t in added if self.task_matches_filter(t)])
+    
+    def finish_loading(self):
+
+        self.loading = False
+        self.loader = None
+        self.storage.attach(self.store)
+        self.add_button.configure(state='normal')
+        if not self.load_failed:
+            self.loading_label.grid_remove()
+        self.update_statistics()
+        self.update_filter_buttons()
+        self.watch_external_changes()
+        self.schedule_archival()
+        self.start_deadlines()
+        self.mark_startup('tasks')
+    
+    def fail_loading(self, error):
+
+        if self.load_failed:
+            return
+        self.load_failed = True
+        self.loading_label.configure(text="⚠ Carga incompleta: as alterações não serão salvas")
+        self.loading_label.grid()
+        messagebox.showerror(
+            "Erro ao Carregar",
+            f"Não foi possível carregar as tarefas:\n{str(error)}\n\n"
+            "As alterações desta sessão não serão salvas, para não sobrescrever o arquivo."
+        )
+    
+    def drain_loader(self):
+
+        while self.loading:
+            kind, payload, progress = self.load_queue.get()
+            if kind == 'batch':
+                try:
+                    self.store.extend(payload)
+                except Exception:
+                    self.load_failed = True
+            elif kind == 'error':
+                self.load_failed = True
+            elif kind == 'done':
+                self.loading = False
+                self.storage.attach(self.store)
     
     def load_tasks(self):
         
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    self.tasks = json.load(f)
+            self.store = self.storage.open_store()
         except Exception as e: 
+            self.fail_loading(e)
+            self.store.load([])
+        self.instrument(self.store, self.PROFILED_STORE_METHODS, "store")
+    
+    def on_first_map(self, event):
+
+        if event.widget is not self.root:
+            return
+        self.root.unbind("<Map>")
+        self.startup.mark('window')
+        self.root.after_idle(self.finish_first_paint)
+    
+    def finish_first_paint(self):
+
+        """Depois que a janela aparece: pinta, mede e monta o que ficou para depois."""
+        self.root.update_idletasks()
+        self.startup.mark('painted')
+        self.create_toolbars()
+        self.startup.mark('toolbars')
+        if not self.loading:
+            self.mark_startup('tasks')
+    
+    def mark_startup(self, name):
+
+        """Tarefas só contam como exibidas quando a janela já foi pintada."""
+        if not self.startup.enabled or self.startup.reported:
+            return
+        if name == 'tasks' and 'painted' not in self.startup.marks:
+            return
+        self.root.update_idletasks()
+        self.startup.mark(name)
+        if not self.startup.complete(('painted', 'tasks')):
+            return
+        self.startup.report(
+            storage=self.storage.__class__.__name__,
+            tasks=len(self.store)
+        )
+        if self.startup.exit_after:
+            self.root.after(0, self.on_closing)
+    
+    def instrument(self, target, names, prefix):
+
+        self.profiler.instrument(target, names, prefix)
+    
+    def setup_profiling(self):
+
+        if not self.profiler.enabled:
+            return
+        
+        self.instrument(self.task_view, self.PROFILED_VIEW_METHODS, "view")
+        self.instrument(self.store, self.PROFILED_STORE_METHODS, "store")
+        self.instrument(self.storage, self.PROFILED_STORAGE_METHODS, "storage")
+        StallMonitor(self.root, self.profiler).start()
+        
+        self.root.bind("<F12>", lambda e: self.toggle_profiler_overlay())
+        self.root.bind("<Control-F12>", lambda e: self.dump_profile())
+        self.root.title(self.root.title() + " [perfil]")
+    
+    def toggle_profiler_overlay(self):
+
+        if self.profiler_overlay is not None:
+            self.profiler_overlay.destroy()
+            self.profiler_overlay = None
+            return
+        
+        overlay = tk.Toplevel(self.root)
+        overlay.title("TaskFlow - Perfil")
+        overlay.geometry("720x420")
+        overlay.protocol("WM_DELETE_WINDOW", self.toggle_profiler_overlay)
+        
+        text = tk.Text(overlay, font=('Courier New', 9), wrap=tk.NONE)
+        text.pack(fill=tk.BOTH, expand=True)
+        self.profiler_overlay = overlay
+        
+        def refresh():
+            if self.profiler_overlay is not overlay:
+                return
+            text.delete("1.0", tk.END)
+            text.insert("1.0", self.profiler.format_table())
+            overlay.after(1000, refresh)
+        
+        refresh()
+    
+    def dump_profile(self):
+
+        try:
+            self.profiler.dump()
+        except Exception as e:
             messagebox.showerror(
-                "Erro ao Carregar",
-                f"Não foi possível carregar as tarefas:\n{str(e)}"
+                "Erro ao Salvar Perfil",
+                f"Não foi possível salvar o perfil:\n{str(e)}"
             )
-            self.tasks = []
     
     def on_closing(self):
 
-        self.save_tasks()
+        self.cancel_export()
+        if self.api_server is not None:
+            self.api_server.stop()
+            self.api_dispatcher.stop()
+        self.drain_loader()
+        self.flush_saves()
+        for job in (
+            self.watch_job, self.external_job, self.archive_job, self.deadline_job,
+            self.analytics_job
+        ):
+            if job is not None:
+                self.root.after_cancel(job)
+        
+        self.storage.close()
+        self.trash.close()
+        error = self.storage.take_error()
+        if error is not None:
+            self.show_save_error(error)
+        
+        if self.profiler.enabled:
+            self.dump_profile()
         self.root.destroy()
     
     def run(self):
@@ -616,8 +2445,29 @@ class TaskFlowGUI:
 
 def main():
 
+    startup = startup_timer_from_environment(sys.argv[1:])
+    startup.mark('imports')
+    profiler = profiler_from_environment(sys.argv[1:])
+    if profiler.enabled:
+        install_callback_timing(profiler)
+    
+    api_port = os.environ.get("TASKFLOW_API_PORT")
+    if api_port:
+        api_port = int(api_port)
+    elif "--api" in sys.argv[1:]:
+        from taskflow_api import DEFAULT_PORT
+        api_port = DEFAULT_PORT
+    else:
+        api_port = None
+    
     try:
-        app = TaskFlowGUI()
+        app = TaskFlowGUI(
+            data_file=os.environ.get("TASKFLOW_FILE", "tasks_gui.json"),
+            storage_mode=os.environ.get("TASKFLOW_STORAGE", "json"),
+            profiler=profiler,
+            api_port=api_port,
+            startup=startup
+        )
         app.run()
     except Exception as e:
         import tkinter.messagebox as mb
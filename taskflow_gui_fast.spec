@@ -0,0 +1,118 @@
+# -*- mode: python ; coding: utf-8 -*-
+#
+# Perfil de build com partida rápida do TaskFlow.
+#
+#   pyinstaller taskflow_gui_fast.spec
+#
+# Por padrão gera uma pasta (dist/taskflow_gui/): o executável abre sem
+# descompactar nada, ao contrário do arquivo único de taskflow_gui.spec, que
+# extrai o Python e o Tcl/Tk para um diretório temporário a cada execução.
+# Com TASKFLOW_ONEFILE=1 gera um único arquivo, sem UPX (descomprimir as DLLs
+# também custa tempo na partida).
+#
+# Meça com TASKFLOW_STARTUP_REPORT=1 ou benchmarks/bench_startup.py.
+
+import os
+
+ONEFILE = os.environ.get('TASKFLOW_ONEFILE', '').lower() in ('1', 'true', 'yes', 'sim', 'on')
+
+# Módulos da biblioteca padrão que o aplicativo não importa; numpy é opcional
+# (os totais diários têm uma versão em Python puro).
+EXCLUDES = [
+    'doctest',
+    'email',
+    'ftplib',
+    'http',
+    'decimal',
+    'lib2to3',
+    'multiprocessing',
+    'numpy',
+    'pdb',
+    'pydoc',
+    'pydoc_data',
+    'tarfile',
+    'tkinter.test',
+    'unittest',
+    'xml',
+    'xmlrpc',
+]
+
+# Fusos horários e traduções do comando clock do Tcl não são usados; das
+# traduções do Tk ficam só as dos diálogos em português e inglês.
+TK_MESSAGES = ('pt', 'en')
+
+
+def keep_data(dest):
+
+    dest = dest.replace('\\', '/')
+    if dest.startswith(('_tcl_data/tzdata/', '_tcl_data/msgs/')):
+        return False
+    if dest.startswith('_tk_data/msgs/'):
+        return os.path.basename(dest).split('.')[0].split('_')[0] in TK_MESSAGES
+    return True
+
+
+a = Analysis(
+    ['taskflow_gui.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=EXCLUDES,
+    noarchive=False,
+    optimize=2,
+)
+a.datas = [entry for entry in a.datas if keep_data(entry[0])]
+pyz = PYZ(a.pure)
+
+if ONEFILE:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        name='taskflow_gui',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,
+        upx_exclude=[],
+        runtime_tmpdir=None,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name='taskflow_gui',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=False,
+        upx_exclude=[],
+        name='taskflow_gui',
+    )
@@ -0,0 +1,344 @@
+import json
+import os
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+TRUE_VALUES = {"1", "true", "yes", "sim", "on"}
+STARTUP_REPORT_FILE = "taskflow_startup.jsonl"
+IMPORTED_AT = time.time()
+
+
+def percentile(sorted_samples, fraction):
+
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+class PhaseStats:
+
+    def __init__(self, max_samples):
+        self.samples = deque(maxlen=max_samples)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+
+    def add(self, seconds):
+
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+        milliseconds = seconds * 1000
+        for index, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+            if milliseconds <= bound:
+                self.buckets[index] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def summary(self):
+
+        ordered = sorted(self.samples)
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': percentile(ordered, 0.50) * 1000,
+            'p95_ms': percentile(ordered, 0.95) * 1000,
+            'p99_ms': percentile(ordered, 0.99) * 1000,
+            'max_ms': self.max * 1000,
+            'histogram_ms': {
+                **{f"<={bound}": count for bound, count in zip(HISTOGRAM_BOUNDS_MS, self.buckets)},
+                f">{HISTOGRAM_BOUNDS_MS[-1]}": self.buckets[-1]
+            }
+        }
+
+
+class Profiler:
+
+    def __init__(self, enabled=False, stall_threshold=0.1, max_samples=5000, dump_path=None):
+        self.enabled = enabled
+        self.stall_threshold = stall_threshold
+        self.max_samples = max_samples
+        self.dump_path = dump_path or "taskflow_profile.json"
+        self.phases = {}
+        self.stalls = deque(maxlen=200)
+        self.last_callback = None
+        self.started_at = time.perf_counter()
+
+    def record(self, name, seconds):
+
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats(self.max_samples)
+        stats.add(seconds)
+
+    @contextmanager
+    def phase(self, name):
+
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def wrap(self, name, function):
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+
+        timed.__name__ = getattr(function, '__name__', name)
+        timed.__wrapped__ = function
+        return timed
+
+    def instrument(self, target, names, prefix):
+
+        if not self.enabled:
+            return
+        for name in names:
+            method = getattr(target, name, None)
+            if method is not None and not hasattr(method, '__wrapped__'):
+                setattr(target, name, self.wrap(f"{prefix}.{name}", method))
+
+    def record_stall(self, lateness):
+
+        self.stalls.append({
+            'at_s': round(time.perf_counter() - self.started_at, 3),
+            'lateness_ms': round(lateness * 1000, 1),
+            'last_callback': self.last_callback
+        })
+
+    def summary(self):
+
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'uptime_s': round(time.perf_counter() - self.started_at, 3),
+            'stall_threshold_ms': self.stall_threshold * 1000,
+            'phases': {name: stats.summary() for name, stats in sorted(self.phases.items())},
+            'stalls': list(self.stalls)
+        }
+
+    def format_table(self, limit=25):
+
+        rows = sorted(self.phases.items(), key=lambda item: item[1].total, reverse=True)[:limit]
+        lines = [f"{'fase':<48} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"]
+        for name, stats in rows:
+            summary = stats.summary()
+            lines.append(
+                f"{name[-48:]:<48} {summary['count']:>6} {summary['p50_ms']:>8.2f} "
+                f"{summary['p95_ms']:>8.2f} {summary['p99_ms']:>8.2f} {summary['max_ms']:>8.2f}"
+            )
+        lines.append("")
+        lines.append(f"Travamentos acima de {self.stall_threshold * 1000:.0f} ms: {len(self.stalls)}")
+        for stall in list(self.stalls)[-5:]:
+            lines.append(f"  +{stall['at_s']}s  {stall['lateness_ms']} ms  ({stall['last_callback']})")
+        return "\n".join(lines)
+
+    def dump(self, path=None):
+
+        with open(path or self.dump_path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+
+def callback_name(function):
+
+    name = getattr(function, '__qualname__', None) or getattr(function, '__name__', None)
+    return name or repr(function)
+
+
+def install_callback_timing(profiler):
+
+    import tkinter
+
+    original = tkinter.CallWrapper
+
+    class TimedCallWrapper(original):
+
+        def __call__(self, *args):
+            name = callback_name(self.func)
+            profiler.last_callback = name
+            start = time.perf_counter()
+            try:
+                return super().__call__(*args)
+            finally:
+                profiler.record(f"callback:{name}", time.perf_counter() - start)
+
+    tkinter.CallWrapper = TimedCallWrapper
+
+
+class StallMonitor:
+
+    def __init__(self, root, profiler, interval=0.05):
+        self.root = root
+        self.profiler = profiler
+        self.interval = interval
+        self.expected = None
+
+    def start(self):
+
+        self.expected = time.perf_counter() + self.interval
+        self.root.after(int(self.interval * 1000), self.tick)
+
+    def tick(self):
+
+        now = time.perf_counter()
+        lateness = now - self.expected
+        if lateness > self.profiler.stall_threshold:
+            self.profiler.record_stall(lateness)
+        self.profiler.record("event_loop.lateness", max(0.0, lateness))
+        self.expected = now + self.interval
+        self.root.after(int(self.interval * 1000), self.tick)
+
+
+def profiler_from_environment(argv=()):
+
+    enabled = "--profile" in argv or os.environ.get("TASKFLOW_PROFILE", "").casefold() in TRUE_VALUES
+    threshold_ms = float(os.environ.get("TASKFLOW_STALL_MS", "100"))
+    return Profiler(
+        enabled=enabled,
+        stall_threshold=threshold_ms / 1000,
+        dump_path=os.environ.get("TASKFLOW_PROFILE_FILE")
+    )
+
+
+def linux_start_time(pid):
+
+    with open(f"/proc/{pid}/stat", 'rb') as f:
+        # O nome do processo pode ter espaços; os campos seguem o último ')'
+        fields = f.read().rsplit(b")", 1)[1].split()
+    with open("/proc/uptime", 'rb') as f:
+        uptime = float(f.read().split()[0])
+    ticks = int(fields[19])
+    return time.time() - (uptime - ticks / os.sysconf('SC_CLK_TCK'))
+
+
+def windows_start_time(pid):
+
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = ctypes.windll.kernel32
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    if pid == os.getpid():
+        handle = kernel32.GetCurrentProcess()
+    else:
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            raise OSError("OpenProcess falhou")
+    times = [wintypes.FILETIME() for _ in range(4)]
+    try:
+        if not kernel32.GetProcessTimes(wintypes.HANDLE(handle), *(ctypes.byref(t) for t in times)):
+            raise OSError("GetProcessTimes falhou")
+    finally:
+        if pid != os.getpid():
+            kernel32.CloseHandle(wintypes.HANDLE(handle))
+    created = (times[0].dwHighDateTime << 32) | times[0].dwLowDateTime
+    return (created - 116444736000000000) / 10_000_000
+
+
+def frozen_onefile():
+
+    """No executável de arquivo único, o Python roda num processo filho do
+    carregador, que antes extrai tudo para um diretório temporário."""
+    if not getattr(sys, 'frozen', False):
+        return False
+    bundle = os.path.abspath(getattr(sys, '_MEIPASS', ""))
+    home = os.path.dirname(os.path.abspath(sys.executable))
+    return os.path.commonpath([bundle, home]) != home
+
+
+def process_start_time():
+
+    """Instante (time.time()) em que o processo começou e a origem da medida."""
+    launched = os.environ.get("TASKFLOW_LAUNCH_TIME")
+    if launched:
+        return float(launched), "launcher"
+    pid, origin = (os.getppid(), "bootloader") if frozen_onefile() else (os.getpid(), "process")
+    try:
+        if sys.platform.startswith("linux"):
+            return linux_start_time(pid), origin
+        if sys.platform == "win32":
+            return windows_start_time(pid), origin
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    return IMPORTED_AT, "import"
+
+
+class StartupTimer:
+
+    """Marcos da partida, em ms desde o início do processo."""
+
+    def __init__(self, enabled=False, report_path=None, exit_after=False):
+        self.enabled = enabled
+        self.report_path = report_path
+        self.exit_after = exit_after
+        self.origin, self.origin_kind = process_start_time() if enabled else (IMPORTED_AT, "import")
+        self.marks = {}
+        self.reported = False
+
+    def mark(self, name):
+
+        if self.enabled and name not in self.marks:
+            self.marks[name] = (time.time() - self.origin) * 1000
+
+    def complete(self, names=('window', 'tasks')):
+
+        return all(name in self.marks for name in names)
+
+    def summary(self, **details):
+
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'origin': self.origin_kind,
+            'frozen': bool(getattr(sys, 'frozen', False)),
+            'marks_ms': {name: round(value, 1) for name, value in self.marks.items()},
+            **details
+        }
+
+    def format_line(self):
+
+        parts = [f"{name} {value:.0f} ms" for name, value in self.marks.items()]
+        return f"Partida ({self.origin_kind}): " + " | ".join(parts)
+
+    def report(self, **details):
+
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        path = self.report_path
+        if path is None and sys.stderr is None:
+            # Executável sem console: não há onde imprimir
+            path = STARTUP_REPORT_FILE
+        if path is None:
+            print(self.format_line(), file=sys.stderr, flush=True)
+            return
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.summary(**details), ensure_ascii=False) + "\n")
+
+
+def startup_timer_from_environment(argv=()):
+
+    """TASKFLOW_STARTUP_REPORT=1 imprime na saída de erro; outro valor é o
+    arquivo onde cada partida é acrescentada como uma linha JSON."""
+    value = os.environ.get("TASKFLOW_STARTUP_REPORT", "")
+    enabled = "--startup-report" in argv or value.casefold() not in {"", "0", "false", "no", "off"}
+    return StartupTimer(
+        enabled=enabled,
+        report_path=value if value and value.casefold() not in TRUE_VALUES else None,
+        exit_after=os.environ.get("TASKFLOW_EXIT_AFTER_STARTUP", "").casefold() in TRUE_VALUES
+    )
@@ -0,0 +1,68 @@
+import json
+import os
+import socket
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taskflow_api import ApiServer, ChangeFeed, InlineDispatcher, StorageHost, TaskService
+from taskflow_core import create_storage
+
+
+class ApiTest(unittest.TestCase):
+
+    def setUp(self):
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        feed = ChangeFeed()
+        self.host = StorageHost(create_storage('json', os.path.join(directory.name, "tasks.json")), feed)
+        service = TaskService(self.host)
+        self.server = ApiServer(service, InlineDispatcher(service.flush), feed, port=0)
+        self.server.start()
+        self.addCleanup(self.host.close)
+        self.addCleanup(self.server.stop)
+
+    def request(self, head, body=b""):
+
+        with socket.create_connection((self.server.host, self.server.port), timeout=5) as connection:
+            connection.sendall(head.encode('latin-1') + b"\r\n\r\n" + body)
+            response = b""
+            while True:
+                chunk = connection.recv(65536)
+                if not chunk:
+                    break
+                response += chunk
+        status_line, _, rest = response.partition(b"\r\n")
+        return int(status_line.split()[1]), json.loads(rest.partition(b"\r\n\r\n")[2])
+
+    def test_create_task(self):
+
+        body = json.dumps({'title': "pela API"}).encode('utf-8')
+        status, payload = self.request(
+            f"POST /tasks HTTP/1.1\r\nConnection: close\r\nContent-Length: {len(body)}", body
+        )
+        self.assertEqual(status, 201)
+        self.assertEqual(payload['title'], "pela API")
+
+    def test_invalid_content_length(self):
+
+        for value in ("abc", "-5", "1e3"):
+            with self.subTest(value=value):
+                status, payload = self.request(f"POST /tasks HTTP/1.1\r\nContent-Length: {value}", b"{}")
+                self.assertEqual(status, 400)
+                self.assertIn("Content-Length", payload['error'])
+
+    def test_invalid_due_date(self):
+
+        body = json.dumps({'title': "x", 'due_at': "amanhã"}).encode('utf-8')
+        status, _ = self.request(
+            f"POST /tasks HTTP/1.1\r\nConnection: close\r\nContent-Length: {len(body)}", body
+        )
+        self.assertEqual(status, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taskflow_core import SqliteStorage, TaskStore, make_task
+
+
+class CountsMatchRecount:
+
+    """Os contadores mantidos incrementalmente batem com uma recontagem."""
+
+    def open_store(self):
+
+        raise NotImplementedError
+
+    def setUp(self):
+
+        self.store = self.open_store()
+
+    def add(self, count):
+
+        first = self.store.next_id()
+        return [
+            self.store.add(make_task(task_id, f"tarefa {task_id}"))
+            for task_id in range(first, first + count)
+        ]
+
+    def assertCounts(self):
+
+        self.assertEqual(self.store.counts(), self.store.recount())
+
+    def test_add(self):
+
+        self.add(10)
+        self.assertCounts()
+        self.assertEqual(self.store.counts()['total'], 10)
+
+    def test_toggle(self):
+
+        tasks = self.add(10)
+        for task in tasks[::2]:
+            self.store.set_completed(task['id'], True)
+            self.assertCounts()
+        self.store.set_completed(tasks[0]['id'], True)
+        self.store.set_completed(tasks[2]['id'], False)
+        self.assertCounts()
+        self.assertEqual(self.store.counts()['completed'], 4)
+
+    def test_delete(self):
+
+        tasks = self.add(10)
+        self.store.set_completed(tasks[0]['id'], True)
+        self.store.remove(tasks[0]['id'])
+        self.store.remove(tasks[1]['id'])
+        self.assertIsNone(self.store.remove(tasks[1]['id']))
+        self.assertCounts()
+        self.assertEqual(self.store.counts()['total'], 8)
+
+    def test_bulk(self):
+
+        tasks = self.add(100)
+        for task in tasks[:60]:
+            self.store.set_completed(task['id'], True)
+        for task in tasks[40:80]:
+            self.store.remove(task['id'])
+        for task in tasks[:20]:
+            self.store.update(task['id'], completed=False, title="reaberta")
+        self.assertCounts()
+        self.assertEqual(self.store.counts(), {'total': 60, 'pending': 40, 'completed': 20})
+
+    def test_load(self):
+
+        self.add(5)
+        tasks = [make_task(task_id, f"carregada {task_id}") for task_id in range(1, 31)]
+        for task in tasks[:12]:
+            task['completed'] = True
+        self.store.load(tasks)
+        self.assertCounts()
+        self.assertEqual(self.store.counts(), {'total': 30, 'pending': 18, 'completed': 12})
+
+
+class TaskStoreCountsTest(CountsMatchRecount, unittest.TestCase):
+
+    def open_store(self):
+
+        return TaskStore()
+
+
+class SqliteTaskStoreCountsTest(CountsMatchRecount, unittest.TestCase):
+
+    def open_store(self):
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        storage = SqliteStorage(os.path.join(directory.name, "tasks.json"))
+        self.addCleanup(storage.close)
+        return storage.open_store()
+
+
+if __name__ == "__main__":
+    unittest.main()
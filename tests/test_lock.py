@@ -0,0 +1,79 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from taskflow_core import FileLock, create_storage, fcntl, make_task
+
+
+# Cada processo soma 1 ao contador, sob a trava, ``count`` vezes
+INCREMENT = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from taskflow_core import FileLock
+
+lock = FileLock(sys.argv[2] + ".lock")
+for _ in range(int(sys.argv[3])):
+    with lock:
+        with open(sys.argv[2], 'r+') as f:
+            value = int(f.read() or 0)
+            f.seek(0)
+            f.write(str(value + 1))
+            f.truncate()
+"""
+
+
+class FileLockTest(unittest.TestCase):
+
+    def setUp(self):
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_lock_file_is_removed(self):
+
+        for mode in ('json', 'journal', 'sqlite', 'binary'):
+            with self.subTest(mode=mode):
+                path = os.path.join(self.directory, f"tasks-{mode}.json")
+                storage = create_storage(mode, path)
+                store = storage.open_store()
+                task = store.add(make_task(storage.reserve_ids(store)[0], "Trava"))
+                storage.commit(store, upserts=[task])
+                storage.flush()
+                storage.close()
+                leftovers = [name for name in os.listdir(self.directory) if name.endswith(".lock")]
+                self.assertEqual(leftovers, [])
+
+    def test_reentrant_keeps_file_until_last_release(self):
+
+        lock = FileLock(os.path.join(self.directory, "tasks.json.lock"))
+        with lock:
+            with lock:
+                pass
+            if fcntl is not None:
+                self.assertTrue(os.path.exists(lock.path))
+        self.assertFalse(os.path.exists(lock.path))
+
+    @unittest.skipIf(fcntl is None, "sem fcntl a trava não vale entre processos")
+    def test_processes_exclude_each_other(self):
+
+        path = os.path.join(self.directory, "counter")
+        with open(path, 'w') as f:
+            f.write("0")
+        processes = [
+            subprocess.Popen([sys.executable, "-c", INCREMENT, ROOT, path, "200"])
+            for _ in range(4)
+        ]
+        for process in processes:
+            self.assertEqual(process.wait(60), 0)
+        with open(path) as f:
+            self.assertEqual(int(f.read()), 800)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,483 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+import warnings
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from taskflow_core import (
+    OperationLog,
+    SqliteTaskSequence,
+    Task,
+    TaskStore,
+    convert_tasks_file,
+    create_storage,
+    make_task,
+    read_binary_tasks,
+    write_json_atomic
+)
+
+
+def snapshot(store):
+
+    return {
+        task['id']: (
+            task['title'], task['description'], bool(task['completed']),
+            task['created_at'], task['completed_at'], task.get('due_at'), task.get('recurrence') or ""
+        )
+        for task in store
+    }
+
+
+class StorageTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "tasks.json")
+
+    def open(self, mode):
+
+        storage = create_storage(mode, self.path)
+        self.addCleanup(storage.close)
+        return storage, storage.open_store()
+
+    def add(self, storage, store, title, **fields):
+
+        task = make_task(storage.reserve_ids(store)[0], title)
+        task.update(fields)
+        task = store.add(task)
+        storage.commit(store, upserts=[task])
+        return task
+
+
+class RoundTripTest(StorageTestCase):
+
+    """O que é gravado volta igual ao reabrir, em todos os backends."""
+
+    def check_round_trip(self, mode):
+
+        storage, store = self.open(mode)
+        first = self.add(storage, store, "Comprar pão", due_at="2030-01-02T09:30:00", recurrence="weekly")
+        second = self.add(storage, store, "Revisar relatório — ção ✓")
+        third = self.add(storage, store, "Descartar")
+        second = store.set_completed(second['id'], True)
+        store.remove(third['id'])
+        storage.commit(store, upserts=[second], deletes=[third['id']])
+        expected = snapshot(store)
+        storage.close()
+        
+        storage, store = self.open(mode)
+        self.assertEqual(snapshot(store), expected)
+        self.assertEqual(store.counts(), store.recount())
+        # IDs de tarefas excluídas não voltam a ser usados
+        self.assertGreater(storage.reserve_ids(store)[0], third['id'])
+        self.assertIn(first['id'], store)
+
+    def test_json(self):
+
+        self.check_round_trip('json')
+
+    def test_journal(self):
+
+        self.check_round_trip('journal')
+
+    def test_sqlite(self):
+
+        self.check_round_trip('sqlite')
+
+    def test_binary(self):
+
+        self.check_round_trip('binary')
+
+    def test_binary_conversion(self):
+
+        tasks = [make_task(task_id, f"tarefa {task_id} ✓", "descrição") for task_id in range(1, 6)]
+        tasks[1]['completed'] = True
+        tasks[1]['completed_at'] = "2024-03-01T10:00:00"
+        tasks[2]['due_at'] = "2024-04-01T08:00:00"
+        write_json_atomic(self.path, tasks)
+        binary_path = os.path.splitext(self.path)[0] + ".tfb"
+        self.assertEqual(convert_tasks_file(self.path, binary_path), 5)
+        self.assertEqual(
+            [task.to_dict() for task in read_binary_tasks(binary_path)],
+            [Task.from_dict(task).to_dict() for task in tasks]
+        )
+
+    def test_binary_status_page(self):
+
+        storage, store = self.open('binary')
+        for number in range(20):
+            task = self.add(storage, store, f"tarefa {number}")
+            if number % 3 == 0:
+                store.set_completed(task['id'], True)
+        storage.commit(store, upserts=list(store))
+        storage.flush()
+        for filter_type in ("all", "pending", "completed"):
+            tasks, total = storage.read_page(filter_type, 2, 4)
+            self.assertEqual(total, store.count(filter_type))
+            self.assertEqual(
+                [task['id'] for task in tasks],
+                [task['id'] for task in store.page(filter_type, 2, 4)]
+            )
+        self.assertIsNone(storage.read_page("overdue", 0, 4))
+
+    def test_empty_commit_keeps_file(self):
+
+        storage, store = self.open('json')
+        self.add(storage, store, "única")
+        storage.flush()
+        before = os.stat(self.path).st_ino, os.stat(self.path).st_mtime_ns
+        storage.commit(store)
+        storage.flush()
+        self.assertEqual((os.stat(self.path).st_ino, os.stat(self.path).st_mtime_ns), before)
+
+
+class MergeTest(StorageTestCase):
+
+    """Dois processos gravando nos mesmos dados não perdem as mudanças um do outro."""
+
+    def test_json_merges_concurrent_writers(self):
+
+        first, first_store = self.open('json')
+        second, second_store = self.open('json')
+        
+        ours = self.add(first, first_store, "primeiro")
+        first.flush()
+        theirs = self.add(second, second_store, "segundo")
+        second.flush()
+        
+        # O segundo processo mesclou o arquivo e relata a tarefa do primeiro
+        changes = second.poll_changes(second_store)
+        self.assertEqual([(c['op'], c['task']['id']) for c in changes], [('put', ours['id'])])
+        # O primeiro enxerga a gravação do segundo como uma mudança externa
+        changes = first.poll_changes(first_store)
+        self.assertEqual([(c['op'], c['task']['id']) for c in changes], [('put', theirs['id'])])
+        
+        reopened, store = self.open('json')
+        self.assertEqual(sorted(task['id'] for task in store), sorted([ours['id'], theirs['id']]))
+
+    def test_json_merge_keeps_external_delete(self):
+
+        first, first_store = self.open('json')
+        kept = self.add(first, first_store, "fica")
+        removed = self.add(first, first_store, "sai")
+        first.flush()
+        
+        second, second_store = self.open('json')
+        second_store.remove(removed['id'])
+        second.commit(second_store, deletes=[removed['id']])
+        second.flush()
+        
+        first_store.update(kept['id'], title="editada")
+        first.commit(first_store, upserts=[first_store.get(kept['id'])])
+        first.flush()
+        
+        reopened, store = self.open('json')
+        self.assertEqual(snapshot(store)[kept['id']][0], "editada")
+        self.assertNotIn(removed['id'], store)
+
+    def test_journal_reads_other_writer(self):
+
+        first, first_store = self.open('journal')
+        second, second_store = self.open('journal')
+        task = self.add(first, first_store, "do outro processo")
+        first_store.remove(task['id'])
+        first.commit(first_store, deletes=[task['id']])
+        
+        changes = second.poll_changes(second_store)
+        self.assertEqual([c['op'] for c in changes], ['put', 'delete'])
+        self.assertEqual(changes[0]['task']['title'], "do outro processo")
+
+    def test_journal_compaction_keeps_tasks(self):
+
+        storage = create_storage('journal', self.path)
+        storage.compact_threshold = 5
+        self.addCleanup(storage.close)
+        store = storage.open_store()
+        for number in range(12):
+            self.add(storage, store, f"tarefa {number}")
+        storage.flush()
+        expected = snapshot(store)
+        storage.close()
+        
+        reopened, store = self.open('journal')
+        self.assertEqual(snapshot(store), expected)
+
+    def test_sqlite_sees_other_connection(self):
+
+        first, first_store = self.open('sqlite')
+        second, second_store = self.open('sqlite')
+        task = self.add(first, first_store, "do outro processo")
+        
+        self.assertEqual(second.poll_changes(second_store), [{'op': 'reload'}])
+        self.assertEqual(second_store.get(task['id'])['title'], "do outro processo")
+        self.assertEqual(second_store.counts(), second_store.recount())
+        # IDs reservados por um processo não são reutilizados pelo outro
+        self.assertNotEqual(second.reserve_ids(second_store)[0], task['id'])
+
+
+class BackgroundWriteTest(StorageTestCase):
+
+    """O writer grava a tarefa como estava no commit, mesmo editada durante a gravação."""
+
+    def check_edit_during_write(self, mode):
+
+        storage, store = self.open(mode)
+        task = self.add(storage, store, "Antes", description="descrição antiga")
+        storage.flush()
+        before = task.to_dict()
+        
+        writing = threading.Event()
+        release = threading.Event()
+        write_tasks = storage.write_tasks
+
+        def slow_write(tasks, next_id):
+
+            writing.set()
+            release.wait(5)
+            write_tasks(tasks, next_id)
+
+        storage.write_tasks = slow_write
+        storage.commit(store, upserts=[task])
+        self.assertTrue(writing.wait(5))
+        store.update(
+            task['id'], title="Depois", description="descrição nova", completed=True,
+            completed_at=datetime.now().isoformat()
+        )
+        release.set()
+        storage.flush()
+        
+        saved = {saved['id']: saved for saved in storage.read_tasks()}[task['id']]
+        self.assertEqual(Task.from_dict(saved).to_dict(), before)
+
+    def test_json(self):
+
+        self.check_edit_during_write('json')
+
+    def test_binary(self):
+
+        self.check_edit_during_write('binary')
+
+
+class LegacyDataTest(StorageTestCase):
+
+    """Datas fora do padrão ISO em arquivos antigos não impedem a carga."""
+
+    def setUp(self):
+
+        super().setUp()
+        tasks = [make_task(task_id, f"antiga {task_id}").to_dict() for task_id in (1, 2, 3)]
+        tasks[0]['created_at'] = "01/02/2024"
+        tasks[1]['created_at'] = "15/03/2024 14:30"
+        tasks[2]['created_at'] = "não é data"
+        write_json_atomic(self.path, tasks)
+
+    def check_load(self, mode):
+
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter("always")
+            storage, store = self.open(mode)
+            created = {task['id']: task['created_at'] for task in store}
+        self.assertEqual(created, {1: "2024-02-01T00:00:00", 2: "2024-03-15T14:30:00", 3: None})
+        self.assertEqual(store.counts(), store.recount())
+
+    def test_json(self):
+
+        self.check_load('json')
+
+    def test_journal(self):
+
+        self.check_load('journal')
+
+    def test_sqlite(self):
+
+        self.check_load('sqlite')
+
+    def test_binary(self):
+
+        self.check_load('binary')
+
+    def test_failed_extend_keeps_indexes(self):
+
+        store = TaskStore([make_task(1, "primeira")])
+        store.sorted_index("title")
+        with self.assertRaises(AttributeError):
+            store.extend([make_task(2, "segunda"), "registro inválido", make_task(3, "terceira")])
+        self.assertEqual([task['id'] for task in store.sorted("all", "title")], [1, 2])
+        store.add(make_task(4, "quarta"))
+        self.assertEqual([task['id'] for task in store.sorted("all", "title")], [1, 4, 2])
+
+
+class OverdueTest(StorageTestCase):
+
+    """A store em memória e a SQLite concordam sobre o que está atrasado."""
+
+    def due_dates(self):
+
+        now = datetime.now()
+        return [
+            (now - timedelta(days=2)).isoformat(),
+            (now - timedelta(seconds=30)).replace(microsecond=0).isoformat(),
+            (now - timedelta(minutes=5)).isoformat(timespec='microseconds'),
+            (now + timedelta(minutes=5)).isoformat(),
+            (now + timedelta(days=1)).strftime("%d/%m/%Y"),
+            (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat(),
+            (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(),
+            None
+        ]
+
+    def tasks(self):
+
+        tasks = []
+        for task_id, due_at in enumerate(self.due_dates(), start=1):
+            task = make_task(task_id, f"prazo {task_id}").to_dict()
+            task['due_at'] = due_at
+            tasks.append(task)
+        return tasks
+
+    def overdue_ids(self, store):
+
+        return sorted(task['id'] for task in store.overdue())
+
+    def test_backends_agree(self):
+
+        memory = TaskStore(self.tasks())
+        storage, store = self.open('sqlite')
+        store.load(self.tasks())
+        self.assertEqual(self.overdue_ids(memory), [1, 2, 3, 6])
+        self.assertEqual(self.overdue_ids(store), self.overdue_ids(memory))
+        self.assertEqual(store.count_overdue(), memory.count_overdue())
+
+    def test_old_database_is_normalized(self):
+
+        storage, store = self.open('sqlite')
+        store.load([])
+        storage.connection.executemany(
+            "INSERT INTO tasks (id, title, due_at) VALUES (?, ?, ?)",
+            [(task['id'], task['title'], task['due_at']) for task in self.tasks()]
+        )
+        storage.connection.execute("DELETE FROM meta WHERE key = 'time_format'")
+        storage.connection.commit()
+        storage.close()
+        
+        storage, store = self.open('sqlite')
+        self.assertEqual(self.overdue_ids(store), self.overdue_ids(TaskStore(self.tasks())))
+
+
+class SqliteSequenceTest(StorageTestCase):
+
+    """index_of da sequência SQLite: posições certas, pelo índice e sem ir ao banco à toa."""
+
+    def setUp(self):
+
+        super().setUp()
+        self.storage, self.store = self.open('sqlite')
+        tasks = []
+        for task_id in range(1, 31):
+            task = make_task(task_id, f"tarefa {task_id}").to_dict()
+            task['completed'] = task_id % 3 == 0
+            tasks.append(task)
+        self.store.load(tasks)
+
+    def test_positions(self):
+
+        for filter_type in ('all', 'pending', 'completed'):
+            with self.subTest(filter_type=filter_type):
+                expected = [task['id'] for task in self.store.filtered(filter_type)]
+                sequence = SqliteTaskSequence(self.store, filter_type, page_size=4, max_pages=2)
+                self.assertEqual([sequence.index_of(task_id) for task_id in expected], list(range(len(expected))))
+                sequence[5]
+                self.assertEqual([sequence.index_of(task_id) for task_id in expected], list(range(len(expected))))
+
+    def test_count_uses_covering_index(self):
+
+        for filter_type in ('all', 'pending', 'completed'):
+            where = self.store.FILTERS[filter_type] or "WHERE completed IN (0, 1)"
+            plan = self.storage.connection.execute(
+                f"EXPLAIN QUERY PLAN SELECT COUNT(*) FROM tasks {where} AND seq < ?", (10,)
+            ).fetchall()
+            self.assertIn("COVERING INDEX idx_tasks_completed", plan[0][-1])
+
+    def test_cached_positions_skip_the_database(self):
+
+        sequence = SqliteTaskSequence(self.store, 'all', page_size=10)
+        sequence[0]
+        statements = []
+        self.storage.connection.set_trace_callback(statements.append)
+        self.addCleanup(self.storage.connection.set_trace_callback, None)
+        self.assertEqual(sequence.index_of(7), 6)
+        self.assertEqual(sequence.index_of(25), 24)
+        self.assertEqual(sequence.index_of(25), 24)
+        self.assertEqual(len(statements), 2)
+
+        # Uma mudança invalida as posições guardadas
+        self.store.remove(1)
+        del statements[:]
+        self.assertEqual(sequence.index_of(7), 5)
+        self.assertEqual(len(statements), 2)
+
+
+class ArchiveRollupsTest(StorageTestCase):
+
+    """Arquivar tira as tarefas das contagens, mas não do histórico diário."""
+
+    def check_archive(self, mode):
+
+        storage, store = self.open(mode)
+        old = (datetime.now() - timedelta(days=200)).isoformat()
+        for number in range(5):
+            self.add(storage, store, f"antiga {number}", completed=True, created_at=old, completed_at=old)
+        self.add(storage, store, "pendente")
+        days = store.daily_rollups().to_dict()['days']
+
+        self.assertEqual(storage.archive_completed(store, 90), 5)
+        self.assertEqual(store.daily_rollups().to_dict()['days'], days)
+        self.assertTrue(store.daily_rollups().matches(store.counts()))
+        storage.flush()
+        storage.close()
+
+        storage, store = self.open(mode)
+        self.assertEqual(store.daily_rollups().to_dict()['days'], days)
+        store.rollups = None
+        self.assertEqual(store.daily_rollups().to_dict()['days'], days)
+        self.assertTrue(store.daily_rollups().matches(store.counts()))
+
+        month, task = next(storage.open_archive().search())
+        history = OperationLog()
+        history.record("restaurar", [(None, store.add(task, archived=True))], archived=True)
+        self.assertEqual(store.daily_rollups().to_dict()['days'], days)
+        self.assertTrue(store.daily_rollups().matches(store.counts()))
+
+        for step in (history.undo, history.redo, history.undo):
+            label, records = step()
+            self.apply_records(store, records)
+            self.assertEqual(store.daily_rollups().to_dict()['days'], days)
+            self.assertTrue(store.daily_rollups().matches(store.counts()))
+        self.assertNotIn(task['id'], store)
+
+    def apply_records(self, store, records):
+
+        # Como TaskFlowGUI.apply_changes aplica os passos do histórico
+        for record in records:
+            archived = record.get('archived', False)
+            if record['op'] == 'delete':
+                store.remove(record['id'], archived=archived)
+            else:
+                store.add(record['task'], archived=archived)
+
+    def test_json(self):
+
+        self.check_archive('json')
+
+    def test_sqlite(self):
+
+        self.check_archive('sqlite')
+
+
+if __name__ == "__main__":
+    unittest.main()